@@ -0,0 +1,249 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+"""
+Benchmarks the modules of this collection against mock_duo.py.
+
+Every scenario runs its module in a fresh process, the way Ansible does, with
+an empty cache directory. It reports the wall time, the number of API
+requests the mock received and the peak RSS of the module process.
+
+    python bench.py                              # 10, 1000 and 10000 accounts
+    python bench.py --accounts 10,100 --latency 0.02 --throttle 0.01
+    python bench.py --only duo_admin_settings --json > results.json
+
+Requires duo_client and ansible-core.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import shutil
+import subprocess
+import sys
+import resource
+import tempfile
+import time
+
+from mock_duo import MockDuo, serve
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# The directory holding ansible_collections/, so modules import as
+# ansible_collections.mciecior.duo.plugins.modules.<name>
+ROOT = os.path.abspath(os.path.join(HERE, '..', '..', '..', '..'))
+PACKAGE = 'ansible_collections.mciecior.duo'
+
+# Number of users of every account of the mock
+USERS = 1000
+
+# Number of authentication log events of every account of the mock
+AUTHLOGS = 100
+
+# Modules without a workers option
+NO_WORKERS = ('duo_account', 'duo_admin_integrations')
+
+# (name, module, args), where args is a function of the number of accounts.
+# A dest is relative to the cache directory of the run.
+SCENARIOS = [
+    ('duo_account present', 'duo_account',
+     lambda n: dict(name='account-{}'.format(n - 1), state='present')),
+    # ten new accounts, and the last ten removed
+    ('duo_accounts reconcile', 'duo_accounts',
+     lambda n: dict(accounts=['new-account-{}'.format(i) for i in range(10)] + [
+         dict(name='account-{}'.format(i), state='absent') for i in range(max(0, n - 10), n)])),
+    ('duo_admin_settings query', 'duo_admin_settings',
+     lambda n: dict(name='account-{}'.format(n - 1), state='query')),
+    ('duo_admin_settings rollout', 'duo_admin_settings',
+     lambda n: dict(accounts=['all'], state='present', lockout_threshold=5)),
+    ('duo_admin_integrations query', 'duo_admin_integrations',
+     lambda n: dict(name='account-{}'.format(n - 1), state='query')),
+    ('duo_admin_integrations present', 'duo_admin_integrations',
+     lambda n: dict(name='account-{}'.format(n - 1), state='present', app_name='integration-0', app_type='rdp')),
+    # one existing integration, with a new greeting, and one new integration
+    ('duo_integrations deploy', 'duo_integrations',
+     lambda n: dict(accounts=['all'], integrations=[
+         dict(name='integration-0', type='rdp', settings=dict(greeting='Welcome')),
+         dict(name='VPN', type='radius')])),
+    ('duo_snapshot all', 'duo_snapshot',
+     lambda n: dict(accounts=['all'], dest='snapshot.jsonl.gz')),
+    ('duo_edition get', 'duo_edition',
+     lambda n: dict(account_id='DA{:08d}'.format(n - 1))),
+    ('duo_edition fleet', 'duo_edition',
+     lambda n: dict(account_ids=['all'], edition='PLATFORM')),
+    # half of the users exist, and every tenth of those has a new email
+    ('duo_users sync', 'duo_users',
+     lambda n: dict(name='account-{}'.format(n - 1), users=[
+         dict(username='user-{}'.format(i), email='{}-{}@example.com'.format('new' if i % 10 == 0 else 'user', i))
+         for i in range(USERS // 2, USERS + USERS // 2)])),
+    # a box of new tokens, every tenth of them handed to a user
+    ('duo_tokens import', 'duo_tokens',
+     lambda n: dict(name='account-{}'.format(n - 1), tokens=[
+         dict(serial=str(1000000 + i), secret='{:040x}'.format(i), username='user-{}'.format(i) if i % 10 == 0 else None)
+         for i in range(USERS)])),
+    ('duo_telephony_report all', 'duo_telephony_report',
+     lambda n: dict(accounts=['all'])),
+    # codes for a tenth of the users, with a few unknown and miscased usernames
+    ('duo_bypass_codes generate', 'duo_bypass_codes',
+     lambda n: dict(name='account-{}'.format(n - 1), dest='bypass_codes.csv', count=3, users=[
+         ('USER-{}' if i % 50 == 0 else 'user-{}').format(i) for i in range(0, USERS + 20, 10)])),
+    # a new group with half of the users
+    ('duo_admin_group sync', 'duo_admin_group',
+     lambda n: dict(name='account-{}'.format(n - 1), group='bench', purge=True,
+                    members=['user-{}'.format(i) for i in range(0, USERS, 2)])),
+    ('duo_authlog export', 'duo_authlog',
+     lambda n: dict(name='account-{}'.format(n - 1), dest='authlog.jsonl', log_rate_limit=0)),
+    ('duo_authlog all', 'duo_authlog',
+     lambda n: dict(accounts=['all'], dest='authlog.jsonl', log_rate_limit=0)),
+]
+
+
+def peak_rss_mb():
+    '''
+    Returns the peak RSS of this process in MB
+    '''
+    # a child inherits the ru_maxrss of its parent across fork and exec on
+    # Linux, so the high water mark of the process itself is read instead
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return round(int(line.split()[1]) / 1024.0, 1)
+    except (IOError, OSError):
+        pass
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(maxrss / (1024.0 * 1024 if sys.platform == 'darwin' else 1024.0), 1)
+
+
+def run_child(port, module_name, args_path, rss_path):
+    '''
+    Run one module in this process against the mock on port, and write its
+    peak RSS to rss_path when it exits
+    '''
+    def write_rss():
+        with open(rss_path, 'w') as f:
+            f.write(str(peak_rss_mb()))
+    atexit.register(write_rss)
+
+    sys.path.insert(0, ROOT)
+    import importlib
+    api = importlib.import_module(PACKAGE + '.plugins.module_utils.api')
+    client = api._client
+
+    def mock_client(cls, module, account_id=None):
+        c = client(cls, module, account_id)
+        c.ca_certs = 'HTTP'
+        c.port = port
+        return c
+    api._client = mock_client
+
+    engine = importlib.import_module(PACKAGE + '.plugins.module_utils.engine')
+    async_client = engine.async_client
+
+    def mock_async_client(module):
+        c = async_client(module)
+        c.ssl = None
+        c.port = port
+        return c
+    engine.async_client = mock_async_client
+
+    module = importlib.import_module(PACKAGE + '.plugins.modules.' + module_name)
+    sys.argv = [module_name, args_path]
+    module.main()
+
+
+def run_scenario(server, module_name, args, workers):
+    '''
+    Returns wall time, peak RSS, API requests and the module result of one run
+    '''
+    cache_dir = tempfile.mkdtemp(prefix='duo-bench-')
+    try:
+        args = dict(args, ikey='DIBENCHMARK', skey='benchmark-secret', host='127.0.0.1', account_cache_dir=cache_dir)
+        if module_name not in NO_WORKERS:
+            args['workers'] = workers
+        if 'dest' in args:
+            args['dest'] = os.path.join(cache_dir, args['dest'])
+        args_path = os.path.join(cache_dir, 'args.json')
+        with open(args_path, 'w') as f:
+            json.dump(dict(ANSIBLE_MODULE_ARGS=args), f)
+        out_path = os.path.join(cache_dir, 'out.json')
+        rss_path = os.path.join(cache_dir, 'rss')
+
+        server.mock.stats.clear()
+        env = dict(os.environ, DUO_ACCOUNT_CACHE_DIR=cache_dir)
+        env.pop('DUO_RATE_LIMIT', None)
+        start = time.time()
+        with open(out_path, 'w') as out:
+            proc = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), '--child', str(server.server_address[1]), module_name, args_path, rss_path],
+                stdout=out, stderr=subprocess.STDOUT, env=env, cwd=HERE)
+            proc.wait()
+        wall = time.time() - start
+        stats = dict(server.mock.stats)
+        with open(out_path) as f:
+            output = f.read()
+        try:
+            result = json.loads(output)
+        except ValueError:
+            result = dict(failed=True, msg=output.strip()[-300:])
+        try:
+            with open(rss_path) as f:
+                peak_rss = float(f.read())
+        except (IOError, OSError, ValueError):
+            peak_rss = None
+        return dict(
+            wall=round(wall, 3),
+            peak_rss_mb=peak_rss,
+            api_calls=sum(v for k, v in stats.items() if k != '429'),
+            throttled=stats.get('429', 0),
+            calls=stats,
+            # latency of the module's calls, as seen by its clients
+            p95=result.get('duo_metrics', {}).get('p95'),
+            changed=result.get('changed'),
+            failed=bool(result.get('failed')),
+            msg=result.get('msg') if result.get('failed') else None,
+        )
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        return run_child(int(sys.argv[2]), sys.argv[3], sys.argv[4], sys.argv[5])
+
+    parser = argparse.ArgumentParser(description='Benchmark the Duo modules against a mock Duo API')
+    parser.add_argument('--accounts', default='10,1000,10000', help='comma-separated numbers of child accounts')
+    parser.add_argument('--integrations', type=int, default=25, help='number of integrations of every account')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--throttle', type=float, default=0.0, help='fraction of requests answered with HTTP 429')
+    parser.add_argument('--workers', type=int, default=8, help='workers of the multi-account scenarios')
+    parser.add_argument('--only', action='append', help='only run scenarios of this module, may be repeated')
+    parser.add_argument('--json', action='store_true', help='print the results as JSON')
+    args = parser.parse_args()
+
+    results = []
+    for n in [int(a) for a in args.accounts.split(',')]:
+        server = serve(MockDuo(n, args.integrations, args.latency, args.throttle, users=USERS, authlogs=AUTHLOGS))
+        try:
+            for name, module_name, scenario_args in SCENARIOS:
+                if args.only and module_name not in args.only:
+                    continue
+                result = run_scenario(server, module_name, scenario_args(n), args.workers)
+                result.update(scenario=name, accounts=n)
+                results.append(result)
+                if not args.json:
+                    print('{:<32} {:>7} accounts {:>9.3f}s {:>7} calls {:>5} 429s {:>7.1f} MB{}'.format(
+                        name, n, result['wall'], result['api_calls'], result['throttled'], result['peak_rss_mb'] or float('nan'),
+                        '  FAILED: {}'.format(result['msg']) if result['failed'] else ''))
+                    sys.stdout.flush()
+        finally:
+            server.shutdown()
+    if args.json:
+        print(json.dumps(results, indent=2))
+    return 1 if any(r['failed'] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,402 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+"""
+An in-memory stand-in for the Duo Accounts and Admin API endpoints used by
+this collection, for benchmarks and local experiments.
+
+It serves plain HTTP and does not check request signatures. Point duo_client
+at it with ca_certs='HTTP' and port=<port>, as bench.py does.
+
+    python mock_duo.py --port 8443 --accounts 1000 --integrations 10 --latency 0.05 --throttle 0.01
+
+GET /__stats returns the number of requests per method and path, and
+POST /__reset clears them.
+"""
+
+import argparse
+import json
+import re
+import socket
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+
+DEFAULT_SETTINGS = dict(
+    caller_id='',
+    fraud_email='',
+    fraud_email_enabled=False,
+    inactive_user_expiration=0,
+    keypress_confirm='#',
+    keypress_fraud='0',
+    lockout_expire_duration=0,
+    lockout_threshold=10,
+    minimum_password_length=12,
+    mobile_otp_enabled=True,
+    name='Mock Account',
+    push_enabled=True,
+    sms_batch=1,
+    sms_enabled=True,
+    sms_expiration=0,
+    sms_message='',
+    sms_refresh=False,
+    telephony_warning_min=0,
+    timezone='UTC',
+    u2f_enabled=True,
+    user_telephony_cost_max=20,
+    voice_enabled=True,
+)
+
+# Counted together in the stats, as the endpoints of one object
+OBJECT_ID = re.compile(r'/D[A-Z0-9]{9,}')
+
+INTEGRATION_TYPES = ['rdp', 'websdk', 'radius', 'sso-generic', 'adminapi']
+
+
+class MockDuo(object):
+    """
+    The accounts, settings, integrations, editions, users, groups, tokens,
+    bypass codes, authentication logs and telephony credits served by the
+    mock.
+
+    Child accounts are named account-0 .. account-<accounts - 1>. Every
+    account starts with the same integrations and users, created on first use.
+    """
+
+    def __init__(self, accounts=10, integrations=5, latency=0.0, throttle=0.0, retry_after=0, users=0, authlogs=0):
+        self.latency = latency
+        self.throttle = throttle
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.stats = Counter()
+        self.requests = 0
+        self.accounts = dict(
+            ('DA{:08d}'.format(i), dict(account_id='DA{:08d}'.format(i), name='account-{}'.format(i), api_hostname='api-mock.duosecurity.com'))
+            for i in range(accounts)
+        )
+        self.integration_count = integrations
+        self.user_count = users
+        self.users = {}
+        self.groups = {}
+        self.tokens = {}
+        self.authlog_count = authlogs
+        self.authlogs = {}
+        self.settings = {}
+        self.integrations = {}
+        self.editions = {}
+        self.next_key = 0
+
+    def _key(self):
+        self.next_key += 1
+        return 'DI{:018d}'.format(self.next_key)
+
+    def _integrations(self, account_id):
+        if account_id not in self.integrations:
+            self.integrations[account_id] = [
+                dict(name='integration-{}'.format(i), type=INTEGRATION_TYPES[i % len(INTEGRATION_TYPES)],
+                     integration_key=self._key(), secret_key='s' * 40, self_service_allowed=False, greeting='')
+                for i in range(self.integration_count)
+            ]
+        return self.integrations[account_id]
+
+    def _users(self, account_id):
+        if account_id not in self.users:
+            self.users[account_id] = dict(
+                ('DU{:018d}'.format(i), dict(user_id='DU{:018d}'.format(i), username='user-{}'.format(i),
+                                             realname='User {}'.format(i), email='user-{}@example.com'.format(i), status='active'))
+                for i in range(self.user_count)
+            )
+        return self.users[account_id]
+
+    def _authlogs(self, account_id):
+        '''
+        Returns the authentication log of an account, oldest first, starting
+        with authlogs events spread over the day before its first use
+        '''
+        if account_id not in self.authlogs:
+            self.authlogs[account_id] = []
+            now = int(time.time() * 1000)
+            self.add_authlogs(account_id, self.authlog_count, now - 24 * 3600 * 1000, now)
+        return self.authlogs[account_id]
+
+    def add_authlogs(self, account_id, count, start, end):
+        '''
+        Append count events between start and end, in milliseconds
+        '''
+        log = self.authlogs.setdefault(account_id, [])
+        for i in range(count):
+            ts = start + (end - start) * i // max(1, count)
+            n = len(log)
+            log.append(dict(txid='{}-{:08d}'.format(account_id or 'parent', n), timestamp=ts // 1000, ts=ts,
+                            isotimestamp=time.strftime('%Y-%m-%dT%H:%M:%S+00:00', time.gmtime(ts // 1000)),
+                            event_type='authentication', factor='duo_push', result='success', reason='user_approved',
+                            user=dict(name='user-{}'.format(n % max(1, self.user_count or 1)))))
+
+    def _group(self, group):
+        return dict((k, v) for k, v in group.items() if k != 'members')
+
+    def _page(self, objects, params):
+        '''
+        Returns (page, metadata) of a paged listing
+        '''
+        offset = int(params.get('offset', 0))
+        limit = int(params.get('limit', 100))
+        metadata = dict(total_objects=len(objects))
+        if offset + limit < len(objects):
+            metadata['next_offset'] = offset + limit
+        return objects[offset:offset + limit], metadata
+
+    def throttled(self):
+        '''
+        Returns True if this request should be answered with a 429
+        '''
+        with self.lock:
+            self.requests += 1
+            return self.throttle > 0 and self.requests % max(1, int(round(1 / self.throttle))) == 0
+
+    def handle(self, method, path, params):
+        '''
+        Returns (status, response, metadata) for one API request
+        '''
+        account_id = params.pop('account_id', None) or ''
+        with self.lock:
+            self.stats['{} {}'.format(method, OBJECT_ID.sub('/{id}', path))] += 1
+            if path == '/accounts/v1/account/list':
+                return 200, list(self.accounts.values()), {}
+            if path == '/accounts/v1/account/create':
+                self.next_key += 1
+                new_id = 'DN{:08d}'.format(self.next_key)
+                self.accounts[new_id] = dict(account_id=new_id, name=params['name'], api_hostname='api-mock.duosecurity.com')
+                return 200, self.accounts[new_id], {}
+            if path == '/accounts/v1/account/delete':
+                self.accounts.pop(account_id, None)
+                return 200, '', {}
+            if account_id and account_id not in self.accounts:
+                return 400, 'Invalid account_id', {}
+            if path == '/admin/v1/info/summary':
+                n = int(account_id[2:] or 0) if account_id.startswith('DA') else 0
+                return 200, dict(admin_count=1 + n % 3, integration_count=len(self._integrations(account_id)),
+                                 telephony_credits_remaining=n * 37 % 2000, user_count=len(self._users(account_id))), {}
+            if path == '/admin/v1/info/telephony_credits_used':
+                n = int(account_id[2:] or 0) if account_id.startswith('DA') else 0
+                return 200, dict(mintime=int(params['mintime']), maxtime=int(params['maxtime']), telephony_credits_used=n * 11 % 500), {}
+            if path == '/admin/v1/settings':
+                settings = self.settings.setdefault(account_id, dict(DEFAULT_SETTINGS))
+                if method == 'POST':
+                    settings.update(params)
+                return 200, settings, {}
+            if path == '/admin/v1/billing/edition':
+                if method == 'POST':
+                    self.editions[account_id] = params['edition']
+                    return 200, '', {}
+                return 200, dict(edition=self.editions.get(account_id, 'ENTERPRISE')), {}
+            if path in ('/admin/v1/integrations', '/admin/v3/integrations'):
+                integrations = self._integrations(account_id)
+                if method == 'POST':
+                    integration = dict(name=params['name'], type=params.get('type'), integration_key=self._key(), secret_key='n' * 40)
+                    integration.update((k, v) for k, v in params.items() if k not in integration)
+                    integrations.append(integration)
+                    return 200, integration, {}
+                return (200,) + self._page(integrations, params)
+            if path == '/admin/v1/groups':
+                groups = self.groups.setdefault(account_id, {})
+                if method == 'POST':
+                    group = dict(group_id=self._key().replace('DI', 'DG'), name=params['name'], desc=params.get('desc', ''), members=set())
+                    groups[group['group_id']] = group
+                    return 200, self._group(group), {}
+                return (200,) + self._page([self._group(g) for g in groups.values()], params)
+            if path.startswith('/admin/v2/groups/') and path.endswith('/users'):
+                group = self.groups.get(account_id, {}).get(path.split('/')[4])
+                if group is None:
+                    return 404, 'Resource not found', {}
+                users = self._users(account_id)
+                members = [dict(user_id=u, username=users[u]['username']) for u in sorted(group['members']) if u in users]
+                return (200,) + self._page(members, params)
+            if path == '/admin/v2/logs/authentication':
+                mintime, maxtime = int(params['mintime']), int(params['maxtime'])
+                log = [e for e in self._authlogs(account_id) if mintime <= e['ts'] <= maxtime]
+                if params.get('sort') == 'ts:desc':
+                    log.reverse()
+                start = 0
+                if params.get('next_offset'):
+                    ts, txid = params['next_offset'].split(',')
+                    start = next(i + 1 for i, e in enumerate(log) if e['txid'] == txid)
+                page = log[start:start + int(params.get('limit', 100))]
+                metadata = dict(total_objects=len(log))
+                if start + len(page) < len(log):
+                    metadata['next_offset'] = [str(page[-1]['ts']), page[-1]['txid']]
+                return 200, dict(authlogs=[dict((k, v) for k, v in e.items() if k != 'ts') for e in page], metadata=metadata), {}
+            if path == '/admin/v1/tokens':
+                tokens = self.tokens.setdefault(account_id, {})
+                if method == 'POST':
+                    if any(t['type'] == params['type'] and t['serial'] == params['serial'] for t in tokens.values()):
+                        return 400, 'Duplicate token', {}
+                    token = dict(token_id=self._key().replace('DI', 'DH'), type=params['type'], serial=params['serial'], users=[])
+                    tokens[token['token_id']] = token
+                    return 200, token, {}
+                return (200,) + self._page(list(tokens.values()), params)
+            if path.startswith('/admin/v1/users/') and path.endswith('/tokens'):
+                user = self._users(account_id).get(path.split('/')[4])
+                token = self.tokens.get(account_id, {}).get(params.get('token_id'))
+                if user is None or token is None:
+                    return 404, 'Resource not found', {}
+                if not any(u['user_id'] == user['user_id'] for u in token['users']):
+                    token['users'].append(dict(user_id=user['user_id'], username=user['username']))
+                return 200, '', {}
+            if path.startswith('/admin/v1/users/') and '/groups' in path:
+                parts = path.split('/')
+                group = self.groups.get(account_id, {}).get(parts[6] if len(parts) > 6 else params.get('group_id'))
+                if parts[4] not in self._users(account_id) or group is None:
+                    return 404, 'Resource not found', {}
+                if method == 'DELETE':
+                    group['members'].discard(parts[4])
+                else:
+                    group['members'].add(parts[4])
+                return 200, '', {}
+            if path.startswith('/admin/v1/users/') and path.endswith('/bypass_codes'):
+                if path.split('/')[4] not in self._users(account_id):
+                    return 404, 'Resource not found', {}
+                self.next_key += 1
+                return 200, ['{:09d}'.format((self.next_key * 7919 + i) % 10 ** 9) for i in range(int(params.get('count', 10)))], {}
+            if path == '/admin/v1/users' and method == 'GET' and 'username_list' in params:
+                # usernames and aliases are matched case-insensitively, and returned as stored
+                usernames = set(u.lower() for u in json.loads(params['username_list']))
+                return (200,) + self._page([u for u in self._users(account_id).values() if any(
+                    (u.get(k) or '').lower() in usernames for k in ('username', 'alias1', 'alias2', 'alias3', 'alias4'))], params)
+            if path == '/admin/v1/users' and method == 'GET' and 'username' in params:
+                return 200, [u for u in self._users(account_id).values() if u['username'].lower() == params['username'].lower()], {}
+            if path == '/admin/v1/users':
+                users = self._users(account_id)
+                if method == 'POST':
+                    if any(u['username'] == params['username'] for u in users.values()):
+                        return 400, 'Username already exists', {}
+                    user = dict(params, user_id=self._key().replace('DI', 'DX'), status=params.get('status', 'active'))
+                    users[user['user_id']] = user
+                    return 200, user, {}
+                return (200,) + self._page(list(users.values()), params)
+            if path.startswith('/admin/v1/users/'):
+                users = self._users(account_id)
+                user_id = path.rsplit('/', 1)[1]
+                if user_id not in users:
+                    return 404, 'Resource not found', {}
+                if method == 'DELETE':
+                    del users[user_id]
+                    return 200, '', {}
+                if method == 'POST':
+                    users[user_id].update(params)
+                return 200, users[user_id], {}
+            if path.startswith(('/admin/v1/integrations/', '/admin/v3/integrations/')):
+                integration_key = path.rsplit('/', 1)[1]
+                integrations = self._integrations(account_id)
+                for integration in integrations:
+                    if integration['integration_key'] == integration_key:
+                        if method == 'DELETE':
+                            integrations.remove(integration)
+                            return 200, '', {}
+                        if method == 'POST':
+                            integration.update(params)
+                        return 200, integration, {}
+                return 404, 'Resource not found', {}
+        return 404, 'Resource not found', {}
+
+
+class Server(ThreadingHTTPServer):
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        BaseHTTPRequestHandler.setup(self)
+        # The headers and body are written separately, so without this a
+        # keep-alive client waits for the delayed ACK of every response
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, method):
+        mock = self.server.mock
+        url = urlparse(self.path)
+        params = dict(parse_qsl(url.query))
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            body = self.rfile.read(length).decode('utf-8')
+            params.update(json.loads(body) if body.startswith('{') else dict(parse_qsl(body)))
+        if url.path == '/__stats':
+            return self._send(200, dict(mock.stats))
+        if url.path == '/__reset':
+            mock.stats.clear()
+            return self._send(200, {})
+        if mock.latency:
+            time.sleep(mock.latency)
+        if mock.throttled():
+            mock.stats['429'] += 1
+            return self._send(429, dict(stat='FAIL', code=42901, message='Too Many Requests'),
+                              {'Retry-After': str(mock.retry_after)})
+        status, response, metadata = mock.handle(method, url.path, params)
+        if status != 200:
+            return self._send(status, dict(stat='FAIL', code=status * 100, message=response))
+        self._send(200, dict(stat='OK', response=response, metadata=metadata))
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(mock, port=0):
+    '''
+    Start serving mock on 127.0.0.1 in a background thread and return the server
+    '''
+    server = Server(('127.0.0.1', port), Handler)
+    server.mock = mock
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a mock Duo Accounts and Admin API')
+    parser.add_argument('--port', type=int, default=8443)
+    parser.add_argument('--accounts', type=int, default=10, help='number of child accounts')
+    parser.add_argument('--integrations', type=int, default=5, help='number of integrations of every account')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--throttle', type=float, default=0.0, help='fraction of requests answered with HTTP 429')
+    parser.add_argument('--users', type=int, default=0, help='number of users of every account')
+    parser.add_argument('--authlogs', type=int, default=0, help='number of authentication log events of every account over the last day')
+    parser.add_argument('--retry-after', type=int, default=0, help='Retry-After of throttled requests, in seconds')
+    args = parser.parse_args()
+    server = serve(MockDuo(args.accounts, args.integrations, args.latency, args.throttle, args.retry_after, args.users, args.authlogs), args.port)
+    print('Serving the mock Duo API on http://127.0.0.1:{}'.format(server.server_address[1]))
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
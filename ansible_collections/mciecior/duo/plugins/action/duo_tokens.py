@@ -0,0 +1,15 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+from ..plugin_utils.duo_action import DuoActionBase
+
+try:
+    from ..modules import duo_tokens
+except ImportError:
+    # duo_client is not installed on the controller, run the module remotely
+    duo_tokens = None
+
+
+class ActionModule(DuoActionBase):
+
+    MODULE = duo_tokens
@@ -0,0 +1,183 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+DOCUMENTATION = '''
+---
+name: duo_metrics
+
+type: aggregate
+
+short_description: Summarize the Duo API calls of a playbook run
+
+description:
+    - "This is used to find which child accounts and Duo endpoints a long playbook run spends its time on"
+    - "Collects the duo_metrics returned by every task of this collection, including every loop item, and prints a ranked summary once the run ends"
+    - "The summary lists the slowest child accounts, the busiest endpoints and the total time lost to rate limiting, and can also be written to a JSON file for trending"
+    - "Times are the sum of the time spent in every call, so calls made concurrently by several workers or forks are all counted"
+
+requirements:
+    - Enable it in ansible.cfg with C(callbacks_enabled = mciecior.duo.duo_metrics)
+
+options:
+    top:
+        description:
+            - Number of accounts and endpoints printed in each ranking
+        type: int
+        default: 10
+        env:
+            - name: DUO_METRICS_TOP
+        ini:
+            - section: callback_duo_metrics
+              key: top
+    output_file:
+        description:
+            - Also write the full summary to this file as JSON
+        type: path
+        env:
+            - name: DUO_METRICS_FILE
+        ini:
+            - section: callback_duo_metrics
+              key: output_file
+
+author:
+    - Mark Ciecior (mciecior@carrieraccessit.com)
+'''
+
+import json
+import os
+import time
+from collections import defaultdict
+
+from ansible.plugins.callback import CallbackBase
+
+
+# The totals of duo_metrics that are summed across tasks
+COUNTERS = ('calls', 'errors', 'bytes_sent', 'bytes_received', 'time', 'retries', 'rate_limited', 'rate_limit_wait')
+
+
+class Aggregate(object):
+
+    def __init__(self):
+        self.totals = dict((k, 0.0 if k in ('time', 'rate_limit_wait') else 0) for k in COUNTERS)
+        self.tasks = 0
+        self.p95 = 0.0
+        self.max = 0.0
+
+    def add(self, metrics):
+        for k in COUNTERS:
+            self.totals[k] += metrics.get(k) or 0
+        self.tasks += 1
+        self.p95 = max(self.p95, metrics.get('p95') or 0.0)
+        self.max = max(self.max, metrics.get('max') or 0.0)
+
+    def summary(self, **kwargs):
+        summary = dict(kwargs)
+        summary.update(self.totals)
+        summary.update(
+            tasks=self.tasks,
+            time=round(self.totals['time'], 3),
+            rate_limit_wait=round(self.totals['rate_limit_wait'], 3),
+            mean=round(self.totals['time'] / self.totals['calls'], 3) if self.totals['calls'] else 0.0,
+            # the per-call latencies are not returned, so this is the worst task's p95
+            p95=round(self.p95, 3),
+            max=round(self.max, 3),
+        )
+        return summary
+
+
+class CallbackModule(CallbackBase):
+    """
+    Aggregates the duo_metrics of every task result per endpoint and per
+    child account.
+    """
+
+    CALLBACK_VERSION = 2.0
+    CALLBACK_TYPE = 'aggregate'
+    CALLBACK_NAME = 'mciecior.duo.duo_metrics'
+    CALLBACK_NEEDS_ENABLED = True
+
+    def __init__(self):
+        super(CallbackModule, self).__init__()
+        self.total = Aggregate()
+        self.endpoints = defaultdict(Aggregate)
+        self.accounts = defaultdict(Aggregate)
+        self.playbook = None
+        self.started = time.time()
+
+    def _collect(self, result):
+        results = result.get('results')
+        if isinstance(results, list):
+            for item in results:
+                if isinstance(item, dict):
+                    self._collect(item)
+        metrics = result.get('duo_metrics')
+        if not isinstance(metrics, dict):
+            return
+        self.total.add(metrics)
+        for name, values in (metrics.get('endpoints') or {}).items():
+            self.endpoints[name].add(values)
+        for account_id, values in (metrics.get('accounts') or {}).items():
+            self.accounts[account_id].add(values)
+
+    def summary(self):
+        '''
+        Returns the whole run's summary, with the endpoints ranked by calls
+        and the accounts by time
+        '''
+        summary = self.total.summary(
+            playbook=self.playbook,
+            started=self.started,
+            duration=round(time.time() - self.started, 3),
+        )
+        summary['endpoints'] = sorted(
+            (v.summary(endpoint=k) for k, v in self.endpoints.items()),
+            key=lambda e: (-e['calls'], -e['time']),
+        )
+        summary['accounts'] = sorted(
+            (v.summary(account_id=k) for k, v in self.accounts.items()),
+            key=lambda a: (-a['time'], -a['calls']),
+        )
+        return summary
+
+    def _print(self, summary):
+        top = self.get_option('top')
+        self._display.banner('DUO API METRICS')
+        self._display.display('{} calls from {} tasks, {:.3f}s in calls, {} retries, {} HTTP 429 responses'.format(
+            summary['calls'], summary['tasks'], summary['time'], summary['retries'], summary['rate_limited']))
+        self._display.display('Time lost to rate limiting: {:.3f}s'.format(summary['rate_limit_wait']))
+
+        self._display.display('\nSlowest accounts:')
+        for a in summary['accounts'][:top]:
+            self._display.display('  {:<24} {:>9.3f}s {:>7} calls {:>8.3f}s mean {:>8.3f}s max {:>5} 429s {:>9.3f}s waiting'.format(
+                a['account_id'], a['time'], a['calls'], a['mean'], a['max'], a['rate_limited'], a['rate_limit_wait']))
+
+        self._display.display('\nBusiest endpoints:')
+        for e in summary['endpoints'][:top]:
+            self._display.display('  {:<40} {:>7} calls {:>9.3f}s {:>8.3f}s mean {:>8.3f}s p95 {:>5} 429s {:>9.3f}s waiting'.format(
+                e['endpoint'], e['calls'], e['time'], e['mean'], e['p95'], e['rate_limited'], e['rate_limit_wait']))
+
+    def _write(self, path, summary):
+        tmp = path + '.tmp'
+        try:
+            with open(tmp, 'w') as f:
+                json.dump(summary, f, indent=2, sort_keys=True)
+            os.replace(tmp, path)
+        except (IOError, OSError) as e:
+            self._display.warning('Could not write Duo API metrics to {}: {}'.format(path, str(e)))
+
+    def v2_playbook_on_start(self, playbook):
+        self.playbook = playbook._file_name
+
+    def v2_runner_on_ok(self, result):
+        self._collect(result._result)
+
+    def v2_runner_on_failed(self, result, ignore_errors=False):
+        self._collect(result._result)
+
+    def v2_playbook_on_stats(self, stats):
+        if not self.total.tasks:
+            return
+        summary = self.summary()
+        self._print(summary)
+        if self.get_option('output_file'):
+            self._write(self.get_option('output_file'), summary)
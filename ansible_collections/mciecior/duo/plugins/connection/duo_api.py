@@ -0,0 +1,157 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+DOCUMENTATION = '''
+---
+name: duo_api
+
+short_description: Persistent keep-alive HTTPS connections to the Duo APIs
+
+description:
+    - "This keeps one authenticated keep-alive HTTPS connection per Duo API host open for the whole play"
+    - "The Duo modules sign their requests as usual and send them through this connection,
+      so TCP and TLS setup happens once per play instead of once per API call"
+    - "The ikey and skey never leave the module; only signed requests are passed to the connection"
+    - "The connection serves one request at a time, so calls modules make from their worker pool
+      (the workers option) open their own connections to stay concurrent"
+    - "Requires the duo_client python library on the controller"
+
+options:
+    duo_timeout:
+        description:
+            - Socket timeout in seconds for requests to the Duo APIs
+        type: int
+        default: 60
+        vars:
+            - name: duo_timeout
+    persistent_connect_timeout:
+        description:
+            - Seconds the connection waits for the next task before it is shut down
+        type: int
+        default: 30
+        ini:
+            - section: persistent_connection
+              key: connect_timeout
+        env:
+            - name: ANSIBLE_PERSISTENT_CONNECT_TIMEOUT
+        vars:
+            - name: ansible_connect_timeout
+    persistent_command_timeout:
+        description:
+            - Seconds to wait for a single request to the Duo APIs to complete
+        type: int
+        default: 30
+        ini:
+            - section: persistent_connection
+              key: command_timeout
+        env:
+            - name: ANSIBLE_PERSISTENT_COMMAND_TIMEOUT
+        vars:
+            - name: ansible_command_timeout
+    persistent_log_messages:
+        description:
+            - Log every request and response to the Ansible log file, including signed headers
+        type: bool
+        default: false
+        ini:
+            - section: persistent_connection
+              key: log_messages
+        env:
+            - name: ANSIBLE_PERSISTENT_LOG_MESSAGES
+        vars:
+            - name: ansible_persistent_log_messages
+
+author:
+    - Mark Ciecior (mciecior@carrieraccessit.com)
+'''
+
+EXAMPLES = '''
+# Route every Duo API call of the play through kept-alive connections.
+# The implicit localhost sets ansible_connection=local, so override the
+# variable rather than the connection keyword.
+- hosts: localhost
+  gather_facts: false
+  vars:
+    ansible_connection: mciecior.duo.duo_api
+  tasks:
+    - name: Create child account
+      mciecior.duo.duo_account:
+        ikey: ABCDEFGH
+        skey: ABCDEFGH12345678
+        host: api-123XYZ.duosecurity.com
+        name: Awesome Test Account
+        state: present
+'''
+
+import http.client
+
+from ansible.errors import AnsibleConnectionFailure
+from ansible.plugins.connection import NetworkConnectionBase, ensure_connect
+
+try:
+    from duo_client.client import DEFAULT_CA_CERTS
+    from duo_client.https_wrapper import CertValidatingHTTPSConnection
+    HAS_DUO_CLIENT = True
+except ImportError:
+    HAS_DUO_CLIENT = False
+
+
+class Connection(NetworkConnectionBase):
+
+    transport = 'mciecior.duo.duo_api'
+    has_pipelining = False
+
+    def __init__(self, play_context, new_stdin=None, *args, **kwargs):
+        super(Connection, self).__init__(play_context, new_stdin, *args, **kwargs)
+        self._sessions = {}
+
+    def _connect(self):
+        if not HAS_DUO_CLIENT:
+            raise AnsibleConnectionFailure('The duo_client python library is required for the duo_api connection')
+        self._connected = True
+        return self
+
+    def _session(self, host, port):
+        key = (host, port)
+        if key not in self._sessions:
+            conn = CertValidatingHTTPSConnection(host, port or 443, ca_certs=DEFAULT_CA_CERTS)
+            conn.timeout = self.get_option('duo_timeout')
+            self._sessions[key] = conn
+        return self._sessions[key]
+
+    def _drop(self, host, port):
+        conn = self._sessions.pop((host, port), None)
+        if conn is not None:
+            conn.close()
+
+    @ensure_connect
+    def send_request(self, host, port, method, uri, body, headers):
+        '''
+        Send a signed request over the kept-alive connection to host.
+
+        Returns (status, reason, headers, data).
+        '''
+        self._log_messages('duo_api request: {} https://{}{}'.format(method, host, uri))
+        while True:
+            reused = (host, port) in self._sessions
+            conn = self._session(host, port)
+            try:
+                conn.request(method, uri, body, headers)
+                response = conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                # A kept-alive connection may have been closed by the server
+                # while idle; retry once on a new one
+                self._drop(host, port)
+                if not reused:
+                    raise
+        if response.will_close:
+            self._drop(host, port)
+        self._log_messages('duo_api response: {} {}'.format(response.status, response.reason))
+        return (response.status, response.reason, response.getheaders(), data.decode('utf-8'))
+
+    def close(self):
+        for host, port in list(self._sessions):
+            self._drop(host, port)
+        super(Connection, self).close()
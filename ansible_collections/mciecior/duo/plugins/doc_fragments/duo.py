@@ -0,0 +1,112 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+
+class ModuleDocFragment(object):
+
+    # Options shared by every module that resolves a child account by name
+    ACCOUNT_CACHE = r'''
+options:
+    account_cache_ttl:
+        description:
+            - Number of seconds the list of child accounts is cached on disk and reused by later tasks.
+            - The cache is keyed by the parent ikey and host and is cleared whenever duo_account creates or deletes a child account.
+            - Set to 0 to always retrieve the list of child accounts from the Accounts API.
+        type: int
+        required: false
+        default: 300
+    account_cache_dir:
+        description:
+            - Directory holding the child account cache, and the integration cache of modules that look up integrations by name.
+            - Defaults to the DUO_ACCOUNT_CACHE_DIR environment variable, or ~/.ansible/cache/duo if that is not set.
+        type: path
+        required: false
+'''
+
+    # Options shared by every module that looks up integrations by name
+    INTEGRATION_CACHE = r'''
+options:
+    integration_cache_ttl:
+        description:
+            - Number of seconds the name, type and keys of every integration of an account are cached on disk and reused by later tasks.
+            - The cache is keyed by the parent ikey and host and the child account, and is updated whenever an integration is created or updated.
+            - The cache holds the secret keys of the integrations and is created with mode 0600 in account_cache_dir.
+            - Set to 0 to always retrieve the list of integrations from the Admin API.
+        type: int
+        required: false
+        default: 300
+'''
+
+    # Options shared by every module that can plan against a captured state
+    STATE_FILE = r'''
+options:
+    state_file:
+        description:
+            - Compare against the accounts captured in this local file instead of the API, for example an export of mciecior.duo.duo_snapshot.
+            - The file holds one JSON record per account, as JSON-lines or a JSON list, optionally gzip-compressed. A record without an account_id is the parent account.
+            - No API calls are made, and the module must run in check mode.
+        type: path
+        required: false
+'''
+
+    # Options shared by every module that can skip converged targets
+    FINGERPRINT = r'''
+options:
+    fingerprint_max_age:
+        description:
+            - Number of seconds a target that was found to match, or was updated to match, the requested parameters is trusted to still match.
+            - While it is trusted and the requested parameters are unchanged, the target is reported unchanged without retrieving it from the API.
+            - Fingerprints are kept per parent ikey and host in account_cache_dir. Set to 0 to always retrieve the current state.
+        type: int
+        required: false
+        default: 0
+    force_refresh:
+        description:
+            - Retrieve the current state even if the fingerprint of the target is still trusted.
+        type: bool
+        required: false
+        default: false
+'''
+
+    # Options shared by every module that calls the API on a worker pool
+    WORKERS = r'''
+options:
+    workers:
+        description:
+            - Maximum number of API calls made concurrently.
+        type: int
+        required: false
+        default: 8
+'''
+
+    # Options shared by every module that calls the API
+    RATE_LIMIT = r'''
+options:
+    rate_limit:
+        description:
+            - Maximum number of API requests per second, shared by every task and fork using the same host and ikey on this machine.
+            - Set this to the rate limit of your Duo account to run at the maximum allowed rate. 0 disables the limit.
+            - Defaults to the DUO_RATE_LIMIT environment variable, or 0 if that is not set.
+        type: float
+        required: false
+        default: 0
+    rate_limit_burst:
+        description:
+            - Number of requests that may be sent at once before rate_limit applies. Defaults to rate_limit.
+        type: int
+        required: false
+    max_retries:
+        description:
+            - Number of times a request rejected with HTTP 429 is retried.
+            - Retries wait for the Retry-After returned by Duo, or back off exponentially with jitter, and pause every other task using the same bucket meanwhile.
+        type: int
+        required: false
+        default: 6
+    trace_file:
+        description:
+            - Append every Duo API call of the task to this file as a span in the Chrome trace event format, which can be loaded into Perfetto or chrome://tracing.
+            - The file is shared by every task and fork that sets it. Remove it to start a new trace.
+            - Defaults to the DUO_TRACE_FILE environment variable.
+        type: path
+        required: false
+'''
@@ -0,0 +1,196 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+DOCUMENTATION = '''
+---
+name: duo_accounts
+
+short_description: Duo child accounts inventory source
+
+description:
+    - "This is used by MSPs to expose the child accounts of their portals as inventory hosts"
+    - "Every host carries the account_id and api_hostname of its child account, and optionally its billing edition"
+    - "Uses a YAML configuration file that ends with duo_accounts.(yml|yaml)"
+
+options:
+    plugin:
+        description:
+            - Token that ensures this is a source file for the plugin
+        type: str
+        required: true
+        choices: ['mciecior.duo.duo_accounts']
+    ikey:
+        description:
+            - Integration Key for the Duo Accounts API applications
+        type: str
+        required: true
+        env:
+            - name: DUO_IKEY
+    skey:
+        description:
+            - Secret Key for the Duo Accounts API applications
+        type: str
+        required: true
+        env:
+            - name: DUO_SKEY
+    host:
+        description:
+            - API Host for the Duo Accounts API applications
+        type: str
+        required: true
+        env:
+            - name: DUO_HOST
+    hostnames:
+        description:
+            - Which child account attribute is used as the inventory hostname
+        type: str
+        default: name
+        choices: ['name', 'account_id']
+    group:
+        description:
+            - Group every child account is added to
+        type: str
+        default: duo_accounts
+    include_edition:
+        description:
+            - Retrieve the billing edition of every child account into the duo_edition host variable
+            - This makes one API call per child account, so enabling the inventory cache is recommended
+        type: bool
+        default: false
+    workers:
+        description:
+            - Maximum number of billing edition API calls made concurrently
+        type: int
+        default: 8
+
+extends_documentation_fragment:
+    - constructed
+    - inventory_cache
+
+author:
+    - Mark Ciecior (mciecior@carrieraccessit.com)
+'''
+
+EXAMPLES = '''
+# duo_accounts.yml
+plugin: mciecior.duo.duo_accounts
+ikey: ABCDEFGH
+skey: ABCDEFGH12345678
+host: api-123XYZ.duosecurity.com
+include_edition: true
+compose:
+  # the Duo modules only talk to the API, so run them from the controller
+  ansible_connection: "'local'"
+keyed_groups:
+  - key: duo_edition
+    prefix: edition
+cache: true
+cache_plugin: ansible.builtin.jsonfile
+cache_connection: ~/.ansible/cache/duo_inventory
+cache_timeout: 3600
+
+# Use the host variables in a play
+# - hosts: duo_accounts
+#   gather_facts: false
+#   tasks:
+#     - duo_admin_settings:
+#         ikey: ABCDEFGH
+#         skey: ABCDEFGH12345678
+#         host: api-123XYZ.duosecurity.com
+#         account_id: "{{ account_id }}"
+#         state: present
+#         timezone: US/Central
+'''
+
+from ansible.errors import AnsibleError
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructable
+from ..module_utils.workers import run_parallel
+
+try:
+    from ..module_utils.api import ApiParams, accounts_client, edition_client
+    HAS_DUO_CLIENT = True
+except ImportError:
+    HAS_DUO_CLIENT = False
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
+
+    NAME = 'mciecior.duo.duo_accounts'
+
+    def verify_file(self, path):
+        if super(InventoryModule, self).verify_file(path):
+            return path.endswith(('duo_accounts.yml', 'duo_accounts.yaml'))
+        return False
+
+    def _get_accounts(self):
+        '''
+        Returns a list of child account dicts from the Accounts API
+        '''
+        params = ApiParams(dict(
+            ikey=self.get_option('ikey'),
+            skey=self.get_option('skey'),
+            host=self.get_option('host'),
+        ))
+        accounts_api = accounts_client(params)
+        try:
+            accounts = [
+                dict(name=a['name'], account_id=a['account_id'], api_hostname=a.get('api_hostname'))
+                for a in accounts_api.get_child_accounts()
+            ]
+        except Exception as e:
+            raise AnsibleError('Could not retrieve child accounts: {}'.format(str(e)))
+
+        if self.get_option('include_edition'):
+            def get_edition(account):
+                return edition_client(params, account['account_id']).get_billing_edition()['edition']
+
+            for account, edition, error in run_parallel(get_edition, accounts, self.get_option('workers')):
+                if error is not None:
+                    self.display.warning('Could not retrieve edition of child account {}: {}'.format(account['name'], str(error)))
+                else:
+                    account['edition'] = edition
+        return accounts
+
+    def _populate(self, accounts):
+        group = self.inventory.add_group(self.get_option('group'))
+        strict = self.get_option('strict')
+        for account in accounts:
+            hostname = self.inventory.add_host(account[self.get_option('hostnames')], group=group)
+            hostvars = dict(
+                account_id=account['account_id'],
+                api_hostname=account['api_hostname'],
+                duo_account_name=account['name'],
+            )
+            if 'edition' in account:
+                hostvars['duo_edition'] = account['edition']
+            for k, v in hostvars.items():
+                self.inventory.set_variable(hostname, k, v)
+            self._set_composite_vars(self.get_option('compose'), hostvars, hostname, strict=strict)
+            self._add_host_to_composed_groups(self.get_option('groups'), hostvars, hostname, strict=strict)
+            self._add_host_to_keyed_groups(self.get_option('keyed_groups'), hostvars, hostname, strict=strict)
+
+    def parse(self, inventory, loader, path, cache=True):
+        super(InventoryModule, self).parse(inventory, loader, path, cache)
+        self._read_config_data(path)
+
+        cache_key = self.get_cache_key(path)
+        user_cache_setting = self.get_option('cache')
+        attempt_to_read_cache = user_cache_setting and cache
+        cache_needs_update = user_cache_setting and not cache
+
+        accounts = None
+        if attempt_to_read_cache:
+            try:
+                accounts = self._cache[cache_key]
+            except KeyError:
+                cache_needs_update = True
+
+        if accounts is None:
+            if not HAS_DUO_CLIENT:
+                raise AnsibleError('The duo_client python library is required for the duo_accounts inventory plugin')
+            accounts = self._get_accounts()
+
+        if cache_needs_update:
+            self._cache[cache_key] = accounts
+
+        self._populate(accounts)
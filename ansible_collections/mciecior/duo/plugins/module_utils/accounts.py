@@ -0,0 +1,85 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+from .api import accounts_client
+from .cache import DEFAULT_CACHE_TTL, CachedIndex, cache_key
+
+
+def account_cache_argument_spec():
+    return dict(
+        account_cache_ttl=dict(type='int', required=False, default=DEFAULT_CACHE_TTL),
+        account_cache_dir=dict(type='path', required=False),
+    )
+
+
+class ChildAccountIndex(CachedIndex):
+    """
+    Index of an MSP's child accounts keyed by name.
+
+    The index maps name -> (account_id, api_hostname) and is persisted on disk
+    for ttl seconds, so every task in a play that resolves a child account
+    shares a single call to get_child_accounts().
+    """
+
+    prefix = 'accounts'
+
+    def __init__(self, accounts_api, cache_dir=None, ttl=DEFAULT_CACHE_TTL):
+        super(ChildAccountIndex, self).__init__(
+            cache_key(accounts_api.ikey, accounts_api.host.lower()),
+            cache_dir=cache_dir,
+            ttl=ttl,
+        )
+        self.accounts_api = accounts_api
+
+    @classmethod
+    def from_module(cls, module, accounts_api):
+        return cls(
+            accounts_api,
+            cache_dir=module.params.get('account_cache_dir'),
+            # A state_file holds a different view of the accounts than the API
+            ttl=0 if module.params.get('state_file') else module.params.get('account_cache_ttl', DEFAULT_CACHE_TTL),
+        )
+
+    def _fetch(self):
+        index = {}
+        for account in self.accounts_api.get_child_accounts():
+            # Keep the first match, as a linear scan of the list would
+            index.setdefault(account['name'], (account['account_id'], account.get('api_hostname')))
+        return index
+
+    def _read(self):
+        index = super(ChildAccountIndex, self)._read()
+        if index is not None:
+            index = dict((k, tuple(v)) for k, v in index.items())
+        return index
+
+    def get(self, name):
+        """
+        Returns (account_id, api_hostname) for the named child account, or None.
+
+        A miss against a cached index is confirmed with one fresh list call, so
+        accounts created outside of Ansible are still found.
+        """
+        account = self.index.get(name)
+        if account is None and not self._fresh:
+            account = self.refresh().get(name)
+        return account
+
+
+def resolve_account(module, result):
+    '''
+    Returns the account_id of the child account set by the module's
+    account_id or name parameter, or None for the parent account. Fails the
+    module if the named account cannot be found.
+    '''
+    account_id = module.params.get('account_id')
+    name = module.params.get('name')
+    if account_id or not name:
+        return account_id or None
+    try:
+        account = ChildAccountIndex.from_module(module, accounts_client(module)).get(name)
+    except Exception as e:
+        module.fail_json(msg='Could not retrieve child accounts: {}'.format(str(e)), **result)
+    if account is None:
+        module.fail_json(msg='Could not find child account {}'.format(name), **result)
+    return account[0]
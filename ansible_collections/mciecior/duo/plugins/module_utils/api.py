@@ -0,0 +1,347 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import email.utils
+import os
+import random
+import threading
+import time
+from functools import partial
+
+import duo_client
+from ansible.module_utils.basic import env_fallback
+from ansible.module_utils.connection import Connection
+from .cache import cache_key, default_cache_dir, update_state_file
+from .edition import OverrideAdmin
+from .metrics import ApiMetrics
+from .offline import OfflineMixin, StateFile
+
+
+RATE_LIMITED = 429
+DEFAULT_MAX_RETRIES = 6
+INITIAL_BACKOFF = 1.0
+MAX_BACKOFF = 32.0
+
+
+def api_argument_spec():
+    return dict(
+        rate_limit=dict(type='float', required=False, default=0, fallback=(env_fallback, ['DUO_RATE_LIMIT'])),
+        rate_limit_burst=dict(type='int', required=False),
+        max_retries=dict(type='int', required=False, default=DEFAULT_MAX_RETRIES),
+        trace_file=dict(type='path', required=False, fallback=(env_fallback, ['DUO_TRACE_FILE'])),
+    )
+
+
+class RateLimiter(object):
+    """
+    Token bucket shared by every process using the same API host and ikey.
+
+    The bucket lives in a small state file guarded by flock(), so concurrent
+    Ansible forks (and the threads of one fork) draw from one budget. A 429
+    seen by any of them pauses all of them until Retry-After has passed.
+
+    A scope, such as an endpoint and account_id, gives that scope a bucket of
+    its own, for endpoints with a stricter limit than the rest of the API.
+    """
+
+    def __init__(self, ikey, host, rate=0, burst=None, state_dir=None, scope=()):
+        self.rate = float(rate or 0)
+        self.burst = burst or max(1, int(self.rate))
+        self.state_dir = state_dir or default_cache_dir()
+        self.path = os.path.join(self.state_dir, 'ratelimit-{}.json'.format(cache_key(ikey, host.lower(), *scope)))
+
+    def _update(self, func):
+        '''
+        Run func(state, now) under the file lock and persist the state it leaves.
+        Returns whatever func returns; if the state file is unusable, acts as if
+        the bucket were always full.
+        '''
+        return update_state_file(self.path, func)
+
+    def _take(self, state, now):
+        blocked_until = state.get('blocked_until', 0)
+        if blocked_until > now:
+            return blocked_until - now
+        if self.rate <= 0:
+            return 0
+        tokens = state.get('tokens', self.burst)
+        tokens = min(self.burst, tokens + (now - state.get('updated', now)) * self.rate)
+        state['updated'] = now
+        if tokens >= 1:
+            state['tokens'] = tokens - 1
+            return 0
+        state['tokens'] = tokens
+        return (1 - tokens) / self.rate
+
+    def delay(self):
+        '''
+        Take a token if one is available. Returns 0 if it was taken, or the
+        seconds to wait before trying again.
+        '''
+        return self._update(self._take)
+
+    def acquire(self):
+        '''
+        Block until a request may be sent. Returns the seconds spent waiting.
+        '''
+        waited = 0.0
+        while True:
+            wait = self.delay()
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def block(self, seconds):
+        '''
+        Pause every user of this bucket for seconds.
+        '''
+        def _block(state, now):
+            state['blocked_until'] = max(state.get('blocked_until', 0), now + seconds)
+            state['tokens'] = 0
+        self._update(_block)
+
+
+def retry_delay(response, attempt):
+    '''
+    Returns the seconds to wait before retrying a rate limited request,
+    honoring Retry-After and falling back to jittered exponential backoff.
+    '''
+    retry_after = response.getheader('Retry-After') if hasattr(response, 'getheader') else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = email.utils.parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return max(0.0, delay) + random.uniform(0, INITIAL_BACKOFF)
+    delay = min(MAX_BACKOFF, INITIAL_BACKOFF * (2 ** attempt))
+    return random.uniform(delay / 2, delay)
+
+
+class Pages(object):
+    """
+    Iterates over the records of a paged Admin API endpoint one page at a
+    time, starting at offset and stopping after limit records.
+
+    Only one page is held in memory. After iteration, next_offset is the
+    offset of the first record not returned, or None if there are no more.
+    While a record is being handled, resume_offset is the offset of the
+    record after it, or None if it is the last, for a caller that stops
+    early.
+    """
+
+    def __init__(self, api, path, params=None, offset=0, limit=None, page_size=100):
+        self.api = api
+        self.path = path
+        self.params = params or {}
+        self.next_offset = offset or 0
+        self.resume_offset = self.next_offset
+        self.limit = limit
+        self.page_size = page_size
+
+    def __iter__(self):
+        remaining = self.limit
+        while self.next_offset is not None and (remaining is None or remaining > 0):
+            params = dict(self.params)
+            start = int(self.next_offset)
+            params['offset'] = str(start)
+            params['limit'] = str(self.page_size if remaining is None else min(self.page_size, remaining))
+            response, data = self.api.api_call('GET', self.path, params)
+            objects, metadata = self.api.parse_json_response_and_metadata(response, data)
+            self.next_offset = metadata.get('next_offset')
+            if remaining is not None:
+                remaining -= len(objects)
+            for n, obj in enumerate(objects, 1):
+                self.resume_offset = start + n if n < len(objects) else self.next_offset
+                yield obj
+
+
+class PersistentResponse(object):
+    """
+    The parts of http.client.HTTPResponse duo_client and retry_delay use,
+    for a response relayed by the duo_api connection plugin.
+    """
+
+    def __init__(self, status, reason, headers):
+        self.status = status
+        self.reason = reason
+        self._headers = dict((k.lower(), v) for k, v in headers)
+
+    def getheader(self, name, default=None):
+        return self._headers.get(name.lower(), default)
+
+
+class RateLimitedMixin(object):
+    """
+    Replaces duo_client's request loop with one that draws from a shared
+    RateLimiter and retries 429 responses up to max_retries times.
+
+    If socket_path is set, requests are relayed through the persistent
+    duo_api connection instead of opening a new HTTPS connection per call.
+    The connection serves one request at a time, so calls made from a
+    worker pool keep using their own connections and stay concurrent.
+
+    Every call, with its retries and rate limit waits, is recorded in
+    metrics if it is set.
+    """
+
+    rate_limiter = None
+    max_retries = DEFAULT_MAX_RETRIES
+    socket_path = None
+    metrics = None
+
+    def _make_request(self, method, uri, body, headers):
+        if self.socket_path is not None and threading.current_thread() is threading.main_thread():
+            return self._retry(self._persistent_request, method, uri, body, headers)
+        if self.proxy_type == 'CONNECT':
+            # Ensure the request uses the correct protocol and Host.
+            if self.ca_certs == 'HTTP':
+                api_proto = 'http'
+            else:
+                api_proto = 'https'
+            uri = ''.join((api_proto, '://', self.host, uri))
+        conn = self._connect()
+        try:
+            return self._retry(partial(self._attempt_single_request, conn), method, uri, body, headers)
+        finally:
+            self._disconnect(conn)
+
+    def _persistent_request(self, method, uri, body, headers):
+        headers = dict((k.decode('ascii'), v.decode('ascii')) for k, v in headers.items())
+        status, reason, response_headers, data = Connection(self.socket_path).send_request(
+            self.host, self.port, method, uri, body, headers)
+        return (PersistentResponse(status, reason, response_headers), data)
+
+    def _retry(self, send, method, uri, body, headers):
+        attempt = 0
+        waited = 0.0
+        status = None
+        received = 0
+        start = time.time()
+        started = time.monotonic()
+        try:
+            while True:
+                if self.rate_limiter is not None:
+                    waited += self.rate_limiter.acquire()
+                response, data = send(method, uri, body, headers)
+                status = response.status
+                received = len(data or b'')
+                if response.status != RATE_LIMITED or attempt >= self.max_retries:
+                    return (response, data)
+                delay = retry_delay(response, attempt)
+                if self.rate_limiter is not None:
+                    self.rate_limiter.block(delay)
+                time.sleep(delay)
+                waited += delay
+                attempt += 1
+        finally:
+            if self.metrics is not None:
+                self.metrics.record(
+                    method, uri, getattr(self, 'account_id', None), status, len(body or b''), received,
+                    start, time.monotonic() - started, retries=attempt,
+                    rate_limited=attempt + (1 if status == RATE_LIMITED else 0), wait=waited)
+
+
+class Accounts(RateLimitedMixin, duo_client.Accounts):
+    pass
+
+
+class Admin(RateLimitedMixin, duo_client.Admin):
+    pass
+
+
+class EditionAdmin(RateLimitedMixin, OverrideAdmin):
+    pass
+
+
+class OfflineAccounts(OfflineMixin, duo_client.Accounts):
+    pass
+
+
+class OfflineAdmin(OfflineMixin, duo_client.Admin):
+    pass
+
+
+class OfflineEditionAdmin(OfflineMixin, OverrideAdmin):
+    pass
+
+
+OFFLINE_CLIENTS = {
+    Accounts: OfflineAccounts,
+    Admin: OfflineAdmin,
+    EditionAdmin: OfflineEditionAdmin,
+}
+
+
+class ApiParams(object):
+    """
+    Stands in for AnsibleModule when a client is built outside of a module
+    """
+
+    _socket_path = None
+
+    def __init__(self, params):
+        self.params = params
+
+
+def _client(cls, module, account_id=None):
+    params = module.params
+    if params.get('state_file'):
+        return _offline_client(cls, module, account_id)
+    api = cls(
+        ikey=params['ikey'],
+        skey=params['skey'],
+        host=params['host'],
+        )
+    api.rate_limiter = RateLimiter(
+        params['ikey'],
+        params['host'],
+        rate=params.get('rate_limit'),
+        burst=params.get('rate_limit_burst'),
+        )
+    if params.get('max_retries') is not None:
+        api.max_retries = params['max_retries']
+    if account_id is not None:
+        api.account_id = account_id
+    api.socket_path = getattr(module, '_socket_path', None)
+    api.metrics = ApiMetrics.for_module(module)
+    return api
+
+
+def _offline_client(cls, module, account_id=None):
+    params = module.params
+    api = OFFLINE_CLIENTS[cls](
+        ikey=params['ikey'],
+        skey=params['skey'],
+        host=params['host'],
+        )
+    api.state = StateFile.open(params['state_file'])
+    if account_id is not None:
+        api.account_id = account_id
+    return api
+
+
+def accounts_client(module):
+    '''
+    Returns a rate limited Accounts API client built from the module's params
+    '''
+    return _client(Accounts, module)
+
+
+def admin_client(module, account_id=None):
+    '''
+    Returns a rate limited Admin API client built from the module's params,
+    targeting the child account account_id if it is set
+    '''
+    return _client(Admin, module, account_id)
+
+
+def edition_client(module, account_id=None):
+    '''
+    Returns a rate limited billing edition client built from the module's params
+    '''
+    return _client(EditionAdmin, module, account_id)
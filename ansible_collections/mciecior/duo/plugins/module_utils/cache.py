@@ -0,0 +1,165 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+
+DEFAULT_CACHE_TTL = 300
+
+
+def default_cache_dir():
+    return os.environ.get('DUO_ACCOUNT_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.ansible', 'cache', 'duo')
+
+
+def cache_key(*parts):
+    key = '@'.join(str(p) for p in parts)
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+
+def update_state_file(path, func):
+    """
+    Run func(state, now) on the JSON dict in path under an flock(), and
+    persist the state it leaves, so concurrent forks and threads see each
+    other's updates. Returns whatever func returns; if the file is unusable,
+    func is run on an empty state that is thrown away.
+    """
+    try:
+        state_dir = os.path.dirname(path)
+        if not os.path.isdir(state_dir):
+            os.makedirs(state_dir, 0o700)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    except OSError:
+        return func({}, time.time())
+    with os.fdopen(fd, 'r+') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            state = json.loads(f.read() or '{}')
+        except ValueError:
+            state = {}
+        ret = func(state, time.time())
+        f.seek(0)
+        f.truncate()
+        f.write(json.dumps(state))
+    return ret
+
+
+def read_state_file(path):
+    """
+    Returns the JSON dict in path, read under a shared flock() so it never
+    sees a half-written update_state_file(), or an empty dict if the file is
+    missing or unusable.
+    """
+    try:
+        with open(path) as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
+            return json.loads(f.read() or '{}')
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+class CachedIndex(object):
+    """
+    A lookup table built from one API listing and persisted on disk for ttl
+    seconds, so every task in a play shares the listing.
+
+    Subclasses set prefix and implement _fetch(), which returns the index as
+    a JSON-serializable dict. A ttl of 0 disables the disk cache.
+    """
+
+    prefix = 'index'
+
+    def __init__(self, key, cache_dir=None, ttl=DEFAULT_CACHE_TTL):
+        self.ttl = ttl
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.path = os.path.join(self.cache_dir, '{}-{}.json'.format(self.prefix, key))
+        self._index = None
+        self._fresh = False
+
+    def _fetch(self):
+        raise NotImplementedError
+
+    def _read(self):
+        if not self.ttl or self.ttl <= 0:
+            return None
+        try:
+            with open(self.path) as f:
+                cached = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if time.time() - cached.get('fetched', 0) > self.ttl:
+            return None
+        return cached.get('index')
+
+    def _write(self, index, fetched=None):
+        if not self.ttl or self.ttl <= 0:
+            return
+        try:
+            if not os.path.isdir(self.cache_dir):
+                os.makedirs(self.cache_dir, 0o700)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix='.{}-'.format(self.prefix))
+            with os.fdopen(fd, 'w') as f:
+                json.dump(dict(fetched=fetched or time.time(), index=index), f)
+            os.replace(tmp, self.path)
+        except (IOError, OSError):
+            # The cache is only an optimization; a read-only or full disk
+            # must never fail the task.
+            pass
+
+    def refresh(self):
+        """
+        Rebuild the index from the API and rewrite the cache.
+
+        Raises RuntimeError on API error.
+        """
+        self._index = self._fetch()
+        self._fresh = True
+        self._write(self._index)
+        return self._index
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = self._read()
+            if self._index is None:
+                self.refresh()
+        return self._index
+
+    def update(self, func):
+        """
+        Apply func(index) to the loaded index, and to the cache file under a
+        lock so concurrent tasks do not lose each other's updates. Nothing is
+        retrieved from the API, and the cache keeps its original age so
+        updates never extend its lifetime.
+        """
+        if self._index is not None:
+            func(self._index)
+        if not self.ttl or self.ttl <= 0:
+            return
+        try:
+            with open(self.path + '.lock', 'w') as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    with open(self.path) as f:
+                        cached = json.load(f)
+                except (IOError, OSError, ValueError):
+                    return
+                func(cached['index'])
+                self._write(cached['index'], cached.get('fetched'))
+        except (IOError, OSError, KeyError):
+            pass
+
+    def invalidate(self):
+        """
+        Drop the cached index.
+        """
+        self._index = None
+        self._fresh = False
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
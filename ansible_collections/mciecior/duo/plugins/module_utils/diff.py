@@ -0,0 +1,73 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+TRUE_STRINGS = ('1', 'true', 'yes', 'on')
+
+
+def normalize(value, like):
+    """
+    Returns value coerced to the type of like, so that a value returned by
+    the API compares equal to the module parameter it was set from.
+
+    The API returns booleans as true/false, 1/0 or '1'/'0', numbers as ints
+    or strings, and lists as lists or comma-separated strings.
+    """
+    if isinstance(like, bool):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return value.strip().lower() in TRUE_STRINGS
+        return bool(value)
+    if isinstance(like, (int, float)):
+        try:
+            return type(like)(value)
+        except (TypeError, ValueError):
+            return value
+    if isinstance(like, (list, tuple)):
+        if value is None:
+            value = []
+        elif isinstance(value, str):
+            value = [v.strip() for v in value.split(',') if v.strip()]
+        return sorted(str(v) for v in value)
+    if isinstance(like, str):
+        return '' if value is None else str(value)
+    return value
+
+
+def settings_diff(desired, current):
+    """
+    Compare desired settings against the current ones.
+
+    Returns a dict of key -> dict(before, after) for every desired setting
+    that is not None and differs from its current value. False, 0 and ''
+    are compared like any other value.
+    """
+    diff = {}
+    for k, v in desired.items():
+        if v is None:
+            continue
+        before = current.get(k)
+        if normalize(before, v) != normalize(v, v):
+            diff[k] = dict(before=before, after=v)
+    return diff
+
+
+def changed_values(diff):
+    """
+    Returns the settings to send for a diff from settings_diff().
+    """
+    return dict((k, v['after']) for k, v in diff.items())
+
+
+def diff_result(diff, header=None):
+    """
+    Returns a diff from settings_diff() in the format of Ansible --diff output.
+    """
+    result = dict(
+        before=dict((k, v['before']) for k, v in diff.items()),
+        after=dict((k, v['after']) for k, v in diff.items()),
+    )
+    if header:
+        result['before_header'] = header
+        result['after_header'] = header
+    return result
@@ -0,0 +1,59 @@
+# Copyright: (c) 2021, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+# This import and class can be removed once the duo_client library supports
+#   the billing edition endpoint (https://github.com/duosecurity/duo_client_python/pull/133)
+from duo_client.client import Client
+
+
+class OverrideAdmin(Client):
+    account_id = None
+
+    def api_call(self, method, path, params):
+        if self.account_id is not None:
+            params['account_id'] = self.account_id
+        return super(OverrideAdmin, self).api_call(method, path, params)
+
+    def get_billing_edition(
+        self,
+    ):
+        """
+        Returns the billing edition for a child account.
+
+        Returns dict including edition.
+
+        Raises RuntimeError on error.
+        """
+        params = {
+            'account_id': self.account_id,
+        }
+        response = self.json_api_call(
+            'GET',
+            '/admin/v1/billing/edition',
+            params
+        )
+        return response
+
+    def set_billing_edition(self, edition):
+        """
+        Sets the billing edition for a child account.
+
+        edition - <str:the edition to set> One of: ENTERPRISE, PLATFORM, or BEYOND
+
+        Returns empty string on success.
+
+        Raises RuntimeError on error.
+        """
+        params = {
+            'account_id': self.account_id,
+            'edition': edition
+        }
+        response = self.json_api_call(
+              'POST',
+              '/admin/v1/billing/edition',
+              params
+        )
+        return response
+
+
+EDITIONS = ['ENTERPRISE', 'PLATFORM', 'BEYOND']
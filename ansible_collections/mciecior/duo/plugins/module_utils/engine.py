@@ -0,0 +1,393 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import asyncio
+import base64
+import email.utils
+import hashlib
+import hmac
+import json
+import ssl
+import time
+from urllib.parse import quote, urlencode
+
+from .api import DEFAULT_MAX_RETRIES, RATE_LIMITED, RateLimiter, retry_delay
+from .metrics import ApiMetrics
+from .workers import DEFAULT_WORKERS
+
+try:
+    from duo_client.client import DEFAULT_CA_CERTS
+except ImportError:
+    DEFAULT_CA_CERTS = None
+
+
+DEFAULT_TIMEOUT = 60
+# The hash of the X-Duo-* headers of a request without any
+EMPTY_HEADERS_HASH = hashlib.sha512(b'').hexdigest()
+
+
+def encode_param(value):
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    return str(value)
+
+
+def normalize_params(params):
+    '''
+    Returns params with every value a list of strings, as they are signed
+    '''
+    return dict(
+        (str(k), [encode_param(v) for v in (v if isinstance(v, (list, tuple)) else [v])])
+        for k, v in params.items() if v is not None
+    )
+
+
+def canon_params(params):
+    args = []
+    for key, values in sorted((quote(k, '~'), v) for k, v in params.items()):
+        for value in sorted(quote(v, '~') for v in values):
+            args.append('{}={}'.format(key, value))
+    return '&'.join(args)
+
+
+def canon_json(params):
+    return json.dumps(params, sort_keys=True, separators=(',', ':'))
+
+
+def sign(ikey, skey, method, host, path, date, params, body=''):
+    '''
+    Returns the Authorization header of a request, signed with the
+    version 5 HMAC-SHA512 scheme of duo_client.client.Client
+    '''
+    canonical = '\n'.join([
+        date,
+        method.upper(),
+        host.lower(),
+        path,
+        canon_params(params),
+        hashlib.sha512(body.encode('utf-8')).hexdigest(),
+        EMPTY_HEADERS_HASH,
+    ])
+    sig = hmac.new(skey.encode('utf-8'), canonical.encode('utf-8'), hashlib.sha512)
+    auth = '{}:{}'.format(ikey, sig.hexdigest())
+    return 'Basic {}'.format(base64.b64encode(auth.encode('utf-8')).decode('ascii'))
+
+
+class AsyncResponse(object):
+    """
+    The status line and headers of a response
+    """
+
+    def __init__(self, status, reason, headers):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name.lower(), default)
+
+
+class AsyncClient(object):
+    """
+    Signs and sends Duo API requests from an asyncio event loop.
+
+    Up to concurrency requests are in flight at once, over HTTP/1.1
+    keep-alive connections that are reused from a pool. Like
+    RateLimitedMixin, every request draws from rate_limiter, 429 responses
+    are retried up to max_retries times and calls are recorded in metrics.
+
+    A client targets any child account per call through account_id, so one
+    client, and one connection pool, serves a whole fleet.
+    """
+
+    rate_limiter = None
+    max_retries = DEFAULT_MAX_RETRIES
+    metrics = None
+
+    def __init__(self, ikey, skey, host, ca_certs=DEFAULT_CA_CERTS, port=None,
+                 concurrency=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT):
+        self.ikey = ikey
+        self.skey = skey
+        self.host = host
+        # ca_certs='HTTP' disables TLS, as it does for duo_client
+        if ca_certs == 'HTTP':
+            self.ssl = None
+            self.port = port or 80
+        else:
+            self.ssl = ssl.create_default_context(cafile=ca_certs)
+            self.port = port or 443
+        self.concurrency = max(1, concurrency or DEFAULT_WORKERS)
+        self.timeout = timeout
+        self._idle = []
+        self._slots = None
+
+    async def _open(self):
+        return await asyncio.open_connection(
+            self.host, self.port, ssl=self.ssl, server_hostname=self.host if self.ssl else None)
+
+    async def _exchange(self, conn, request):
+        reader, writer = conn
+        writer.write(request)
+        await writer.drain()
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection closed by {}'.format(self.host))
+        version, status, reason = (status_line.decode('latin-1').rstrip('\r\n').split(' ', 2) + [''])[:3]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        keep_alive = headers.get('connection', '').lower() != 'close' and version != 'HTTP/1.0'
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';', 1)[0], 16)
+                if not size:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            data = b''.join(chunks)
+        elif 'content-length' in headers:
+            data = await reader.readexactly(int(headers['content-length']))
+        else:
+            data = await reader.read()
+            keep_alive = False
+        return AsyncResponse(int(status), reason, headers), data, keep_alive
+
+    async def _send(self, request):
+        '''
+        Send request over a pooled connection and return (response, data)
+        '''
+        reused = bool(self._idle)
+        conn = self._idle.pop() if reused else await self._open()
+        try:
+            response, data, keep_alive = await asyncio.wait_for(self._exchange(conn, request), self.timeout)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            conn[1].close()
+            if not reused:
+                raise
+            # The server closed the idle connection, retry on a new one
+            conn = await self._open()
+            try:
+                response, data, keep_alive = await asyncio.wait_for(self._exchange(conn, request), self.timeout)
+            except BaseException:
+                conn[1].close()
+                raise
+        except BaseException:
+            conn[1].close()
+            raise
+        if keep_alive:
+            self._idle.append(conn)
+        else:
+            conn[1].close()
+        return response, data
+
+    def _request(self, method, path, params):
+        '''
+        Returns the uri, body and encoded request of a signed API call
+        '''
+        date = email.utils.formatdate()
+        headers = [('Host', self.host if self.port in (80, 443) else '{}:{}'.format(self.host, self.port)), ('Date', date)]
+        if method in ('POST', 'PUT', 'PATCH'):
+            body = canon_json(params)
+            uri = path
+            headers.append(('Authorization', sign(self.ikey, self.skey, method, self.host, path, date, {}, body)))
+            headers.append(('Content-Type', 'application/json'))
+        else:
+            params = normalize_params(params)
+            body = ''
+            uri = path + '?' + urlencode(params, doseq=True)
+            headers.append(('Authorization', sign(self.ikey, self.skey, method, self.host, path, date, params)))
+        body = body.encode('utf-8')
+        headers.append(('Content-Length', str(len(body))))
+        request = '{} {} HTTP/1.1\r\n{}\r\n\r\n'.format(method, uri, '\r\n'.join('{}: {}'.format(k, v) for k, v in headers))
+        return uri, body, request.encode('ascii') + body
+
+    async def _acquire(self, rate_limiter):
+        waited = 0.0
+        while rate_limiter is not None:
+            # The bucket is a file shared with other processes; holding its
+            # lock is brief, so it is taken from the event loop directly
+            wait = rate_limiter.delay()
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+            waited += wait
+        return waited
+
+    async def api_call(self, method, path, params, account_id=None, rate_limiter=None):
+        '''
+        Call a Duo API method for account_id, or the parent account if it is
+        None. Returns a (response, data) tuple.
+
+        rate_limiter is a bucket of the endpoint drawn from in addition to the
+        client's, waited on before the call takes one of the concurrent slots.
+        '''
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.concurrency)
+        params = dict(params)
+        if account_id is not None:
+            params['account_id'] = account_id
+        attempt = 0
+        waited = 0.0
+        status = None
+        sent = 0
+        data = b''
+        start = time.time()
+        started = time.monotonic()
+        try:
+            waited += await self._acquire(rate_limiter)
+            async with self._slots:
+                while True:
+                    waited += await self._acquire(self.rate_limiter)
+                    # Signed per attempt, as the Date header must be current
+                    uri, body, request = self._request(method, path, params)
+                    sent = len(body)
+                    response, data = await self._send(request)
+                    status = response.status
+                    if status != RATE_LIMITED or attempt >= self.max_retries:
+                        return (response, data)
+                    delay = retry_delay(response, attempt)
+                    for limiter in (self.rate_limiter, rate_limiter):
+                        if limiter is not None:
+                            limiter.block(delay)
+                    await asyncio.sleep(delay)
+                    waited += delay
+                    attempt += 1
+        finally:
+            if self.metrics is not None:
+                self.metrics.record(
+                    method, path, account_id, status, sent, len(data or b''), start, time.monotonic() - started, retries=attempt,
+                    rate_limited=attempt + (1 if status == RATE_LIMITED else 0), wait=waited)
+
+    def parse_json_response_and_metadata(self, response, data):
+        '''
+        Returns the response and metadata of a call, or raises RuntimeError
+        like duo_client does
+        '''
+        def raise_error(msg):
+            error = RuntimeError(msg)
+            error.status = response.status
+            error.reason = response.reason
+            error.data = data
+            raise error
+        try:
+            parsed = json.loads(data.decode('utf-8'))
+        except ValueError:
+            parsed = None
+        if response.status != 200:
+            if isinstance(parsed, dict) and parsed.get('stat') == 'FAIL' and 'message' in parsed:
+                if 'message_detail' in parsed:
+                    raise_error('Received {} {} ({})'.format(response.status, parsed['message'], parsed['message_detail']))
+                raise_error('Received {} {}'.format(response.status, parsed['message']))
+            raise_error('Received {} {}'.format(response.status, response.reason))
+        if not isinstance(parsed, dict) or parsed.get('stat') != 'OK' or 'response' not in parsed:
+            raise_error('Received bad response: {}'.format(data))
+        metadata = parsed.get('metadata') or {}
+        if not metadata and isinstance(parsed['response'], dict):
+            metadata = parsed['response'].get('metadata', {})
+        return parsed['response'], metadata
+
+    async def json_api_call(self, method, path, params, account_id=None):
+        response, data = await self.api_call(method, path, params, account_id)
+        return self.parse_json_response_and_metadata(response, data)[0]
+
+    async def pages(self, path, params=None, account_id=None, page_size=100):
+        '''
+        Yields the objects of a paged GET endpoint, one page at a time
+        '''
+        params = dict(params or {}, limit=page_size, offset=0)
+        while True:
+            response, data = await self.api_call('GET', path, params, account_id)
+            objects, metadata = self.parse_json_response_and_metadata(response, data)
+            for obj in objects:
+                yield obj
+            next_offset = metadata.get('next_offset')
+            if next_offset is None or not objects:
+                return
+            params['offset'] = next_offset
+
+    def close(self):
+        for reader, writer in self._idle:
+            writer.close()
+        self._idle = []
+        self._slots = None
+
+    def run(self, coro):
+        '''
+        Run coro to completion in a new event loop, closing the pooled
+        connections afterwards
+        '''
+        async def main():
+            try:
+                return await coro
+            finally:
+                self.close()
+        return asyncio.run(main())
+
+
+def async_client(module):
+    '''
+    Returns an AsyncClient built from the module's params, making up to
+    workers calls concurrently
+    '''
+    params = module.params
+    api = AsyncClient(
+        params['ikey'],
+        params['skey'],
+        params['host'],
+        concurrency=params.get('workers'),
+        )
+    api.rate_limiter = RateLimiter(
+        params['ikey'],
+        params['host'],
+        rate=params.get('rate_limit'),
+        burst=params.get('rate_limit_burst'),
+        )
+    if params.get('max_retries') is not None:
+        api.max_retries = params['max_retries']
+    api.metrics = ApiMetrics.for_module(module)
+    return api
+
+
+async def for_each(api, func, items, on_result=None):
+    """
+    Await func(api, item) for every item, with at most api.concurrency
+    items started at once.
+
+    Like run_parallel, an exception raised for one item is returned as its
+    error. If on_result is set, it is called with (item, result, error) as
+    each item completes; otherwise a list of those tuples is returned in the
+    order of items. items may be a generator, which is only advanced as
+    items complete, so streaming inputs are never held in memory.
+    """
+    items = enumerate(items)
+    results = {}
+
+    async def worker():
+        # next() runs without yielding to the event loop, so the workers
+        # can safely share one iterator
+        for index, item in items:
+            try:
+                outcome = (item, await func(api, item), None)
+            except Exception as e:
+                outcome = (item, None, e)
+            if on_result is not None:
+                on_result(*outcome)
+            else:
+                results[index] = outcome
+
+    await asyncio.gather(*[worker() for i in range(api.concurrency)])
+    if on_result is None:
+        return [results[k] for k in sorted(results)]
+
+
+def run_async(api, func, items, on_result=None):
+    """
+    Run for_each in a new event loop, for a module without one.
+    """
+    return api.run(for_each(api, func, items, on_result))
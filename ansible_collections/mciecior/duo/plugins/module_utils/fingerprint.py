@@ -0,0 +1,97 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import hashlib
+import json
+import os
+import time
+
+from .cache import cache_key, default_cache_dir, read_state_file, update_state_file
+
+
+def fingerprint_argument_spec():
+    return dict(
+        fingerprint_max_age=dict(type='int', required=False, default=0),
+        force_refresh=dict(type='bool', required=False, default=False),
+    )
+
+
+def fingerprint(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class FingerprintStore(object):
+    """
+    Remembers which desired state was last applied to (or found on) each
+    target, so a later run with the same desired state can skip retrieving
+    the current state until the entry is max_age seconds old.
+
+    Entries map a target, such as an account_id, to the fingerprint of the
+    desired parameters and when they were last seen applied. A max_age of 0
+    disables the store.
+
+    The store is read once, under a shared lock, on the first check. New
+    entries are kept in memory until flush(), which merges them into the
+    file in one write, so a rollout over many targets reads and writes the
+    file once each.
+    """
+
+    def __init__(self, ikey, host, kind, max_age=0, cache_dir=None, force_refresh=False):
+        self.max_age = max_age or 0
+        self.force_refresh = force_refresh
+        self.path = os.path.join(
+            cache_dir or default_cache_dir(),
+            'fingerprints-{}-{}.json'.format(kind, cache_key(ikey, host.lower())),
+        )
+        self._state = None
+        self._pending = {}
+
+    @classmethod
+    def from_module(cls, module, kind):
+        return cls(
+            module.params['ikey'],
+            module.params['host'],
+            kind,
+            # A state_file is never the state that was applied
+            max_age=0 if module.params.get('state_file') else module.params.get('fingerprint_max_age'),
+            cache_dir=module.params.get('account_cache_dir'),
+            force_refresh=module.params.get('force_refresh'),
+        )
+
+    @property
+    def enabled(self):
+        return self.max_age > 0
+
+    def converged(self, target, desired):
+        """
+        Returns True if desired was applied to target less than max_age
+        seconds ago.
+        """
+        if not self.enabled or self.force_refresh:
+            return False
+        if self._state is None:
+            self._state = read_state_file(self.path)
+        entry = self._state.get(target)
+        return bool(entry) and entry['desired'] == fingerprint(desired) and time.time() - entry['checked'] <= self.max_age
+
+    def record(self, target, desired):
+        """
+        Remember that target matched desired. The entry is written by flush().
+        """
+        if self.enabled:
+            self._pending[target] = dict(desired=fingerprint(desired), checked=time.time())
+
+    def flush(self):
+        """
+        Write the entries recorded since the last flush(), dropping the
+        entries that are older than max_age.
+        """
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+
+        def store(state, now):
+            for k in [k for k, v in state.items() if now - v['checked'] > self.max_age]:
+                del state[k]
+            state.update(pending)
+        update_state_file(self.path, store)
@@ -0,0 +1,39 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+from .users import user_key
+
+# Largest pages the Admin API returns for the groups and group members endpoints
+GROUPS_PAGE_SIZE = 100
+GROUP_MEMBERS_PAGE_SIZE = 500
+
+
+async def find_group(api, name, account_id=None):
+    '''
+    Returns the group named name, or None
+    '''
+    async for group in api.pages('/admin/v1/groups', account_id=account_id, page_size=GROUPS_PAGE_SIZE):
+        if group.get('name') == name:
+            return group
+    return None
+
+
+async def group_members(api, group_id, account_id=None):
+    """
+    Returns the members of a group keyed by user_key(username), each as
+    (user_id, username), retrieved with one pass over the paged members
+    endpoint.
+    """
+    members = {}
+    path = '/admin/v2/groups/{}/users'.format(group_id)
+    async for user in api.pages(path, account_id=account_id, page_size=GROUP_MEMBERS_PAGE_SIZE):
+        members[user_key(user['username'])] = (user['user_id'], user['username'])
+    return members
+
+
+async def add_member(api, group_id, user_id, account_id=None):
+    return await api.json_api_call('POST', '/admin/v1/users/{}/groups'.format(user_id), dict(group_id=group_id), account_id)
+
+
+async def remove_member(api, group_id, user_id, account_id=None):
+    return await api.json_api_call('DELETE', '/admin/v1/users/{}/groups/{}'.format(user_id, group_id), {}, account_id)
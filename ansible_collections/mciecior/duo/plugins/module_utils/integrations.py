@@ -0,0 +1,144 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+from .api import Pages
+from .cache import DEFAULT_CACHE_TTL, CachedIndex, cache_key
+
+
+INTEGRATIONS_PAGE_SIZE = 300
+
+# Keyword arguments of create_integration()/update_integration() that can be
+# set on an integration besides its name and type
+INTEGRATION_SETTINGS = [
+    'greeting',
+    'notes',
+    'enroll_policy',
+    'username_normalization_policy',
+    'adminapi_admins',
+    'adminapi_info',
+    'adminapi_integrations',
+    'adminapi_read_log',
+    'adminapi_read_resource',
+    'adminapi_settings',
+    'adminapi_write_resource',
+    'trusted_device_days',
+    'ip_whitelist',
+    'ip_whitelist_enroll_policy',
+    'groups_allowed',
+    'self_service_allowed',
+    'sso',
+    'user_access',
+]
+
+
+def integration_cache_argument_spec():
+    return dict(
+        integration_cache_ttl=dict(type='int', required=False, default=DEFAULT_CACHE_TTL),
+    )
+
+
+class IntegrationIndex(CachedIndex):
+    """
+    Index of the integrations of one Duo account keyed by name.
+
+    The index maps name -> list of {type, integration_key, secret_key} and
+    is built from a single paged listing, then persisted on disk for ttl
+    seconds and kept current as integrations are created and updated, so
+    looking up an integration by name costs no API calls.
+
+    The cache file holds secret keys and is only readable by its owner.
+    """
+
+    prefix = 'integrations'
+
+    def __init__(self, admin_api, cache_dir=None, ttl=DEFAULT_CACHE_TTL):
+        super(IntegrationIndex, self).__init__(
+            cache_key(admin_api.ikey, admin_api.host.lower(), admin_api.account_id or ''),
+            cache_dir=cache_dir,
+            ttl=ttl,
+        )
+        self.admin_api = admin_api
+
+    @classmethod
+    def from_module(cls, module, admin_api):
+        return cls(
+            admin_api,
+            cache_dir=module.params.get('account_cache_dir'),
+            # A state_file holds a different view of the integrations than the API
+            ttl=0 if module.params.get('state_file') else module.params.get('integration_cache_ttl', DEFAULT_CACHE_TTL),
+        )
+
+    @staticmethod
+    def _entry(integration):
+        return dict(
+            type=integration.get('type'),
+            integration_key=integration['integration_key'],
+            secret_key=integration.get('secret_key'),
+        )
+
+    @staticmethod
+    def _drop(index, integration_key):
+        for name in list(index):
+            index[name] = [e for e in index[name] if e['integration_key'] != integration_key]
+            if not index[name]:
+                del index[name]
+
+    def _fetch(self):
+        return self._build(Pages(self.admin_api, '/admin/v1/integrations', page_size=INTEGRATIONS_PAGE_SIZE))
+
+    def _build(self, integrations):
+        index = {}
+        for i in integrations:
+            index.setdefault(i['name'], []).append(self._entry(i))
+        return index
+
+    def load(self, integrations):
+        """
+        Replace the index with a full listing of the integrations retrieved
+        elsewhere, and rewrite the cache.
+        """
+        self._index = self._build(integrations)
+        self._fresh = True
+        self._write(self._index)
+        return self._index
+
+    def get(self, name, integration_type=None):
+        """
+        Returns {type, integration_key, secret_key} of the first integration
+        with this name, and this type if given, or None.
+
+        A miss against a cached index is confirmed with one fresh listing, so
+        integrations created outside of Ansible are still found.
+        """
+        def find(index):
+            for entry in index.get(name, []):
+                if integration_type is None or entry['type'] == integration_type:
+                    return entry
+            return None
+
+        entry = find(self.index)
+        if entry is None and not self._fresh:
+            entry = find(self.refresh())
+        return entry
+
+    def put(self, integration):
+        """
+        Record an integration returned by create_integration() or
+        update_integration(), replacing any entry with the same key.
+        """
+        if not isinstance(integration, dict) or 'name' not in integration or 'integration_key' not in integration:
+            self.invalidate()
+            return
+        entry = self._entry(integration)
+
+        def apply(index):
+            self._drop(index, entry['integration_key'])
+            index.setdefault(integration['name'], []).append(entry)
+
+        self.update(apply)
+
+    def remove(self, integration_key):
+        """
+        Forget an integration removed by delete_integration().
+        """
+        self.update(lambda index: self._drop(index, integration_key))
@@ -0,0 +1,129 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import fcntl
+import json
+import os
+
+from .api import RateLimiter
+from .cache import cache_key, default_cache_dir, read_state_file, update_state_file
+
+AUTHLOG_PATH = '/admin/v2/logs/authentication'
+
+# Largest page the Admin API returns for the authentication log
+AUTHLOG_PAGE_SIZE = 1000
+
+# Events can take this many milliseconds to appear in the log, so a window
+# ends this long ago and is never fetched again once it is complete
+AUTHLOG_DELAY = 2 * 60 * 1000
+
+# Requests per minute to the log endpoints of one account
+DEFAULT_LOG_RATE_LIMIT = 1.0
+
+
+def log_argument_spec():
+    return dict(
+        log_rate_limit=dict(type='float', required=False, default=DEFAULT_LOG_RATE_LIMIT),
+    )
+
+
+def log_rate_limiter(module, account_id=None):
+    '''
+    Returns the bucket of the log endpoints of account_id, shared by every
+    task and fork pulling the logs of that account on this machine
+    '''
+    rate = module.params.get('log_rate_limit') or 0
+    return RateLimiter(
+        module.params['ikey'],
+        module.params['host'],
+        rate=rate / 60.0,
+        burst=1,
+        state_dir=module.params.get('account_cache_dir'),
+        scope=('logs', account_id or ''),
+    )
+
+
+class LogCheckpoints(object):
+    """
+    Remembers how far the log of each account was exported to dest.
+
+    Entries map an account_id, or parent, to the mintime of the next window
+    to fetch. While a window is being fetched, the entry also holds its
+    maxtime and the next_offset of the next page, so a run that is
+    interrupted resumes where it stopped instead of exporting events twice.
+    """
+
+    def __init__(self, ikey, host, dest, path=None, cache_dir=None):
+        self.path = path or os.path.join(
+            cache_dir or default_cache_dir(),
+            'authlog-{}.json'.format(cache_key(ikey, host.lower(), os.path.abspath(dest))),
+        )
+
+    @classmethod
+    def from_module(cls, module):
+        return cls(
+            module.params['ikey'],
+            module.params['host'],
+            module.params['dest'],
+            path=module.params.get('checkpoint_file'),
+            cache_dir=module.params.get('account_cache_dir'),
+        )
+
+    def get(self, account_id):
+        return read_state_file(self.path).get(account_id or 'parent')
+
+    def save(self, account_id, mintime, maxtime=None, next_offset=None):
+        entry = dict(mintime=mintime)
+        if next_offset is not None:
+            entry.update(maxtime=maxtime, next_offset=next_offset)
+
+        def store(state, now):
+            state[account_id or 'parent'] = dict(entry, updated=now)
+        update_state_file(self.path, store)
+
+
+def append_records(path, records, **extra):
+    """
+    Append records to the JSON-lines file in path, each with the extra keys
+    added, in one write under an flock(), so forks exporting to the same
+    file never interleave their lines.
+    """
+    lines = ''.join(json.dumps(dict(record, **extra), sort_keys=True) + '\n' for record in records)
+    if not lines:
+        return
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+async def authlog_pages(api, account_id, mintime, maxtime, next_offset=None, rate_limiter=None, page_size=AUTHLOG_PAGE_SIZE):
+    """
+    Yields (records, next_offset) for every page of the authentication log
+    of account_id between mintime and maxtime, oldest first, following the
+    next_offset cursor of the v2 log. next_offset is None on the last page.
+    """
+    params = dict(mintime=str(mintime), maxtime=str(maxtime), limit=str(page_size), sort='ts:asc')
+    while True:
+        if next_offset is not None:
+            params['next_offset'] = next_offset
+        response, data = await api.api_call('GET', AUTHLOG_PATH, params, account_id, rate_limiter=rate_limiter)
+        page, metadata = api.parse_json_response_and_metadata(response, data)
+        cursor = metadata.get('next_offset')
+        next_offset = ','.join(str(v) for v in cursor) if isinstance(cursor, list) else cursor
+        records = page.get('authlogs') or []
+        yield records, next_offset if records else None
+        if next_offset is None or not records:
+            return
+
+
+async def authlog_count(api, account_id, mintime, maxtime, rate_limiter=None):
+    '''
+    Returns the number of events of the authentication log of account_id
+    between mintime and maxtime, with one call
+    '''
+    params = dict(mintime=str(mintime), maxtime=str(maxtime), limit='1')
+    response, data = await api.api_call('GET', AUTHLOG_PATH, params, account_id, rate_limiter=rate_limiter)
+    page, metadata = api.parse_json_response_and_metadata(response, data)
+    return metadata.get('total_objects', len(page.get('authlogs') or []))
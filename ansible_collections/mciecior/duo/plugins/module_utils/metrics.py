@@ -0,0 +1,172 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import fcntl
+import json
+import os
+import re
+import threading
+from collections import defaultdict
+from urllib.parse import urlparse
+
+
+# Path segments that identify one object, such as an integration key, are
+# replaced so calls to the same endpoint are counted together
+OBJECT_ID = re.compile(r'^D[A-Z0-9]{9,}$')
+
+PARENT_ACCOUNT = 'parent'
+
+
+def endpoint(method, uri):
+    '''
+    Returns "METHOD /path" for a request, without the query string or host
+    and with object ids replaced by {id}
+    '''
+    path = urlparse(uri).path
+    return '{} {}'.format(method, '/'.join('{id}' if OBJECT_ID.match(s) else s for s in path.split('/')))
+
+
+def percentile(values, pct):
+    '''
+    Returns the nearest-rank percentile of sorted values
+    '''
+    if not values:
+        return 0.0
+    rank = max(1, int(-(-len(values) * pct // 100)))
+    return values[rank - 1]
+
+
+class Totals(object):
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.time = 0.0
+        self.retries = 0
+        self.rate_limited = 0
+        self.rate_limit_wait = 0.0
+        self.latencies = []
+
+    def add(self, status, sent, received, duration, retries, rate_limited, wait):
+        self.calls += 1
+        if status is None or status >= 400:
+            self.errors += 1
+        self.bytes_sent += sent
+        self.bytes_received += received
+        self.time += duration
+        self.retries += retries
+        self.rate_limited += rate_limited
+        self.rate_limit_wait += wait
+        self.latencies.append(duration)
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+        return dict(
+            calls=self.calls,
+            errors=self.errors,
+            bytes_sent=self.bytes_sent,
+            bytes_received=self.bytes_received,
+            time=round(self.time, 3),
+            p50=round(percentile(latencies, 50), 3),
+            p95=round(percentile(latencies, 95), 3),
+            max=round(latencies[-1] if latencies else 0.0, 3),
+            retries=self.retries,
+            rate_limited=self.rate_limited,
+            rate_limit_wait=round(self.rate_limit_wait, 3),
+        )
+
+
+class ApiMetrics(object):
+    """
+    Collects the API calls made by every client of one module, and returns
+    them with the module's result as duo_metrics.
+
+    A call is one request as the module sees it, including its rate limit
+    waits and retries. Calls are totalled per endpoint and per child
+    account. If trace_file is set, every call is also appended to it as a
+    complete event of the Chrome trace event format, which Perfetto and
+    chrome://tracing can load. The file is a JSON array whose closing
+    bracket is left out, as that format allows, so any number of tasks and
+    forks can append to it.
+    """
+
+    def __init__(self, trace_file=None):
+        self.trace_file = trace_file
+        self.lock = threading.Lock()
+        self.total = Totals()
+        self.endpoints = defaultdict(Totals)
+        self.accounts = defaultdict(Totals)
+
+    @classmethod
+    def for_module(cls, module):
+        '''
+        Returns the metrics of module, attaching new ones on first use
+        '''
+        metrics = getattr(module, '_duo_metrics', None)
+        if metrics is None:
+            metrics = cls(module.params.get('trace_file'))
+            metrics.attach(module)
+        return metrics
+
+    def attach(self, module):
+        '''
+        Add duo_metrics to every result module exits with
+        '''
+        module._duo_metrics = self
+        for name in ('exit_json', 'fail_json'):
+            if hasattr(module, name):
+                setattr(module, name, self._wrap(getattr(module, name)))
+
+    def _wrap(self, func):
+        def wrapper(*args, **kwargs):
+            kwargs.setdefault('duo_metrics', self.summary())
+            return func(*args, **kwargs)
+        return wrapper
+
+    def record(self, method, uri, account_id, status, sent, received, start, duration, retries=0, rate_limited=0, wait=0.0):
+        '''
+        Record one call that started at the epoch time start and took
+        duration seconds, wait of them waiting on the rate limit
+        '''
+        name = endpoint(method, uri)
+        values = (status, sent, received, duration, retries, rate_limited, wait)
+        with self.lock:
+            self.total.add(*values)
+            self.endpoints[name].add(*values)
+            self.accounts[account_id or PARENT_ACCOUNT].add(*values)
+        if self.trace_file:
+            self.trace(dict(
+                name=name,
+                cat='duo',
+                ph='X',
+                ts=int(start * 1000000),
+                dur=int(duration * 1000000),
+                pid=os.getpid(),
+                tid=threading.get_ident(),
+                args=dict(account_id=account_id, status=status, bytes_sent=sent, bytes_received=received,
+                          retries=retries, rate_limited=rate_limited, rate_limit_wait=round(wait, 3)),
+            ))
+
+    def trace(self, event):
+        line = (json.dumps(event, sort_keys=True) + ',\n').encode('utf-8')
+        try:
+            fd = os.open(self.trace_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                if os.fstat(fd).st_size == 0:
+                    line = b'[\n' + line
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        except (IOError, OSError):
+            # Tracing is a diagnostic, it never fails the task
+            pass
+
+    def summary(self):
+        with self.lock:
+            summary = self.total.summary()
+            summary['endpoints'] = dict((k, v.summary()) for k, v in self.endpoints.items())
+            summary['accounts'] = dict((k, v.summary()) for k, v in self.accounts.items())
+        return summary
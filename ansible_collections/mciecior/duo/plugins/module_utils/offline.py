@@ -0,0 +1,203 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import gzip
+import json
+import os
+import threading
+from urllib.parse import parse_qsl, urlparse
+
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def offline_argument_spec():
+    return dict(
+        state_file=dict(type='path', required=False),
+    )
+
+
+def check_offline(module, result):
+    '''
+    Fail unless a module planning against a state_file runs in check mode
+    '''
+    if module.params.get('state_file') and not module.check_mode:
+        module.fail_json(msg='state_file can only be used in check mode', **result)
+
+
+class StateFile(object):
+    """
+    Account records previously captured to a local file, for example by
+    duo_snapshot.
+
+    The file is JSON-lines or a JSON list, optionally gzip-compressed, with
+    one record per account holding its account_id, name, api_hostname,
+    settings, integrations and edition. A record without an account_id is
+    the parent account.
+
+    The file is scanned once, on the first lookup, to index where every
+    account's record is: its byte offset in an uncompressed JSON-lines
+    file, or else its JSON text. A record is only parsed when it is looked
+    up. StateFile.open() returns the same instance for a file throughout a
+    run, so the per-account clients share the index.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._index = None
+        self._accounts = None
+
+    @classmethod
+    def open(cls, path):
+        try:
+            st = os.stat(path)
+            key = (os.path.abspath(path), st.st_mtime, st.st_size)
+        except OSError:
+            key = (os.path.abspath(path), None, None)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(path)
+            return cls._instances[key]
+
+    def _open(self):
+        with open(self.path, 'rb') as f:
+            magic = f.read(2)
+        if magic == GZIP_MAGIC:
+            return gzip.open(self.path, 'rt')
+        return open(self.path)
+
+    def _is_plain(self):
+        with open(self.path, 'rb') as f:
+            head = f.read(4096)
+        return not head.startswith(GZIP_MAGIC) and not head.lstrip().startswith(b'[')
+
+    def _entries(self):
+        '''
+        Yields (record, location) for every record, where location is the
+        byte offset of the record in a plain JSON-lines file, or else its
+        JSON text
+        '''
+        if self._is_plain():
+            with open(self.path, 'rb') as f:
+                offset = f.tell()
+                line = f.readline()
+                while line:
+                    if line.strip():
+                        yield json.loads(line.decode('utf-8')), offset
+                    offset = f.tell()
+                    line = f.readline()
+            return
+        for record in self.records():
+            yield record, json.dumps(record)
+
+    def _build_index(self):
+        with self._lock:
+            if self._index is None:
+                index = {}
+                accounts = []
+                for record, location in self._entries():
+                    index.setdefault(record.get('account_id'), location)
+                    if record.get('account_id'):
+                        accounts.append(dict(account_id=record['account_id'], name=record.get('name'),
+                                             api_hostname=record.get('api_hostname')))
+                self._accounts = accounts
+                self._index = index
+        return self._index
+
+    def records(self):
+        with self._open() as f:
+            first = f.read(1)
+            while first.isspace():
+                first = f.read(1)
+            if first == '[':
+                for record in json.loads(first + f.read()):
+                    yield record
+                return
+            line = first + f.readline()
+            while line:
+                if line.strip():
+                    yield json.loads(line)
+                line = f.readline()
+
+    def record(self, account_id):
+        location = self._build_index().get(account_id)
+        if location is None:
+            return None
+        if isinstance(location, str):
+            return json.loads(location)
+        with open(self.path, 'rb') as f:
+            f.seek(location)
+            return json.loads(f.readline().decode('utf-8'))
+
+    def accounts(self):
+        self._build_index()
+        return list(self._accounts)
+
+
+class OfflineMixin(object):
+    """
+    Answers the read-only calls of a duo_client client from a StateFile
+    instead of the API. Every other call raises RuntimeError, so nothing
+    can be changed.
+    """
+
+    state = None
+
+    def _resource(self, account_id, key):
+        record = self.state.record(account_id)
+        if record is None or key not in record:
+            raise RuntimeError('No {} for account {} in {}'.format(key, account_id or '(parent)', self.state.path))
+        return record[key]
+
+    def _route(self, method, path, params):
+        account_id = params.get('account_id') or None
+        if path == '/accounts/v1/account/list':
+            return self.state.accounts(), {}
+        if method != 'GET':
+            raise RuntimeError('Cannot {} {} with state_file set'.format(method, path))
+        if path == '/admin/v1/settings':
+            return self._resource(account_id, 'settings'), {}
+        if path in ('/admin/v1/integrations', '/admin/v3/integrations'):
+            integrations = self._resource(account_id, 'integrations')
+            offset = int(params.get('offset', 0))
+            limit = int(params.get('limit', len(integrations) or 1))
+            metadata = dict(total_objects=len(integrations))
+            if offset + limit < len(integrations):
+                metadata['next_offset'] = offset + limit
+            return integrations[offset:offset + limit], metadata
+        if path.startswith(('/admin/v1/integrations/', '/admin/v3/integrations/')):
+            integration_key = path.rsplit('/', 1)[1]
+            for integration in self._resource(account_id, 'integrations'):
+                if integration.get('integration_key') == integration_key:
+                    return integration, {}
+            raise RuntimeError('No integration {} in {}'.format(integration_key, self.state.path))
+        if path == '/admin/v1/billing/edition':
+            return dict(edition=self._resource(account_id, 'edition')), {}
+        raise RuntimeError('Cannot {} {} with state_file set'.format(method, path))
+
+    def _make_request(self, method, uri, body, headers):
+        url = urlparse(uri)
+        params = dict(parse_qsl(url.query))
+        if body:
+            if not isinstance(body, str):
+                body = body.decode('utf-8')
+            params.update(json.loads(body) if body.startswith('{') else dict(parse_qsl(body)))
+        response, metadata = self._route(method, url.path, params)
+        data = json.dumps(dict(stat='OK', response=response, metadata=metadata))
+        return (OfflineResponse(), data.encode('utf-8'))
+
+
+class OfflineResponse(object):
+    """
+    Stands in for the HTTPResponse of an answered call
+    """
+
+    status = 200
+    reason = 'OK'
+
+    def getheader(self, name, default=None):
+        return default
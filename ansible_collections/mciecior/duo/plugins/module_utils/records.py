@@ -0,0 +1,76 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import csv
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:
+    HAS_YAML = False
+
+
+RECORD_FORMATS = ['auto', 'csv', 'yaml']
+
+
+def record_format(path, fmt='auto'):
+    '''
+    Returns csv or yaml, from fmt or else the extension of path
+    '''
+    if fmt and fmt != 'auto':
+        return fmt
+    return 'csv' if path.lower().endswith('.csv') else 'yaml'
+
+
+def _csv_records(f):
+    for row in csv.DictReader(f):
+        # An empty cell leaves the field unset rather than blanking it
+        yield dict((k.strip(), v) for k, v in row.items() if k and v not in (None, ''))
+
+
+def _yaml_records(f):
+    '''
+    Yields the items of a YAML (or JSON) list one at a time, composing a
+    single item at a time. A stream of YAML documents yields one record per
+    document.
+    '''
+    loader = yaml.SafeLoader(f)
+    try:
+        loader.get_event()
+        while not loader.check_event(yaml.StreamEndEvent):
+            loader.get_event()
+            if loader.check_event(yaml.SequenceStartEvent):
+                loader.get_event()
+                while not loader.check_event(yaml.SequenceEndEvent):
+                    yield loader.construct_document(loader.compose_node(None, None))
+                loader.get_event()
+            else:
+                yield loader.construct_document(loader.compose_node(None, None))
+            loader.get_event()
+            loader.anchors = {}
+    finally:
+        loader.dispose()
+
+
+def read_records(path, fmt='auto'):
+    """
+    Yields the records of a CSV file with a header row, or of a YAML list,
+    one at a time, so files of any size are read in constant memory.
+
+    Raises ValueError if the file cannot be parsed, which may happen after
+    some records were yielded.
+    """
+    fmt = record_format(path, fmt)
+    if fmt == 'yaml' and not HAS_YAML:
+        raise ValueError('PyYAML is required to read {}'.format(path))
+    with open(path, newline='' if fmt == 'csv' else None) as f:
+        try:
+            if fmt == 'csv':
+                for record in _csv_records(f):
+                    yield record
+            else:
+                for record in _yaml_records(f):
+                    if record is not None:
+                        yield record
+        except (csv.Error, yaml.YAMLError if HAS_YAML else csv.Error) as e:
+            raise ValueError('Could not parse {}: {}'.format(path, str(e)))
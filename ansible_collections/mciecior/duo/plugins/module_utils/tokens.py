@@ -0,0 +1,50 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+# Largest page the Admin API returns for the tokens endpoint
+TOKENS_PAGE_SIZE = 500
+
+# The hardware token types that can be created, and the fields each of them
+# requires. D-100 (d1) tokens are registered by Duo and cannot be imported.
+TOKEN_TYPES = {
+    'h6': ['secret'],
+    'h8': ['secret'],
+    't6': ['secret'],
+    't8': ['secret'],
+    'yk': ['private_id', 'aes_key'],
+}
+
+# The fields of a token that can be set when creating it
+TOKEN_FIELDS = [
+    'secret',
+    'counter',
+    'totp_step',
+    'private_id',
+    'aes_key',
+]
+
+
+def token_key(token_type, serial):
+    '''
+    Returns the key tokens are matched by, as a serial is unique per type
+    '''
+    return (token_type, str(serial).strip())
+
+
+async def token_index(api, account_id=None):
+    """
+    Returns the hardware tokens of an account keyed by token_key(type, serial),
+    each as (token_id, set of the user_ids it is assigned to), retrieved with
+    one pass over the paged tokens endpoint.
+    """
+    index = {}
+    async for token in api.pages('/admin/v1/tokens', account_id=account_id, page_size=TOKENS_PAGE_SIZE):
+        index[token_key(token['type'], token['serial'])] = (
+            token['token_id'],
+            set(user['user_id'] for user in token.get('users') or []),
+        )
+    return index
+
+
+async def assign_token(api, token_id, user_id, account_id=None):
+    return await api.json_api_call('POST', '/admin/v1/users/{}/tokens'.format(user_id), dict(token_id=token_id), account_id)
@@ -0,0 +1,53 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+# Largest page the Admin API returns for the users endpoint
+USERS_PAGE_SIZE = 300
+
+# The fields of a user that can be set when creating or modifying it
+USER_FIELDS = [
+    'realname',
+    'email',
+    'status',
+    'notes',
+    'firstname',
+    'lastname',
+    'alias1',
+    'alias2',
+    'alias3',
+    'alias4',
+]
+
+USER_STATUSES = ['active', 'bypass', 'disabled']
+
+
+def user_key(username):
+    '''
+    Returns the key users are matched by, as Duo compares usernames without
+    regard to case
+    '''
+    return username.strip().lower()
+
+
+async def user_index(api, account_id=None, fields=USER_FIELDS):
+    """
+    Returns the users of an account keyed by user_key(username), each as
+    (user_id, username, {field: value}) with only the listed fields kept,
+    retrieved with one pass over the paged users endpoint.
+    """
+    index = {}
+    async for user in api.pages('/admin/v1/users', account_id=account_id, page_size=USERS_PAGE_SIZE):
+        index[user_key(user['username'])] = (
+            user['user_id'],
+            user['username'],
+            dict((k, user.get(k)) for k in fields),
+        )
+    return index
+
+
+async def find_user(api, username, account_id=None):
+    '''
+    Returns the user with username, or None, with one call
+    '''
+    users = await api.json_api_call('GET', '/admin/v1/users', dict(username=username), account_id)
+    return users[0] if users else None
@@ -0,0 +1,35 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_WORKERS = 8
+
+
+def workers_argument_spec():
+    return dict(
+        workers=dict(type='int', required=False, default=DEFAULT_WORKERS),
+    )
+
+
+def run_parallel(func, items, workers=DEFAULT_WORKERS):
+    """
+    Call func(item) for every item on a bounded thread pool.
+
+    Returns a list of (item, result, error) tuples in the order of items.
+    An exception raised for one item is returned as its error and never
+    aborts the remaining items.
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    def call(item):
+        try:
+            return (item, func(item), None)
+        except Exception as e:
+            return (item, None, e)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers or DEFAULT_WORKERS, len(items)))) as pool:
+        return list(pool.map(call, items))
@@ -47,6 +47,11 @@ options:
         type: str
         required: true
 
+extends_documentation_fragment:
+    - mciecior.duo.duo.account_cache
+    - mciecior.duo.duo.rate_limit
+    - mciecior.duo.duo.state_file
+
 author:
     - Mark Ciecior (mciecior@carrieraccessit.com)
 '''
@@ -81,13 +86,49 @@ account_id:
 api_hostname:
     description: The Duo-assigned API hostname
     type: str
+
+duo_metrics:
+    description:
+        - Duo API calls made by the task, with the totals below for all calls and again per endpoint (C(endpoints)) and per child account (C(accounts))
+        - Times are in seconds. A call includes its rate limit waits and retries.
+    type: dict
+    returned: when the task called the Duo API
+    contains:
+        calls:
+            description: Number of calls
+            type: int
+        bytes_sent:
+            description: Bytes of request bodies sent
+            type: int
+        bytes_received:
+            description: Bytes of responses received
+            type: int
+        p50:
+            description: Median call latency
+            type: float
+        p95:
+            description: 95th percentile call latency
+            type: float
+        rate_limit_wait:
+            description: Time spent waiting on the rate limit and before retrying HTTP 429 responses
+            type: float
+        endpoints:
+            description: The same totals for every endpoint, such as C(GET /admin/v1/settings)
+            type: dict
+        accounts:
+            description: The same totals for every child account_id, or C(parent) for the parent account
+            type: dict
+    sample: {"calls": 2, "errors": 0, "bytes_sent": 0, "bytes_received": 1530, "time": 0.412, "p50": 0.198, "p95": 0.214, "max": 0.214,
+             "retries": 0, "rate_limited": 0, "rate_limit_wait": 0.0, "endpoints": {}, "accounts": {}}
 '''
 
-import duo_client
 from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.accounts import ChildAccountIndex, account_cache_argument_spec
+from ..module_utils.api import accounts_client, api_argument_spec
+from ..module_utils.offline import check_offline, offline_argument_spec
 
 
-def run_module():
+def run_module(module_class=AnsibleModule):
     # define available arguments/parameters a user can pass to the module
     module_args = dict(
         ikey=dict(type='str', required=True),
@@ -96,6 +137,9 @@ def run_module():
         name=dict(type='str', required=True),
         state=dict(type='str', required=True)
     )
+    module_args.update(account_cache_argument_spec())
+    module_args.update(api_argument_spec())
+    module_args.update(offline_argument_spec())
 
     # seed the result dict in the object
     # we primarily care about changed and state
@@ -111,32 +155,28 @@ def run_module():
     # this includes instantiation, a couple of common attr would be the
     # args/params passed to the execution, as well as if the module
     # supports check mode
-    module = AnsibleModule(
+    module = module_class(
         argument_spec=module_args,
         supports_check_mode=True
     )
+    check_offline(module, result)
 
     # manipulate or modify the state as needed (this is going to be the
     # part where your module will do what it needs to do)
-    ikey = module.params.get('ikey')
-    skey = module.params.get('skey')
-    host = module.params.get('host')
     name = module.params.get('name')
     state = module.params.get('state')
-    accounts_api = duo_client.Accounts(
-        ikey=ikey,
-        skey=skey,
-        host=host,
-        )
+    accounts_api = accounts_client(module)
+    account_index = ChildAccountIndex.from_module(module, accounts_api)
+    try:
+        account = account_index.get(name)
+    except Exception as e:
+        module.fail_json(msg='Could not retrieve child accounts: {}'.format(str(e)), **result)
+
     if state == 'present':
         result['changed'] = False
-        accountList = accounts_api.get_child_accounts()
-        for account in accountList:
-            if account['name'] == name:
-                result['changed'] = False
-                result['account_id'] = account['account_id']
-                result['api_hostname'] = account['api_hostname']
-                module.exit_json(**result)
+        if account is not None:
+            result['account_id'], result['api_hostname'] = account
+            module.exit_json(**result)
         if not module.check_mode:
             try:
                 resp = accounts_api.create_account(name)
@@ -144,22 +184,22 @@ def run_module():
                 result['api_hostname'] = resp['api_hostname']
             except Exception as e:
                 module.fail_json(msg=str(e), **result)
+            account_index.invalidate()
         result['changed'] = True
         module.exit_json(**result)
 
     if state == 'absent':
         result['changed'] = False
-        accountList = accounts_api.get_child_accounts()
-        for account in accountList:
-            if account['name'] == name:
-                result['account_id'] = account['account_id']
-                if not module.check_mode:
-                    try:
-                        accounts_api.delete_account(account['account_id'])
-                    except Exception as e:
-                        module.fail_json(msg=str(e), **result)
-                result['changed'] = True
-                module.exit_json(**result)
+        if account is not None:
+            result['account_id'] = account[0]
+            if not module.check_mode:
+                try:
+                    accounts_api.delete_account(account[0])
+                except Exception as e:
+                    module.fail_json(msg=str(e), **result)
+                account_index.invalidate()
+            result['changed'] = True
+            module.exit_json(**result)
 
     module.exit_json(**result)
 
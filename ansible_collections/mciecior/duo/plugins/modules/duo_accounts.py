@@ -0,0 +1,286 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+module: duo_accounts
+
+short_description: Create or remove many Duo accounts within an MSP portal.
+
+version_added: "2.9"
+
+description:
+    - "This is used by MSPs to reconcile a list of child accounts within their portals in a single task"
+    - "The list of child accounts is retrieved once and all creates/deletes are run concurrently"
+
+options:
+    ikey:
+        description:
+            - Integration Key for the Duo Accounts API applications
+        type: str
+        required: true
+    skey:
+        description:
+            - Secret Key for the Duo Accounts API applications
+        type: str
+        required: true
+    host:
+        description:
+            - API Host for the Duo Accounts API applications
+        type: str
+        required: true
+    accounts:
+        description:
+            - List of child accounts to reconcile
+            - Each entry is either the name of a child account, or a dict with a name and an optional state
+        type: list
+        elements: raw
+        required: true
+    state:
+        description:
+            - Whether the child accounts should exist or not, for entries that do not set their own state
+        type: str
+        required: false
+        default: present
+        choices: ['present', 'absent']
+
+extends_documentation_fragment:
+    - mciecior.duo.duo.account_cache
+    - mciecior.duo.duo.rate_limit
+    - mciecior.duo.duo.workers
+
+author:
+    - Mark Ciecior (mciecior@carrieraccessit.com)
+'''
+
+EXAMPLES = '''
+# Create several child accounts
+- name: Create child accounts
+  duo_accounts:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    accounts:
+      - Awesome Test Account
+      - Another Test Account
+
+# Create and remove child accounts in one task
+- name: Reconcile child accounts
+  duo_accounts:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    workers: 16
+    accounts:
+      - name: Awesome Test Account
+      - name: Old Test Account
+        state: absent
+
+'''
+
+RETURN = '''
+accounts:
+    description: Per-account results keyed by account name
+    type: dict
+    returned: always
+    contains:
+        account_id:
+            description: The Duo-assigned account_id variable
+            type: str
+        api_hostname:
+            description: The Duo-assigned API hostname
+            type: str
+        state:
+            description: The requested state of the account
+            type: str
+        changed:
+            description: Whether the account was (or in check mode would be) created or removed
+            type: bool
+        msg:
+            description: Error message if the account could not be created or removed
+            type: str
+
+created:
+    description: Names of the child accounts that were (or in check mode would be) created
+    type: list
+    returned: always
+
+deleted:
+    description: Names of the child accounts that were (or in check mode would be) removed
+    type: list
+    returned: always
+
+duo_metrics:
+    description:
+        - Duo API calls made by the task, with the totals below for all calls and again per endpoint (C(endpoints)) and per child account (C(accounts))
+        - Times are in seconds. A call includes its rate limit waits and retries.
+    type: dict
+    returned: when the task called the Duo API
+    contains:
+        calls:
+            description: Number of calls
+            type: int
+        bytes_sent:
+            description: Bytes of request bodies sent
+            type: int
+        bytes_received:
+            description: Bytes of responses received
+            type: int
+        p50:
+            description: Median call latency
+            type: float
+        p95:
+            description: 95th percentile call latency
+            type: float
+        rate_limit_wait:
+            description: Time spent waiting on the rate limit and before retrying HTTP 429 responses
+            type: float
+        endpoints:
+            description: The same totals for every endpoint, such as C(GET /admin/v1/settings)
+            type: dict
+        accounts:
+            description: The same totals for every child account_id, or C(parent) for the parent account
+            type: dict
+    sample: {"calls": 2, "errors": 0, "bytes_sent": 0, "bytes_received": 1530, "time": 0.412, "p50": 0.198, "p95": 0.214, "max": 0.214,
+             "retries": 0, "rate_limited": 0, "rate_limit_wait": 0.0, "endpoints": {}, "accounts": {}}
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.accounts import ChildAccountIndex, account_cache_argument_spec
+from ..module_utils.api import accounts_client, api_argument_spec
+from ..module_utils.workers import run_parallel, workers_argument_spec
+
+
+def desired_states(module, accounts, default_state):
+    '''
+    Returns a dict of account name -> desired state
+    '''
+    desired = {}
+    for entry in accounts:
+        if isinstance(entry, dict):
+            name = entry.get('name')
+            state = entry.get('state') or default_state
+        else:
+            name = entry
+            state = default_state
+        if not name:
+            module.fail_json(msg='Every entry in accounts needs a name: {}'.format(entry))
+        name = str(name)
+        if state not in ('present', 'absent'):
+            module.fail_json(msg="state must be one of ['present', 'absent'], not {} (account {})".format(state, name))
+        if desired.get(name, state) != state:
+            module.fail_json(msg='Conflicting states requested for child account {}'.format(name))
+        desired[name] = state
+    return desired
+
+
+def run_module(module_class=AnsibleModule):
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        ikey=dict(type='str', required=True),
+        skey=dict(type='str', required=True, no_log=True),
+        host=dict(type='str', required=True),
+        accounts=dict(type='list', elements='raw', required=True),
+        state=dict(type='str', required=False, default='present', choices=['present', 'absent'])
+    )
+    module_args.update(account_cache_argument_spec())
+    module_args.update(api_argument_spec())
+    module_args.update(workers_argument_spec())
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # change is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        accounts={},
+        created=[],
+        deleted=[]
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = module_class(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+
+    # manipulate or modify the state as needed (this is going to be the
+    # part where your module will do what it needs to do)
+    workers = module.params.get('workers')
+    desired = desired_states(module, module.params.get('accounts'), module.params.get('state'))
+    accounts_api = accounts_client(module)
+
+    '''
+    Retrieve the list of child accounts once and diff it against the desired states
+    '''
+    account_index = ChildAccountIndex.from_module(module, accounts_api)
+    try:
+        existing = account_index.refresh()
+    except Exception as e:
+        module.fail_json(msg='Could not retrieve child accounts: {}'.format(str(e)), **result)
+
+    wanted = set(k for k, v in desired.items() if v == 'present')
+    unwanted = set(k for k, v in desired.items() if v == 'absent')
+    to_create = sorted(wanted - set(existing))
+    to_delete = sorted(unwanted & set(existing))
+
+    for name, state in desired.items():
+        result['accounts'][name] = dict(state=state, changed=False)
+        if name in existing:
+            result['accounts'][name]['account_id'], result['accounts'][name]['api_hostname'] = existing[name]
+    for name in to_create + to_delete:
+        result['accounts'][name]['changed'] = True
+    result['created'] = to_create
+    result['deleted'] = to_delete
+    result['changed'] = bool(to_create or to_delete)
+
+    if module.check_mode or not result['changed']:
+        module.exit_json(**result)
+
+    '''
+    Apply the creates and deletes on the worker pool
+    '''
+    def apply(name):
+        if desired[name] == 'present':
+            return accounts_api.create_account(name)
+        return accounts_api.delete_account(existing[name][0])
+
+    failed = []
+    for name, resp, error in run_parallel(apply, to_create + to_delete, workers):
+        account = result['accounts'][name]
+        if error is not None:
+            account['changed'] = False
+            account['msg'] = str(error)
+            failed.append(name)
+        elif desired[name] == 'present':
+            account['account_id'] = resp['account_id']
+            account['api_hostname'] = resp['api_hostname']
+    account_index.invalidate()
+
+    result['created'] = [n for n in to_create if n not in failed]
+    result['deleted'] = [n for n in to_delete if n not in failed]
+    result['changed'] = bool(result['created'] or result['deleted'])
+    if failed:
+        module.fail_json(msg='Could not reconcile child accounts: {}'.format(', '.join(sorted(failed))), **result)
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,391 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+module: duo_admin_group
+
+short_description: Manage a group of a Duo account and its members.
+
+version_added: "2.9"
+
+description:
+    - "This is used to keep the members of a Duo group in sync with a directory group, such as an Active Directory group with thousands of members"
+    - "The current members are retrieved once and compared with the desired members as sets, and only the users to add and remove are changed, concurrently"
+    - "Only counts are returned, never the member lists"
+
+options:
+    ikey:
+        description:
+            - Integration Key for the Duo Admin API application
+        type: str
+        required: true
+    skey:
+        description:
+            - Secret Key for the Duo Admin API application
+        type: str
+        required: true
+    host:
+        description:
+            - API Host for the Duo Admin API application
+        type: str
+        required: true
+    name:
+        description:
+            - Name of the child account to manage. If omitted, the groups of the parent account are managed.
+        type: str
+        required: false
+    account_id:
+        description:
+            - Duo-provided ID of the child account to manage, for example from the mciecior.duo.duo_accounts inventory plugin
+            - Skips resolving the child account by name. Mutually exclusive with name.
+        type: str
+        required: false
+    group:
+        description:
+            - Name of the group. It is created if it does not exist.
+        type: str
+        required: true
+    desc:
+        description:
+            - Description of the group, set when it is created
+        type: str
+        required: false
+    members:
+        description:
+            - Usernames of the desired members of the group
+            - Mutually exclusive with src.
+        type: list
+        elements: str
+        required: false
+    src:
+        description:
+            - Path of a file holding the usernames of the desired members, as a CSV file with a username column or as a YAML (or JSON) list of usernames
+            - The file is read on the host running the module, which is the controller when delegated to localhost.
+            - Mutually exclusive with members.
+        type: path
+        required: false
+    format:
+        description:
+            - Format of src. C(auto) reads files ending in .csv as CSV and any other file as YAML.
+        type: str
+        required: false
+        default: auto
+        choices: ['auto', 'csv', 'yaml']
+    purge:
+        description:
+            - Remove every member of the group that is not in members or src
+            - Without it, members are only added.
+            - The task fails without changing anything if no member could be read from members or src.
+        type: bool
+        required: false
+        default: false
+
+extends_documentation_fragment:
+    - mciecior.duo.duo.account_cache
+    - mciecior.duo.duo.rate_limit
+    - mciecior.duo.duo.workers
+
+author:
+    - Mark Ciecior (mciecior@carrieraccessit.com)
+'''
+
+EXAMPLES = '''
+# Mirror an Active Directory group exported to CSV
+- name: Sync VPN users
+  duo_admin_group:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    name: Awesome Test Account
+    group: VPN Users
+    src: /srv/exports/vpn-users.csv
+    purge: true
+    workers: 32
+  delegate_to: localhost
+
+# Make sure two users are members, leaving the other members alone
+- name: Add admins
+  duo_admin_group:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    account_id: "{{ account_id }}"
+    group: Admins
+    members:
+      - jdoe
+      - jsmith
+'''
+
+RETURN = '''
+account_id:
+    description: The Duo-assigned account_id of the child account, or null for the parent account
+    type: str
+    returned: always
+
+group_id:
+    description: The Duo-assigned group_id of the group, or null if it would be created in check mode
+    type: str
+    returned: always
+
+created:
+    description: Whether the group was (or in check mode would be) created
+    type: bool
+    returned: always
+
+members:
+    description: Number of members of the group after the task
+    type: int
+    returned: always
+
+added:
+    description: Number of users that were (or in check mode would be) added to the group
+    type: int
+    returned: always
+
+removed:
+    description: Number of users that were (or in check mode would be) removed from the group
+    type: int
+    returned: always
+
+not_found:
+    description: Number of desired members with no user in the account. They are listed in a warning.
+    type: int
+    returned: always
+
+errors:
+    description: One entry for every user that could not be added or removed
+    type: list
+    returned: always
+    contains:
+        username:
+            description: The username
+            type: str
+        action:
+            description: C(add) or C(remove)
+            type: str
+        msg:
+            description: What went wrong
+            type: str
+
+duo_metrics:
+    description:
+        - Duo API calls made by the task, with the totals below for all calls and again per endpoint (C(endpoints)) and per child account (C(accounts))
+        - Times are in seconds. A call includes its rate limit waits and retries.
+    type: dict
+    returned: when the task called the Duo API
+    contains:
+        calls:
+            description: Number of calls
+            type: int
+        bytes_sent:
+            description: Bytes of request bodies sent
+            type: int
+        bytes_received:
+            description: Bytes of responses received
+            type: int
+        p50:
+            description: Median call latency
+            type: float
+        p95:
+            description: 95th percentile call latency
+            type: float
+        rate_limit_wait:
+            description: Time spent waiting on the rate limit and before retrying HTTP 429 responses
+            type: float
+        endpoints:
+            description: The same totals for every endpoint, such as C(GET /admin/v1/settings)
+            type: dict
+        accounts:
+            description: The same totals for every child account_id, or C(parent) for the parent account
+            type: dict
+    sample: {"calls": 2, "errors": 0, "bytes_sent": 0, "bytes_received": 1530, "time": 0.412, "p50": 0.198, "p95": 0.214, "max": 0.214,
+             "retries": 0, "rate_limited": 0, "rate_limit_wait": 0.0, "endpoints": {}, "accounts": {}}
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.accounts import account_cache_argument_spec, resolve_account
+from ..module_utils.api import api_argument_spec
+from ..module_utils.engine import async_client, for_each
+from ..module_utils.groups import add_member, find_group, group_members, remove_member
+from ..module_utils.records import RECORD_FORMATS, read_records
+from ..module_utils.users import USERS_PAGE_SIZE, find_user, user_index, user_key
+from ..module_utils.workers import workers_argument_spec
+
+
+# Up to this many users to add are looked up one call each; more than that
+# are resolved with one pass over every user of the account
+LOOKUP_LIMIT = USERS_PAGE_SIZE // 10
+
+# Number of missing usernames listed in the warning
+WARN_MISSING = 20
+
+
+def desired_members(module):
+    '''
+    Returns the desired members as a dict of user_key(username) -> username
+    '''
+    src = module.params.get('src')
+    desired = {}
+    for username in module.params.get('members') or []:
+        desired[user_key(username)] = username.strip()
+    if src:
+        for record in read_records(src, module.params.get('format')):
+            username = record.get('username') if isinstance(record, dict) else record
+            if username is not None and str(username).strip():
+                desired[user_key(str(username))] = str(username).strip()
+    return desired
+
+
+async def resolve_users(api, keys, desired, account_id):
+    '''
+    Returns a dict of user_key(username) -> user_id for the users of keys
+    that exist in the account
+    '''
+    if len(keys) <= LOOKUP_LIMIT:
+        user_ids = {}
+        for key, user, error in await for_each(api, lambda api, key: find_user(api, desired[key], account_id), sorted(keys)):
+            if error is not None:
+                raise error
+            if user is not None:
+                user_ids[key] = user['user_id']
+        return user_ids
+    index = await user_index(api, account_id, fields=[])
+    return dict((key, index[key][0]) for key in keys if key in index)
+
+
+def run_module(module_class=AnsibleModule):
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        ikey=dict(type='str', required=True),
+        skey=dict(type='str', required=True, no_log=True),
+        host=dict(type='str', required=True),
+        name=dict(type='str', required=False),
+        account_id=dict(type='str', required=False),
+        group=dict(type='str', required=True),
+        desc=dict(type='str', required=False),
+        members=dict(type='list', elements='str', required=False),
+        src=dict(type='path', required=False),
+        format=dict(type='str', required=False, default='auto', choices=RECORD_FORMATS),
+        purge=dict(type='bool', required=False, default=False)
+    )
+    module_args.update(account_cache_argument_spec())
+    module_args.update(api_argument_spec())
+    module_args.update(workers_argument_spec())
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # change is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        account_id=None,
+        group_id=None,
+        created=False,
+        members=0,
+        added=0,
+        removed=0,
+        not_found=0,
+        errors=[]
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = module_class(
+        argument_spec=module_args,
+        mutually_exclusive=[['name', 'account_id'], ['members', 'src']],
+        required_one_of=[['members', 'src']],
+        supports_check_mode=True
+    )
+
+    # manipulate or modify the state as needed (this is going to be the
+    # part where your module will do what it needs to do)
+    try:
+        desired = desired_members(module)
+    except (IOError, OSError, ValueError) as e:
+        module.fail_json(msg='Could not read the members: {}'.format(str(e)), **result)
+    if module.params.get('purge') and not desired:
+        module.fail_json(msg='No members were read, refusing to purge every member of group {}'.format(module.params.get('group')), **result)
+    account_id = resolve_account(module, result)
+    result['account_id'] = account_id
+    api = async_client(module)
+
+    async def sync():
+        '''
+        Find or create the group, retrieve its members once, and add and
+        remove the difference concurrently
+        '''
+        group = await find_group(api, module.params.get('group'), account_id)
+        if group is None:
+            result['created'] = True
+            if not module.check_mode:
+                params = dict(name=module.params.get('group'))
+                if module.params.get('desc') is not None:
+                    params['desc'] = module.params.get('desc')
+                group = await api.json_api_call('POST', '/admin/v1/groups', params, account_id)
+        if group is not None:
+            result['group_id'] = group['group_id']
+        current = await group_members(api, group['group_id'], account_id) if group is not None else {}
+
+        to_add = set(desired) - set(current)
+        to_remove = set(current) - set(desired) if module.params.get('purge') else set()
+        user_ids = await resolve_users(api, to_add, desired, account_id) if to_add else {}
+        missing = sorted(desired[k] for k in to_add if k not in user_ids)
+        result['not_found'] = len(missing)
+        if missing:
+            module.warn('{} members have no user in the account: {}{}'.format(
+                len(missing), ', '.join(missing[:WARN_MISSING]), ', ...' if len(missing) > WARN_MISSING else ''))
+
+        ops = [('add', k, user_ids[k]) for k in sorted(user_ids)] + [('remove', k, current[k][0]) for k in sorted(to_remove)]
+        if module.check_mode:
+            result['added'] = len(user_ids)
+            result['removed'] = len(to_remove)
+            result['members'] = len(current) + result['added'] - result['removed']
+            return
+
+        async def apply(api, op):
+            action, key, user_id = op
+            if action == 'add':
+                return await add_member(api, group['group_id'], user_id, account_id)
+            return await remove_member(api, group['group_id'], user_id, account_id)
+
+        def applied(op, resp, error):
+            action, key, user_id = op
+            if error is not None:
+                username = desired[key] if action == 'add' else current[key][1]
+                result['errors'].append(dict(username=username, action=action, msg=str(error)))
+            else:
+                result['added' if action == 'add' else 'removed'] += 1
+
+        await for_each(api, apply, ops, on_result=applied)
+        result['members'] = len(current) + result['added'] - result['removed']
+
+    try:
+        api.run(sync())
+    except Exception as e:
+        module.fail_json(msg='Could not synchronize group {}: {}'.format(module.params.get('group'), str(e)), **result)
+
+    result['changed'] = bool(result['created'] or result['added'] or result['removed'])
+    if result['errors']:
+        result['errors'].sort(key=lambda e: (e['action'], e['username']))
+        module.fail_json(msg='Could not add or remove {} members'.format(len(result['errors'])), **result)
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -11,32 +11,111 @@ ANSIBLE_METADATA = {
 
 DOCUMENTATION = '''
 ---
-module: duo_admin_settings
+module: duo_admin_integrations
 
-short_description: Create a Duo account within an MSP portal.
+short_description: Create or update integrations of a Duo account.
 
 version_added: "2.9"
 
 description:
-    - This is used to add/change the settings of Duo accounts
+    - This is used to add/change the integrations of Duo accounts
 
 options:
+    ikey:
+        description:
+            - Integration Key for the Duo Admin API application
+        type: str
+        required: true
+    skey:
+        description:
+            - Secret Key for the Duo Admin API application
+        type: str
+        required: true
+    host:
+        description:
+            - API Host for the Duo Admin API application
+        type: str
+        required: true
+    name:
+        description:
+            - Name of the child account to manage. If omitted, the integrations of the parent account are managed.
+        type: str
+        required: false
+    account_id:
+        description:
+            - Duo-provided ID of the child account to manage, for example from the mciecior.duo.duo_accounts inventory plugin
+            - Skips resolving the child account by name. Mutually exclusive with name.
+        type: str
+        required: false
+    state:
+        description:
+            - Whether to create/update (present) or retrieve (query) integrations
+        type: str
+        required: true
     app_name:
         description:
             - The name of the integration to create
         type: str
-        required: true
-    type:
+        required: false
+    app_ikey:
+        description:
+            - Integration key of an existing integration to retrieve or update
+        type: str
+        required: false
+    app_type:
         description:
             - The type of the integration to create. Refer to Retrieve Integrations for a list of valid values. Note that integrations of type "azure-ca" may not be created via the API.
+            - The type of an existing integration cannot be changed.
         type: str
-        required: true
+        required: false
     self_service_allowed:
         description:
-            - Set to 1 to grant an integration permission to allow users to manage their own devices. This is only supported by integrations which allow for self service configuration.
+            - Set to true to grant an integration permission to allow users to manage their own devices. This is only supported by integrations which allow for self service configuration.
         type: bool
         required: false
-        default: false
+    limit:
+        description:
+            - With state=query and no app_ikey, return at most this many integrations that match filter_type and filter_name, starting at offset
+            - The offset of the next page is returned as next_offset. It is an offset into every integration of the account, so it can be passed as offset to continue with the same filters.
+        type: int
+        required: false
+    offset:
+        description:
+            - With state=query and no app_ikey, the offset of the first integration to return
+        type: int
+        required: false
+        default: 0
+    filter_type:
+        description:
+            - With state=query and no app_ikey, only return integrations of these types
+        type: list
+        elements: str
+        required: false
+    filter_name:
+        description:
+            - With state=query and no app_ikey, only return integrations whose name matches this shell-style pattern
+        type: str
+        required: false
+    fields:
+        description:
+            - With state=query and no app_ikey, only return these fields of each integration, for example name, integration_key and type
+            - Leave out secret_key unless the secret keys are needed
+        type: list
+        elements: str
+        required: false
+    dest:
+        description:
+            - With state=query and no app_ikey, stream the integrations to this JSON-lines file instead of returning them in integrationList
+            - The file is written on the host running the module, which is the controller when delegated to localhost. It is created with mode 0600.
+        type: path
+        required: false
+
+extends_documentation_fragment:
+    - mciecior.duo.duo.account_cache
+    - mciecior.duo.duo.fingerprint
+    - mciecior.duo.duo.integration_cache
+    - mciecior.duo.duo.rate_limit
+    - mciecior.duo.duo.state_file
 
 author:
     - Mark Ciecior (mciecior@carrieraccessit.com)
@@ -65,19 +144,55 @@ EXAMPLES = '''
     app_name: New App Name
 
 # Retrieve the integrations of a child account
+- name: Retrieve integrations
   duo_admin_integrations:
     ikey: ABCDEFGH
     skey: ABCDEFGH12345678
     host: api-123XYZ.duosecurity.com
     name: Awesome Test Account
     state: query
+
+# Retrieve the names and keys of the first 50 RDP integrations
+- name: Retrieve RDP integrations
+  duo_admin_integrations:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    name: Awesome Test Account
+    state: query
+    filter_type: rdp
+    fields: [name, integration_key]
+    limit: 50
+
+# Stream every integration to a file on the controller
+- name: Export integrations
+  duo_admin_integrations:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    name: Awesome Test Account
+    state: query
+    dest: /tmp/integrations.jsonl
+  delegate_to: localhost
 '''
 
 RETURN = '''
+settings:
+    description: dict of integration settings with state=query and app_ikey, or of the settings that were (or in check mode would be) changed with state=present and app_ikey
+    type: dict
+
 integrationList:
     description: list of integrations
     type: list
 
+count:
+    description: number of integrations returned or written to dest, with state=query and no app_ikey
+    type: int
+
+next_offset:
+    description: offset of the first integration of the account that was not examined, to pass as offset for the next page, or null if there are none, with state=query and no app_ikey
+    type: int
+
 ikey:
     description: integration key of the integration
     type: str
@@ -85,25 +200,145 @@ ikey:
 skey:
     description: secret key of the integration
     type: str
+
+cached:
+    description: Whether the integration was trusted to match from fingerprint_max_age and was not retrieved, with state=present and app_ikey
+    type: bool
+
+duo_metrics:
+    description:
+        - Duo API calls made by the task, with the totals below for all calls and again per endpoint (C(endpoints)) and per child account (C(accounts))
+        - Times are in seconds. A call includes its rate limit waits and retries.
+    type: dict
+    returned: when the task called the Duo API
+    contains:
+        calls:
+            description: Number of calls
+            type: int
+        bytes_sent:
+            description: Bytes of request bodies sent
+            type: int
+        bytes_received:
+            description: Bytes of responses received
+            type: int
+        p50:
+            description: Median call latency
+            type: float
+        p95:
+            description: 95th percentile call latency
+            type: float
+        rate_limit_wait:
+            description: Time spent waiting on the rate limit and before retrying HTTP 429 responses
+            type: float
+        endpoints:
+            description: The same totals for every endpoint, such as C(GET /admin/v1/settings)
+            type: dict
+        accounts:
+            description: The same totals for every child account_id, or C(parent) for the parent account
+            type: dict
+    sample: {"calls": 2, "errors": 0, "bytes_sent": 0, "bytes_received": 1530, "time": 0.412, "p50": 0.198, "p95": 0.214, "max": 0.214,
+             "retries": 0, "rate_limited": 0, "rate_limit_wait": 0.0, "endpoints": {}, "accounts": {}}
 '''
 
-import duo_client
+import fnmatch
+import json
+import os
+import tempfile
+
 from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.accounts import ChildAccountIndex, account_cache_argument_spec
+from ..module_utils.api import Pages, accounts_client, admin_client, api_argument_spec
+from ..module_utils.diff import changed_values, diff_result, settings_diff
+from ..module_utils.fingerprint import FingerprintStore, fingerprint_argument_spec
+from ..module_utils.integrations import INTEGRATIONS_PAGE_SIZE, IntegrationIndex, integration_cache_argument_spec
+from ..module_utils.offline import check_offline, offline_argument_spec
+
+
+def query_integrations(module, admin_api, result):
+    '''
+    Page through the integrations, filtering and projecting each page as it
+    arrives, and either return them or stream them to dest
+    '''
+    filter_type = module.params.get('filter_type')
+    filter_name = module.params.get('filter_name')
+    fields = module.params.get('fields')
+    dest = module.params.get('dest')
+    limit = module.params.get('limit')
+    pages = Pages(
+        admin_api,
+        '/admin/v1/integrations',
+        offset=module.params.get('offset'),
+        # Without filters every record counts, so the API can stop at limit
+        limit=None if filter_type or filter_name else limit,
+        page_size=INTEGRATIONS_PAGE_SIZE,
+    )
+
+    def integrations():
+        count = 0
+        if limit is not None and limit <= 0:
+            result['next_offset'] = pages.next_offset
+            return
+        for i in pages:
+            if filter_type and i.get('type') not in filter_type:
+                continue
+            if filter_name and not fnmatch.fnmatchcase(i.get('name', ''), filter_name):
+                continue
+            if fields:
+                i = dict((k, i[k]) for k in fields if k in i)
+            yield i
+            count += 1
+            if limit is not None and count >= limit:
+                result['next_offset'] = pages.resume_offset
+                return
+        result['next_offset'] = pages.next_offset
+
+    try:
+        if dest:
+            result['count'] = 0
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(dest)), prefix='.duo_integrations-')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    for i in integrations():
+                        f.write(json.dumps(i) + '\n')
+                        result['count'] += 1
+                os.replace(tmp, dest)
+            except BaseException:
+                os.remove(tmp)
+                raise
+            result['dest'] = dest
+        else:
+            result['integrationList'] = list(integrations())
+            result['count'] = len(result['integrationList'])
+    except Exception as e:
+        module.fail_json(msg='Cound not retrieve list of integrations: {}'.format(str(e)), **result)
+    module.exit_json(**result)
 
 
-def run_module():
+def run_module(module_class=AnsibleModule):
     # define available arguments/parameters a user can pass to the module
     module_args = dict(
         ikey=dict(type='str', required=True),
         skey=dict(type='str', required=True, no_log=True),
         host=dict(type='str', required=True),
         name=dict(type='str', required=False),
+        account_id=dict(type='str', required=False),
         state=dict(type='str', required=True),
         app_name=dict(type='str', required=False),
         app_ikey=dict(type='str', required=False),
         app_type=dict(type='str', required=False),
-        self_service_allowed=dict(type=bool, required=False)
+        self_service_allowed=dict(type='bool', required=False),
+        limit=dict(type='int', required=False),
+        offset=dict(type='int', required=False, default=0),
+        filter_type=dict(type='list', elements='str', required=False),
+        filter_name=dict(type='str', required=False),
+        fields=dict(type='list', elements='str', required=False),
+        dest=dict(type='path', required=False)
     )
+    module_args.update(account_cache_argument_spec())
+    module_args.update(fingerprint_argument_spec())
+    module_args.update(integration_cache_argument_spec())
+    module_args.update(api_argument_spec())
+    module_args.update(offline_argument_spec())
 
     # seed the result dict in the object
     # we primarily care about changed and state
@@ -119,17 +354,17 @@ def run_module():
     # this includes instantiation, a couple of common attr would be the
     # args/params passed to the execution, as well as if the module
     # supports check mode
-    module = AnsibleModule(
+    module = module_class(
         argument_spec=module_args,
+        mutually_exclusive=[['name', 'account_id']],
         supports_check_mode=True
     )
+    check_offline(module, result)
 
     # manipulate or modify the state as needed (this is going to be the
     # part where your module will do what it needs to do)
-    ikey = module.params.get('ikey')
-    skey = module.params.get('skey')
-    host = module.params.get('host')
     name = module.params.get('name')
+    account_id = module.params.get('account_id')
     state = module.params.get('state')
     app_name = module.params.get('app_name')
     app_ikey = module.params.get('app_ikey')
@@ -141,34 +376,38 @@ def run_module():
     if app_type is not None:
         newSettings['integration_type'] = app_type
     if self_service_allowed is not None:
-        newSettings['self_service_allowed'] = '1' if self_service_allowed else '0'
-    admin_api = duo_client.Admin(
-        ikey=ikey,
-        skey=skey,
-        host=host,
-        )
+        newSettings['self_service_allowed'] = self_service_allowed
+    admin_api = admin_client(module)
 
     '''
     If name is specified, update the API object to reference the child account ID
     '''
-    if name:
-        accounts_api = duo_client.Accounts(
-          ikey=ikey,
-          skey=skey,
-          host=host,
-          )
-        accountList = accounts_api.get_child_accounts()
-        for account in accountList:
-            if account['name'] == name:
-                admin_api.account_id = account['account_id']
-                break
-        if not admin_api.account_id:
+    if account_id:
+        admin_api.account_id = account_id
+    elif name:
+        accounts_api = accounts_client(module)
+        try:
+            account = ChildAccountIndex.from_module(module, accounts_api).get(name)
+        except Exception as e:
+            module.fail_json(msg='Could not retrieve child accounts: {}'.format(str(e)), **result)
+        if account is None:
             module.fail_json(msg='Could not find child account {}'.format(name), **result)
+        admin_api.account_id = account[0]
 
     '''
     If app_ikey is specified, find the settings for the specific integration
     '''
     if app_ikey:
+        '''
+        Skip retrieving the integration if it was recently found to match
+        '''
+        fingerprints = FingerprintStore.from_module(module, 'integrations')
+        target = '{}/{}'.format(admin_api.account_id or '', app_ikey)
+        desired = dict(newSettings)
+        if state == 'present' and fingerprints.converged(target, desired):
+            result['cached'] = True
+            module.exit_json(**result)
+
         currentSettings = {}
         try:
             currentSettings = admin_api.get_integration(app_ikey)
@@ -184,41 +423,46 @@ def run_module():
                 module.fail_json(msg=str(e), **result)
 
         if state == 'present':
-            result['changed'] = False
-            for k, v in newSettings.items():
-                if newSettings[k] and (newSettings[k] != currentSettings[k]):
-                    result['changed'] = True
-                    break
+            if app_type is not None and app_type != currentSettings.get('type'):
+                module.fail_json(msg='The type of integration {} cannot be changed from {}'.format(app_ikey, currentSettings.get('type')), **result)
+            newSettings.pop('integration_type', None)
+            diff = settings_diff(newSettings, currentSettings)
+            result['changed'] = bool(diff)
+            if module._diff:
+                result['diff'] = diff_result(diff)
             if result['changed'] is False:
+                fingerprints.record(target, desired)
+                fingerprints.flush()
                 module.exit_json(**result)
             else:
-                for k, v in newSettings.items():
-                    if newSettings[k]:
-                        result['settings'][k] = v
+                for k, v in changed_values(diff).items():
+                    result['settings'][k] = v
                 if not module.check_mode:
                     try:
-                        admin_api.update_integration(app_ikey, **newSettings)
+                        updatedIntegration = admin_api.update_integration(app_ikey, **changed_values(diff))
                     except Exception as e:
                         result['changed'] = False
                         module.fail_json(msg=str(e), **result)
+                    IntegrationIndex.from_module(module, admin_api).put(updatedIntegration)
+                    fingerprints.record(target, desired)
+                    fingerprints.flush()
 
         module.exit_json(**result)
 
     elif not app_ikey:
-        try:
-            integrationList = admin_api.get_integrations()
-        except Exception as e:
-            module.fail_json(msg='Cound not retrieve list of integrations: {}'.format(str(e)), **result)
         if state == 'query':
-            result['integrationList'] = integrationList
-            module.exit_json(**result)
-        elif state == 'present':
-            for i in integrationList:
-                if i['name'] == app_name:
-                    result['changed'] = False
-                    result['ikey'] = i['ikey']
-                    result['skey'] = i['skey']
-                    module.exit_json(**result)
+            query_integrations(module, admin_api, result)
+        index = IntegrationIndex.from_module(module, admin_api)
+        if state == 'present':
+            try:
+                existing = index.get(app_name, app_type)
+            except Exception as e:
+                module.fail_json(msg='Cound not retrieve list of integrations: {}'.format(str(e)), **result)
+            if existing is not None:
+                result['changed'] = False
+                result['ikey'] = existing['integration_key']
+                result['skey'] = existing['secret_key']
+                module.exit_json(**result)
             result['changed'] = True
             if module.check_mode:
                 module.exit_json(**result)
@@ -230,6 +474,7 @@ def run_module():
                 except Exception as e:
                     result['changed'] = False
                     module.fail_json(msg='Could not create integration: {}'.format(str(e)), **result)
+            index.put(newIntegration)
             result['ikey'] = newIntegration['integration_key']
             result['skey'] = newIntegration['secret_key']
             module.exit_json(**result)
@@ -36,6 +36,30 @@ options:
             - API Host for the Duo Admin API application
         type: str
         required: true
+    name:
+        description:
+            - Name of the child account to manage. If omitted, the settings of the parent account are managed.
+        type: str
+        required: false
+    account_id:
+        description:
+            - Duo-provided ID of the child account to manage, for example from the mciecior.duo.duo_accounts inventory plugin
+            - Skips resolving the child account by name. Mutually exclusive with name.
+        type: str
+        required: false
+    accounts:
+        description:
+            - List of child account names to manage concurrently, or C(all) for every child account.
+            - Each account is retrieved, compared and updated independently, and one failing account does not stop the others.
+            - Mutually exclusive with name and account_id.
+        type: list
+        elements: str
+        required: false
+    state:
+        description:
+            - Whether to update (present) or retrieve (query) the account settings
+        type: str
+        required: true
     lockout_threshold:
         description:
             - The number of consecutive failed authentication attempts before the user's status is set to "Locked Out" and the user is denied access.
@@ -191,6 +215,13 @@ options:
         required: false
         default: false
 
+extends_documentation_fragment:
+    - mciecior.duo.duo.account_cache
+    - mciecior.duo.duo.fingerprint
+    - mciecior.duo.duo.rate_limit
+    - mciecior.duo.duo.state_file
+    - mciecior.duo.duo.workers
+
 author:
     - Mark Ciecior (mciecior@carrieraccessit.com)
 '''
@@ -224,26 +255,195 @@ EXAMPLES = '''
     host: api-123XYZ.duosecurity.com
     name: Awesome Test Account
     state: query
+
+# Roll out a lockout policy to every child account
+- name: Update lockout threshold
+  duo_admin_settings:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    accounts: all
+    workers: 16
+    state: present
+    lockout_threshold: 5
+
+# Preview the rollout against last night's snapshot, without API calls
+- name: Plan lockout threshold
+  duo_admin_settings:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    accounts: all
+    state: present
+    lockout_threshold: 5
+    state_file: /backup/duo-accounts.jsonl.gz
+  check_mode: true
+  diff: true
 '''
 
 RETURN = '''
 settings:
-    description: dict of account settings
+    description:
+        - dict of account settings with state=query, or of the settings that were (or in check mode would be) changed with state=present
+        - When accounts is set, the settings that were (or would be) changed in any of the accounts, and empty with state=query
     type: dict
     returned: always
+
+accounts:
+    description: Per-account results keyed by child account name, when accounts is set
+    type: dict
+    returned: when accounts is set
+    contains:
+        account_id:
+            description: The Duo-assigned account_id of the child account
+            type: str
+        changed:
+            description: Whether the settings of this account were (or in check mode would be) updated
+            type: bool
+        failed:
+            description: Whether the settings of this account could not be retrieved or updated
+            type: bool
+        msg:
+            description: Error message if failed
+            type: str
+        settings:
+            description: dict of account settings with state=query, or of the settings that were (or in check mode would be) changed with state=present
+            type: dict
+        cached:
+            description: Whether the settings of this account were trusted to match from fingerprint_max_age and were not retrieved
+            type: bool
+
+cached:
+    description: Whether the settings were trusted to match from fingerprint_max_age and were not retrieved
+    type: bool
+    returned: when the settings were not retrieved
+
+failed_accounts:
+    description: Names of the child accounts that could not be retrieved or updated
+    type: list
+    returned: when accounts is set
+
+duo_metrics:
+    description:
+        - Duo API calls made by the task, with the totals below for all calls and again per endpoint (C(endpoints)) and per child account (C(accounts))
+        - Times are in seconds. A call includes its rate limit waits and retries.
+    type: dict
+    returned: when the task called the Duo API
+    contains:
+        calls:
+            description: Number of calls
+            type: int
+        bytes_sent:
+            description: Bytes of request bodies sent
+            type: int
+        bytes_received:
+            description: Bytes of responses received
+            type: int
+        p50:
+            description: Median call latency
+            type: float
+        p95:
+            description: 95th percentile call latency
+            type: float
+        rate_limit_wait:
+            description: Time spent waiting on the rate limit and before retrying HTTP 429 responses
+            type: float
+        endpoints:
+            description: The same totals for every endpoint, such as C(GET /admin/v1/settings)
+            type: dict
+        accounts:
+            description: The same totals for every child account_id, or C(parent) for the parent account
+            type: dict
+    sample: {"calls": 2, "errors": 0, "bytes_sent": 0, "bytes_received": 1530, "time": 0.412, "p50": 0.198, "p95": 0.214, "max": 0.214,
+             "retries": 0, "rate_limited": 0, "rate_limit_wait": 0.0, "endpoints": {}, "accounts": {}}
 '''
 
-import duo_client
 from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.accounts import ChildAccountIndex, account_cache_argument_spec
+from ..module_utils.api import accounts_client, admin_client, api_argument_spec
+from ..module_utils.diff import changed_values, diff_result, settings_diff
+from ..module_utils.fingerprint import FingerprintStore, fingerprint_argument_spec
+from ..module_utils.offline import check_offline, offline_argument_spec
+from ..module_utils.workers import run_parallel, workers_argument_spec
 
 
-def run_module():
+def rollout_settings(module, newSettings, result):
+    '''
+    Query or update the settings of many child accounts on the worker pool
+    '''
+    state = module.params.get('state')
+    names = module.params.get('accounts')
+    accounts_api = accounts_client(module)
+    try:
+        index = ChildAccountIndex.from_module(module, accounts_api).index
+    except Exception as e:
+        module.fail_json(msg='Could not retrieve child accounts: {}'.format(str(e)), **result)
+    if names == ['all']:
+        names = sorted(index)
+
+    result['accounts'] = {}
+    result['failed_accounts'] = []
+    targets = []
+    for name in names:
+        if name in index:
+            result['accounts'][name] = dict(account_id=index[name][0], changed=False, failed=False)
+            targets.append(name)
+        else:
+            result['accounts'][name] = dict(changed=False, failed=True, msg='Could not find child account {}'.format(name))
+
+    fingerprints = FingerprintStore.from_module(module, 'settings')
+    desired = dict((k, v) for k, v in newSettings.items() if v is not None)
+
+    def apply(name):
+        account_id = index[name][0]
+        if state == 'present' and fingerprints.converged(account_id, desired):
+            return dict(changed=False, cached=True)
+        admin_api = admin_client(module, account_id)
+        currentSettings = admin_api.get_settings()
+        if state == 'query':
+            return dict(settings=currentSettings)
+        diff = settings_diff(newSettings, currentSettings)
+        if not diff:
+            fingerprints.record(account_id, desired)
+            return dict(changed=False)
+        if not module.check_mode:
+            admin_api.update_settings(**changed_values(diff))
+            fingerprints.record(account_id, desired)
+        return dict(changed=True, settings=changed_values(diff), diff=diff)
+
+    try:
+        outcomes = run_parallel(apply, targets, module.params.get('workers'))
+    finally:
+        fingerprints.flush()
+    for name, resp, error in outcomes:
+        if error is not None:
+            result['accounts'][name].update(failed=True, msg=str(error))
+            continue
+        diff = resp.pop('diff', None)
+        result['accounts'][name].update(resp)
+        if diff:
+            # the settings that changed in any account, as in single account mode
+            result['settings'].update(changed_values(diff))
+            if module._diff:
+                result.setdefault('diff', []).append(diff_result(diff, name))
+
+    result['failed_accounts'] = sorted(k for k, v in result['accounts'].items() if v['failed'])
+    result['changed'] = any(v['changed'] for v in result['accounts'].values())
+    if result['failed_accounts']:
+        module.fail_json(msg='Could not {} the settings of {} of {} child accounts'.format(
+            'query' if state == 'query' else 'update', len(result['failed_accounts']), len(names)), **result)
+    module.exit_json(**result)
+
+
+def run_module(module_class=AnsibleModule):
     # define available arguments/parameters a user can pass to the module
     module_args = dict(
         ikey=dict(type='str', required=True),
         skey=dict(type='str', required=True, no_log=True),
         host=dict(type='str', required=True),
         name=dict(type='str', required=False),
+        account_id=dict(type='str', required=False),
+        accounts=dict(type='list', elements='str', required=False),
         state=dict(type='str', required=True),
         lockout_threshold=dict(type='int', required=False),
         lockout_expire_duration=dict(type='int', required=False),
@@ -271,6 +471,11 @@ def run_module():
         password_requires_numeric=dict(type='bool', required=False, no_log=False),
         password_requires_special=dict(type='bool', required=False, no_log=False)
     )
+    module_args.update(account_cache_argument_spec())
+    module_args.update(fingerprint_argument_spec())
+    module_args.update(api_argument_spec())
+    module_args.update(offline_argument_spec())
+    module_args.update(workers_argument_spec())
 
     # seed the result dict in the object
     # we primarily care about changed and state
@@ -286,17 +491,17 @@ def run_module():
     # this includes instantiation, a couple of common attr would be the
     # args/params passed to the execution, as well as if the module
     # supports check mode
-    module = AnsibleModule(
+    module = module_class(
         argument_spec=module_args,
+        mutually_exclusive=[['name', 'account_id', 'accounts']],
         supports_check_mode=True
     )
+    check_offline(module, result)
 
     # manipulate or modify the state as needed (this is going to be the
     # part where your module will do what it needs to do)
-    ikey = module.params.get('ikey')
-    skey = module.params.get('skey')
-    host = module.params.get('host')
     name = module.params.get('name')
+    account_id = module.params.get('account_id')
     state = module.params.get('state')
     lockout_threshold = module.params.get('lockout_threshold')
     lockout_expire_duration = module.params.get('lockout_expire_duration')
@@ -350,25 +555,32 @@ def run_module():
         password_requires_numeric=password_requires_numeric,
         password_requires_special=password_requires_special,
         )
-    admin_api = duo_client.Admin(
-        ikey=ikey,
-        skey=skey,
-        host=host,
-        )
+    if module.params.get('accounts'):
+        rollout_settings(module, newSettings, result)
+
+    admin_api = admin_client(module)
 
-    if name:
-        accounts_api = duo_client.Accounts(
-          ikey=ikey,
-          skey=skey,
-          host=host,
-          )
-        accountList = accounts_api.get_child_accounts()
-        for account in accountList:
-            if account['name'] == name:
-                admin_api.account_id = account['account_id']
-                break
-        if not admin_api.account_id:
+    if account_id:
+        admin_api.account_id = account_id
+    elif name:
+        accounts_api = accounts_client(module)
+        try:
+            account = ChildAccountIndex.from_module(module, accounts_api).get(name)
+        except Exception as e:
+            module.fail_json(msg='Could not retrieve child accounts: {}'.format(str(e)), **result)
+        if account is None:
             module.fail_json(msg='Could not find child account {}'.format(name), **result)
+        admin_api.account_id = account[0]
+
+    '''
+    Skip retrieving the settings if they were recently found to match
+    '''
+    fingerprints = FingerprintStore.from_module(module, 'settings')
+    target = admin_api.account_id or ''
+    desired = dict((k, v) for k, v in newSettings.items() if v is not None)
+    if state == 'present' and fingerprints.converged(target, desired):
+        result['cached'] = True
+        module.exit_json(**result)
 
     currentSettings = {}
     try:
@@ -385,22 +597,25 @@ def run_module():
             module.fail_json(msg=str(e), **result)
 
     if state == 'present':
-        result['changed'] = False
-        for k, v in newSettings.items():
-            if newSettings[k] and (newSettings[k] != currentSettings[k]):
-                result['changed'] = True
-                break
+        diff = settings_diff(newSettings, currentSettings)
+        result['changed'] = bool(diff)
+        if module._diff:
+            result['diff'] = diff_result(diff)
         if result['changed'] is False:
+            fingerprints.record(target, desired)
+            fingerprints.flush()
             module.exit_json(**result)
         else:
-            for k, v in newSettings.items():
+            for k, v in changed_values(diff).items():
                 result['settings'][k] = v
             if not module.check_mode:
                 try:
-                    admin_api.update_settings(**newSettings)
+                    admin_api.update_settings(**changed_values(diff))
                 except Exception as e:
                     result['changed'] = False
                     module.fail_json(msg=str(e), **result)
+                fingerprints.record(target, desired)
+                fingerprints.flush()
 
     module.exit_json(**result)
 
@@ -0,0 +1,363 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+module: duo_authlog
+
+short_description: Export the authentication log of Duo accounts to a JSON-lines file.
+
+version_added: "2.9"
+
+description:
+    - "This is used to forward the Duo authentication logs of an MSP's child accounts to a SIEM, by running it on a schedule"
+    - "The v2 authentication log of every account is paged with its next_offset cursor and every page is appended to dest as it arrives, one event per line, so any number of events is exported in constant memory"
+    - "How far each account was exported is kept in a checkpoint file, so every run only fetches the events since the previous one, and a run that is interrupted resumes where it stopped"
+    - "Events take a couple of minutes to appear in the log, so a run exports the events up to two minutes before it started"
+
+options:
+    ikey:
+        description:
+            - Integration Key for the Duo Admin API application
+        type: str
+        required: true
+    skey:
+        description:
+            - Secret Key for the Duo Admin API application
+        type: str
+        required: true
+    host:
+        description:
+            - API Host for the Duo Admin API application
+        type: str
+        required: true
+    name:
+        description:
+            - Name of the child account to export. If omitted, the log of the parent account is exported.
+        type: str
+        required: false
+    account_id:
+        description:
+            - Duo-provided ID of the child account to export, for example from the mciecior.duo.duo_accounts inventory plugin
+            - Skips resolving the child account by name. Mutually exclusive with name.
+        type: str
+        required: false
+    accounts:
+        description:
+            - List of child account names to export concurrently, or C(all) for every child account.
+            - Each account is exported and checkpointed independently, and one failing account does not stop the others.
+            - Mutually exclusive with name and account_id.
+        type: list
+        elements: str
+        required: false
+    dest:
+        description:
+            - Path of the JSON-lines file the events are appended to, with the account_id of their child account, or null for the parent account, added to every event
+            - The file is written on the host running the module, which is the controller when delegated to localhost.
+        type: path
+        required: true
+    checkpoint_file:
+        description:
+            - Path of the file keeping how far the log of every account was exported to dest
+            - Defaults to a file per ikey, host and dest in account_cache_dir. Remove it to export every account from mintime again.
+        type: path
+        required: false
+    mintime:
+        description:
+            - Time, in milliseconds since the epoch, to export the log of an account from when it has no checkpoint yet
+            - Defaults to one day before the run.
+        type: int
+        required: false
+    log_rate_limit:
+        description:
+            - Maximum number of requests per minute to the authentication log of each account, shared by every task and fork exporting that account on this machine
+            - Duo limits the log endpoints far more strictly than the rest of the Admin API. Accounts are exported concurrently, each within its own limit, and within rate_limit.
+            - 0 disables the limit.
+        type: float
+        required: false
+        default: 1
+
+extends_documentation_fragment:
+    - mciecior.duo.duo.account_cache
+    - mciecior.duo.duo.rate_limit
+    - mciecior.duo.duo.workers
+
+author:
+    - Mark Ciecior (mciecior@carrieraccessit.com)
+'''
+
+EXAMPLES = '''
+# Forward the authentication logs of every child account, run from cron
+- name: Export authentication logs
+  duo_authlog:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    accounts: all
+    dest: /var/log/duo/authlog.jsonl
+    workers: 32
+  delegate_to: localhost
+
+# Export the log of one customer, starting from the first of the month
+- name: Export customer authentication log
+  duo_authlog:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    name: Awesome Test Account
+    dest: "/srv/siem/{{ inventory_hostname }}.jsonl"
+    mintime: 1788220800000
+  delegate_to: localhost
+
+# Count the events the next export would fetch
+- name: Plan export
+  duo_authlog:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    accounts: all
+    dest: /var/log/duo/authlog.jsonl
+  check_mode: true
+'''
+
+RETURN = '''
+account_id:
+    description: The Duo-assigned account_id of the child account, or null for the parent account
+    type: str
+    returned: unless accounts is set
+
+events:
+    description: Number of events that were (or in check mode would be) exported, from every account
+    type: int
+    returned: always
+
+mintime:
+    description: Start of the window that was exported, in milliseconds since the epoch
+    type: int
+    returned: unless accounts is set
+
+maxtime:
+    description: End of the window that was exported, in milliseconds since the epoch
+    type: int
+    returned: unless accounts is set
+
+accounts:
+    description: Per-account results keyed by child account name, when accounts is set
+    type: dict
+    returned: when accounts is set
+    contains:
+        account_id:
+            description: The Duo-assigned account_id of the child account
+            type: str
+        changed:
+            description: Whether events of this account were (or in check mode would be) exported
+            type: bool
+        failed:
+            description: Whether the log of this account could not be exported. The events exported before the failure are kept, and the next run resumes after them.
+            type: bool
+        msg:
+            description: Error message if failed
+            type: str
+        events:
+            description: Number of events of this account that were (or in check mode would be) exported
+            type: int
+        mintime:
+            description: Start of the window that was exported, in milliseconds since the epoch
+            type: int
+        maxtime:
+            description: End of the window that was exported, in milliseconds since the epoch
+            type: int
+
+failed_accounts:
+    description: Names of the child accounts whose log could not be exported
+    type: list
+    returned: when accounts is set
+
+duo_metrics:
+    description:
+        - Duo API calls made by the task, with the totals below for all calls and again per endpoint (C(endpoints)) and per child account (C(accounts))
+        - Times are in seconds. A call includes its rate limit waits and retries.
+    type: dict
+    returned: when the task called the Duo API
+    contains:
+        calls:
+            description: Number of calls
+            type: int
+        bytes_sent:
+            description: Bytes of request bodies sent
+            type: int
+        bytes_received:
+            description: Bytes of responses received
+            type: int
+        p50:
+            description: Median call latency
+            type: float
+        p95:
+            description: 95th percentile call latency
+            type: float
+        rate_limit_wait:
+            description: Time spent waiting on the rate limit and before retrying HTTP 429 responses
+            type: float
+        endpoints:
+            description: The same totals for every endpoint, such as C(GET /admin/v1/settings)
+            type: dict
+        accounts:
+            description: The same totals for every child account_id, or C(parent) for the parent account
+            type: dict
+    sample: {"calls": 2, "errors": 0, "bytes_sent": 0, "bytes_received": 1530, "time": 0.412, "p50": 0.198, "p95": 0.214, "max": 0.214,
+             "retries": 0, "rate_limited": 0, "rate_limit_wait": 0.0, "endpoints": {}, "accounts": {}}
+'''
+
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.accounts import ChildAccountIndex, account_cache_argument_spec, resolve_account
+from ..module_utils.api import accounts_client, api_argument_spec
+from ..module_utils.engine import async_client, run_async
+from ..module_utils.logs import (AUTHLOG_DELAY, LogCheckpoints, append_records, authlog_count, authlog_pages,
+                                 log_argument_spec, log_rate_limiter)
+from ..module_utils.workers import workers_argument_spec
+
+
+# How far back, in milliseconds, an account without a checkpoint is exported from
+DEFAULT_MINTIME_AGE = 24 * 60 * 60 * 1000
+
+
+def export_targets(module, result):
+    '''
+    Returns the result entry of every account to export, each holding its
+    account_id, which is the result itself unless accounts is set
+    '''
+    names = module.params.get('accounts')
+    if not names:
+        result.update(account_id=resolve_account(module, result), mintime=None, maxtime=None)
+        return [result]
+    try:
+        index = ChildAccountIndex.from_module(module, accounts_client(module)).index
+    except Exception as e:
+        module.fail_json(msg='Could not retrieve child accounts: {}'.format(str(e)), **result)
+    if names == ['all']:
+        names = sorted(index)
+
+    result['accounts'] = {}
+    result['failed_accounts'] = []
+    targets = []
+    for name in names:
+        if name in index:
+            result['accounts'][name] = dict(account_id=index[name][0], changed=False, failed=False, events=0, mintime=None, maxtime=None)
+            targets.append(result['accounts'][name])
+        else:
+            result['accounts'][name] = dict(changed=False, failed=True, msg='Could not find child account {}'.format(name))
+    return targets
+
+
+def run_module(module_class=AnsibleModule):
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        ikey=dict(type='str', required=True),
+        skey=dict(type='str', required=True, no_log=True),
+        host=dict(type='str', required=True),
+        name=dict(type='str', required=False),
+        account_id=dict(type='str', required=False),
+        accounts=dict(type='list', elements='str', required=False),
+        dest=dict(type='path', required=True),
+        checkpoint_file=dict(type='path', required=False),
+        mintime=dict(type='int', required=False)
+    )
+    module_args.update(account_cache_argument_spec())
+    module_args.update(api_argument_spec())
+    module_args.update(log_argument_spec())
+    module_args.update(workers_argument_spec())
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # change is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        events=0
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = module_class(
+        argument_spec=module_args,
+        mutually_exclusive=[['name', 'account_id', 'accounts']],
+        supports_check_mode=True
+    )
+
+    # manipulate or modify the state as needed (this is going to be the
+    # part where your module will do what it needs to do)
+    now = int(time.time() * 1000)
+    maxtime = now - AUTHLOG_DELAY
+    default_mintime = module.params.get('mintime') or now - DEFAULT_MINTIME_AGE
+    dest = module.params.get('dest')
+    checkpoints = LogCheckpoints.from_module(module)
+    targets = export_targets(module, result)
+    api = async_client(module)
+
+    '''
+    Export every account concurrently, appending each page to dest and
+    moving the checkpoint past it as it arrives
+    '''
+    async def export(api, entry):
+        account_id = entry['account_id']
+        limiter = log_rate_limiter(module, account_id)
+        checkpoint = checkpoints.get(account_id) or dict(mintime=default_mintime)
+        entry['mintime'] = checkpoint['mintime']
+        while True:
+            # An interrupted window is finished first, up to its own maxtime
+            window = (checkpoint['mintime'], checkpoint.get('maxtime', maxtime))
+            entry['maxtime'] = window[1]
+            if window[0] > window[1]:
+                return
+            if module.check_mode:
+                entry['events'] += await authlog_count(api, account_id, window[0], maxtime, limiter)
+                return
+            async for records, next_offset in authlog_pages(api, account_id, window[0], window[1], checkpoint.get('next_offset'), limiter):
+                append_records(dest, records, account_id=account_id)
+                entry['events'] += len(records)
+                if next_offset is not None:
+                    checkpoints.save(account_id, window[0], window[1], next_offset)
+            checkpoints.save(account_id, window[1] + 1)
+            if window[1] >= maxtime:
+                return
+            checkpoint = dict(mintime=window[1] + 1)
+
+    def exported(entry, resp, error):
+        entry['changed'] = entry['events'] > 0
+        if error is not None:
+            entry.update(failed=True, msg=str(error))
+
+    run_async(api, export, targets, on_result=exported)
+
+    if 'accounts' not in result:
+        if result.pop('failed', False):
+            module.fail_json(msg='Could not export the authentication log: {}'.format(result.pop('msg')), **result)
+        module.exit_json(**result)
+
+    result['events'] = sum(v.get('events', 0) for v in result['accounts'].values())
+    result['failed_accounts'] = sorted(k for k, v in result['accounts'].items() if v['failed'])
+    result['changed'] = any(v['changed'] for v in result['accounts'].values())
+    if result['failed_accounts']:
+        module.fail_json(msg='Could not export {} of {} child accounts'.format(len(result['failed_accounts']), len(result['accounts'])), **result)
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
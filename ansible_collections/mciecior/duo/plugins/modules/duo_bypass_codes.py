@@ -0,0 +1,381 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+module: duo_bypass_codes
+
+short_description: Generate bypass codes for many Duo users.
+
+version_added: "2.9"
+
+description:
+    - "This is used to issue bypass codes to many users, in one or many Duo accounts, in a single task"
+    - "Users are looked up in batches of 100 usernames and codes are generated concurrently"
+    - "The generated codes are written to a file on the host running the module and are never returned in the task result"
+
+options:
+    ikey:
+        description:
+            - Integration Key for the Duo Admin API application
+        type: str
+        required: true
+    skey:
+        description:
+            - Secret Key for the Duo Admin API application
+        type: str
+        required: true
+    host:
+        description:
+            - API Host for the Duo Admin API application
+        type: str
+        required: true
+    name:
+        description:
+            - Name of the child account of users that do not set their own account
+            - If neither name nor account_id is set, users of the parent account are used
+        type: str
+        required: false
+    account_id:
+        description:
+            - Duo-provided ID of the child account of users that do not set their own account. Mutually exclusive with name.
+        type: str
+        required: false
+    users:
+        description:
+            - List of users to generate bypass codes for
+            - Each entry is either a username, or a dict with a username and an optional account (child account name) or account_id
+            - Usernames and aliases are matched without regard to case, as Duo does, and every user gets one set of codes however many times it is listed
+        type: list
+        elements: raw
+        required: true
+    dest:
+        description:
+            - File the generated codes are written to. It is created with mode 0600.
+        type: path
+        required: true
+    format:
+        description:
+            - Format of dest. C(csv) writes one row per code, C(jsonl) writes one JSON object per user.
+        type: str
+        required: false
+        default: csv
+        choices: ['csv', 'jsonl']
+    count:
+        description:
+            - Number of bypass codes to generate for each user
+        type: int
+        required: false
+        default: 10
+    valid_secs:
+        description:
+            - Seconds before the codes expire. If 0, the codes never expire.
+        type: int
+        required: false
+    remaining_uses:
+        description:
+            - Number of times each code can be used. If 0, the codes can be used an unlimited number of times.
+        type: int
+        required: false
+    preserve_existing:
+        description:
+            - Keep the existing bypass codes of each user instead of replacing them
+        type: bool
+        required: false
+
+extends_documentation_fragment:
+    - mciecior.duo.duo.account_cache
+    - mciecior.duo.duo.rate_limit
+    - mciecior.duo.duo.workers
+
+author:
+    - Mark Ciecior (mciecior@carrieraccessit.com)
+'''
+
+EXAMPLES = '''
+# Issue single-use bypass codes valid for a day
+- name: Generate bypass codes
+  duo_bypass_codes:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    name: Awesome Test Account
+    users:
+      - jdoe
+      - asmith
+      - username: bjones
+        account: Another Test Account
+    count: 3
+    valid_secs: 86400
+    remaining_uses: 1
+    dest: /root/bypass_codes.csv
+'''
+
+RETURN = '''
+generated:
+    description: Number of users bypass codes were (or in check mode would be) generated for
+    type: int
+    returned: always
+
+missing:
+    description: Users that could not be found, as account/username
+    type: list
+    returned: always
+
+failed_users:
+    description: Error message keyed by account/username for users whose codes could not be generated
+    type: dict
+    returned: always
+
+dest:
+    description: File the generated codes were written to
+    type: str
+    returned: always
+
+duo_metrics:
+    description:
+        - Duo API calls made by the task, with the totals below for all calls and again per endpoint (C(endpoints)) and per child account (C(accounts))
+        - Times are in seconds. A call includes its rate limit waits and retries.
+    type: dict
+    returned: when the task called the Duo API
+    contains:
+        calls:
+            description: Number of calls
+            type: int
+        bytes_sent:
+            description: Bytes of request bodies sent
+            type: int
+        bytes_received:
+            description: Bytes of responses received
+            type: int
+        p50:
+            description: Median call latency
+            type: float
+        p95:
+            description: 95th percentile call latency
+            type: float
+        rate_limit_wait:
+            description: Time spent waiting on the rate limit and before retrying HTTP 429 responses
+            type: float
+        endpoints:
+            description: The same totals for every endpoint, such as C(GET /admin/v1/settings)
+            type: dict
+        accounts:
+            description: The same totals for every child account_id, or C(parent) for the parent account
+            type: dict
+    sample: {"calls": 2, "errors": 0, "bytes_sent": 0, "bytes_received": 1530, "time": 0.412, "p50": 0.198, "p95": 0.214, "max": 0.214,
+             "retries": 0, "rate_limited": 0, "rate_limit_wait": 0.0, "endpoints": {}, "accounts": {}}
+'''
+
+import csv
+import json
+import os
+import tempfile
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.accounts import ChildAccountIndex, account_cache_argument_spec
+from ..module_utils.api import accounts_client, admin_client, api_argument_spec
+from ..module_utils.users import user_key
+from ..module_utils.workers import run_parallel, workers_argument_spec
+
+
+USERNAME_BATCH = 100
+
+
+def group_users(module, result):
+    '''
+    Returns a dict of account_id -> (account label, {user_key: username}),
+    so a user listed twice with different case gets its codes once
+    '''
+    default_name = module.params.get('name')
+    default_id = module.params.get('account_id')
+    account_index = None
+    grouped = {}
+    for entry in module.params.get('users'):
+        if isinstance(entry, dict):
+            username = entry.get('username')
+            name = entry.get('account')
+            account_id = entry.get('account_id')
+            if not name and not account_id:
+                name, account_id = default_name, default_id
+        else:
+            username, name, account_id = entry, default_name, default_id
+        if not username:
+            module.fail_json(msg='Every entry in users needs a username: {}'.format(entry), **result)
+        if name and not account_id:
+            if account_index is None:
+                accounts_api = accounts_client(module)
+                account_index = ChildAccountIndex.from_module(module, accounts_api)
+            try:
+                account = account_index.get(name)
+            except Exception as e:
+                module.fail_json(msg='Could not retrieve child accounts: {}'.format(str(e)), **result)
+            if account is None:
+                module.fail_json(msg='Could not find child account {}'.format(name), **result)
+            account_id = account[0]
+        label = name or account_id or ''
+        grouped.setdefault(account_id, (label, {}))[1].setdefault(user_key(str(username)), str(username))
+    return grouped
+
+
+def write_codes(module, dest, issued):
+    '''
+    Atomically write the generated codes to dest with mode 0600
+    '''
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(dest)), prefix='.duo_bypass_codes-')
+    with os.fdopen(fd, 'w') as f:
+        if module.params.get('format') == 'csv':
+            writer = csv.writer(f)
+            writer.writerow(['account', 'username', 'user_id', 'code'])
+            for account, username, user_id, codes in issued:
+                for code in codes:
+                    writer.writerow([account, username, user_id, code])
+        else:
+            for account, username, user_id, codes in issued:
+                f.write(json.dumps(dict(account=account, username=username, user_id=user_id, codes=codes)) + '\n')
+    os.replace(tmp, dest)
+
+
+def run_module(module_class=AnsibleModule):
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        ikey=dict(type='str', required=True),
+        skey=dict(type='str', required=True, no_log=True),
+        host=dict(type='str', required=True),
+        name=dict(type='str', required=False),
+        account_id=dict(type='str', required=False),
+        users=dict(type='list', elements='raw', required=True),
+        dest=dict(type='path', required=True),
+        format=dict(type='str', required=False, default='csv', choices=['csv', 'jsonl']),
+        count=dict(type='int', required=False, default=10),
+        valid_secs=dict(type='int', required=False),
+        remaining_uses=dict(type='int', required=False),
+        preserve_existing=dict(type='bool', required=False)
+    )
+    module_args.update(account_cache_argument_spec())
+    module_args.update(api_argument_spec())
+    module_args.update(workers_argument_spec())
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # change is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        generated=0,
+        missing=[],
+        failed_users={},
+        dest=''
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = module_class(
+        argument_spec=module_args,
+        mutually_exclusive=[['name', 'account_id']],
+        supports_check_mode=True
+    )
+
+    # manipulate or modify the state as needed (this is going to be the
+    # part where your module will do what it needs to do)
+    dest = module.params.get('dest')
+    workers = module.params.get('workers')
+    result['dest'] = dest
+    grouped = group_users(module, result)
+
+    '''
+    Resolve usernames to user IDs with batched list calls
+    '''
+    batches = []
+    for account_id, (label, usernames) in grouped.items():
+        usernames = sorted(usernames.values())
+        for i in range(0, len(usernames), USERNAME_BATCH):
+            batches.append((account_id, tuple(usernames[i:i + USERNAME_BATCH])))
+
+    def lookup(batch):
+        '''
+        Returns the user_id of the users found, keyed by the user_key of
+        their username and aliases, which Duo matches without regard to case
+        '''
+        account_id, usernames = batch
+        found = {}
+        for user in admin_client(module, account_id).get_users_by_names(list(usernames)):
+            for name in [user.get('username')] + [user.get('alias{}'.format(i)) for i in range(1, 5)]:
+                if name:
+                    found.setdefault(user_key(name), user['user_id'])
+        return found
+
+    targets = []
+    user_ids = set()
+    for (account_id, usernames), found, error in run_parallel(lookup, batches, workers):
+        label = grouped[account_id][0]
+        if error is not None:
+            module.fail_json(msg='Could not retrieve users of {}: {}'.format(label or 'the parent account', str(error)), **result)
+        for username in usernames:
+            user_id = found.get(user_key(username))
+            if user_id is None:
+                result['missing'].append('{}/{}'.format(label, username))
+            elif (account_id, user_id) not in user_ids:
+                # a username and an alias of the same user get one set of codes
+                user_ids.add((account_id, user_id))
+                targets.append((account_id, label, username, user_id))
+    if result['missing']:
+        module.warn('Could not find {} users'.format(len(result['missing'])))
+
+    result['generated'] = len(targets)
+    result['changed'] = bool(targets)
+    if module.check_mode or not targets:
+        module.exit_json(**result)
+
+    '''
+    Generate the codes on the worker pool
+    '''
+    options = dict(
+        count=module.params.get('count'),
+        valid_secs=module.params.get('valid_secs'),
+        remaining_uses=module.params.get('remaining_uses'),
+    )
+    if module.params.get('preserve_existing') is not None:
+        options['preserve_existing'] = module.params.get('preserve_existing')
+
+    def generate(target):
+        account_id, label, username, user_id = target
+        return admin_client(module, account_id).add_user_bypass_codes(user_id, **options)
+
+    issued = []
+    for (account_id, label, username, user_id), codes, error in run_parallel(generate, targets, workers):
+        if error is not None:
+            result['failed_users']['{}/{}'.format(label, username)] = str(error)
+        else:
+            issued.append((label, username, user_id, codes))
+
+    result['generated'] = len(issued)
+    result['changed'] = bool(issued)
+    if issued:
+        try:
+            write_codes(module, dest, issued)
+        except (IOError, OSError) as e:
+            module.fail_json(msg='Could not write bypass codes to {}: {}'.format(dest, str(e)), **result)
+    if result['failed_users']:
+        module.fail_json(msg='Could not generate bypass codes for {} users'.format(len(result['failed_users'])), **result)
+
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
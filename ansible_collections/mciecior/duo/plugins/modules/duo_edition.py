@@ -39,15 +39,36 @@ options:
     account_id:
         description:
             - Duo-provided ID of the child account
+            - One of account_id, account_ids or editions is required.
         type: str
-        required: true
+        required: false
+    account_ids:
+        description:
+            - List of Duo-provided IDs of child accounts to get/set concurrently, or C(all) for every child account.
+            - Each account is retrieved and updated independently, and one failing account does not stop the others.
+            - Mutually exclusive with account_id.
+        type: list
+        elements: str
+        required: false
     edition:
         description:
-            - Billing edition of this child account
-            - One of: ['ENTERPRISE', 'PLATFORM', or 'BEYOND']
+            - Billing edition of this child account, or of every account in account_ids that is not in editions
+            - "One of: ENTERPRISE, PLATFORM, or BEYOND"
             - These correspond to Duo MFA, Duo Access, and Duo Beyond, respectively
         type: str
         required: false
+    editions:
+        description:
+            - Map of child account ID or name to its desired billing edition
+            - The accounts in editions are managed in addition to the ones in account_ids.
+            - Mutually exclusive with account_id.
+        type: dict
+        required: false
+
+extends_documentation_fragment:
+    - mciecior.duo.duo.account_cache
+    - mciecior.duo.duo.rate_limit
+    - mciecior.duo.duo.workers
 
 author:
     - Mark Ciecior (mciecior@carrieraccessit.com)
@@ -71,84 +92,187 @@ EXAMPLES = '''
     account_id: DAABCDEFGH12345678
     edition: BEYOND
 
+# Report the edition of every child account
+- name: Audit child account editions
+  duo_edition:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    account_ids: all
+  register: audit
+
+- name: Show the accounts on each edition
+  debug:
+    var: audit.summary
+
+# Apply the editions from the billing system
+- name: Set child account editions
+  duo_edition:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    editions:
+      DAABCDEFGH12345678: BEYOND
+      Awesome Test Account: PLATFORM
+
 '''
 
 RETURN = '''
 edition:
     description: Billing edition of this child account
     type: str
-    returned: always
+    returned: when account_id is set
+
+accounts:
+    description: Per-account results keyed by account ID
+    type: dict
+    returned: when account_ids or editions is set
+    contains:
+        name:
+            description: Name of the child account, if known
+            type: str
+        edition:
+            description: Billing edition of the child account
+            type: str
+        changed:
+            description: Whether the edition was (or in check mode would be) changed
+            type: bool
+        failed:
+            description: Whether the edition could not be retrieved or changed
+            type: bool
+        msg:
+            description: Error message if failed
+            type: str
+
+summary:
+    description: Account IDs on each billing edition, keyed by edition
+    type: dict
+    returned: when account_ids or editions is set
+
+failed_accounts:
+    description: IDs of the child accounts whose edition could not be retrieved or changed
+    type: list
+    returned: when account_ids or editions is set
+
+duo_metrics:
+    description:
+        - Duo API calls made by the task, with the totals below for all calls and again per endpoint (C(endpoints)) and per child account (C(accounts))
+        - Times are in seconds. A call includes its rate limit waits and retries.
+    type: dict
+    returned: when the task called the Duo API
+    contains:
+        calls:
+            description: Number of calls
+            type: int
+        bytes_sent:
+            description: Bytes of request bodies sent
+            type: int
+        bytes_received:
+            description: Bytes of responses received
+            type: int
+        p50:
+            description: Median call latency
+            type: float
+        p95:
+            description: 95th percentile call latency
+            type: float
+        rate_limit_wait:
+            description: Time spent waiting on the rate limit and before retrying HTTP 429 responses
+            type: float
+        endpoints:
+            description: The same totals for every endpoint, such as C(GET /admin/v1/settings)
+            type: dict
+        accounts:
+            description: The same totals for every child account_id, or C(parent) for the parent account
+            type: dict
+    sample: {"calls": 2, "errors": 0, "bytes_sent": 0, "bytes_received": 1530, "time": 0.412, "p50": 0.198, "p95": 0.214, "max": 0.214,
+             "retries": 0, "rate_limited": 0, "rate_limit_wait": 0.0, "endpoints": {}, "accounts": {}}
 '''
 
 
-# import duo_client
 from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.accounts import ChildAccountIndex, account_cache_argument_spec
+from ..module_utils.api import accounts_client, api_argument_spec, edition_client
+from ..module_utils.edition import EDITIONS
+from ..module_utils.engine import async_client, run_async
+from ..module_utils.workers import workers_argument_spec
+
+
+def fleet_editions(module, result):
+    '''
+    Get or set the editions of many child accounts concurrently, with up to
+    workers calls in flight from one event loop
+    '''
+    account_ids = module.params.get('account_ids') or []
+    editions = module.params.get('editions') or {}
+    default_edition = module.params.get('edition')
+    result.pop('account_id', None)
+
+    '''
+    Resolve account names and C(all) through the child account index
+    '''
+    try:
+        index = ChildAccountIndex.from_module(module, accounts_client(module)).index
+    except Exception as e:
+        module.fail_json(msg='Could not retrieve child accounts: {}'.format(str(e)), **result)
+    names = dict((v[0], k) for k, v in index.items())
+    if account_ids == ['all']:
+        account_ids = sorted(names)
+    desired = dict((a, default_edition) for a in account_ids)
+    for key, edition in editions.items():
+        if key not in names and key in index:
+            key = index[key][0]
+        desired[key] = edition
+    for account_id, edition in desired.items():
+        if edition and edition not in EDITIONS:
+            module.fail_json(msg="edition must be one of {}, not {} (account {})".format(EDITIONS, edition, account_id), **result)
+
+    async def apply(api, account_id):
+        current = (await api.json_api_call('GET', '/admin/v1/billing/edition', {}, account_id))['edition']
+        edition = desired[account_id]
+        if not edition or edition == current:
+            return dict(edition=current, changed=False)
+        if not module.check_mode:
+            await api.json_api_call('POST', '/admin/v1/billing/edition', dict(edition=edition), account_id)
+        return dict(edition=edition, changed=True)
+
+    result['accounts'] = {}
+    for account_id, resp, error in run_async(async_client(module), apply, sorted(desired)):
+        account = dict(changed=False, failed=False)
+        if account_id in names:
+            account['name'] = names[account_id]
+        if error is not None:
+            account.update(failed=True, msg=str(error))
+        else:
+            account.update(resp)
+        result['accounts'][account_id] = account
+
+    result['summary'] = {}
+    for account_id, account in sorted(result['accounts'].items()):
+        if not account['failed']:
+            result['summary'].setdefault(account['edition'], []).append(account_id)
+    result['failed_accounts'] = sorted(k for k, v in result['accounts'].items() if v['failed'])
+    result['changed'] = any(v['changed'] for v in result['accounts'].values())
+    if result['failed_accounts']:
+        module.fail_json(msg='Could not get or set the edition of {} of {} child accounts'.format(
+            len(result['failed_accounts']), len(result['accounts'])), **result)
+    module.exit_json(**result)
 
 
-# This import and class can be removed once the duo_client library supports
-#   the billing edition endpoint (https://github.com/duosecurity/duo_client_python/pull/133)
-from duo_client.client import Client
-
-
-class OverrideAdmin(Client):
-    account_id = None
-
-    def api_call(self, method, path, params):
-        if self.account_id is not None:
-            params['account_id'] = self.account_id
-        return super(OverrideAdmin, self).api_call(method, path, params)
-
-    def get_billing_edition(
-        self,
-    ):
-        """
-        Returns the billing edition for a child account.
-
-        Returns dict including edition.
-
-        Raises RuntimeError on error.
-        """
-        params = {
-            'account_id': self.account_id,
-        }
-        response = self.json_api_call(
-            'GET',
-            '/admin/v1/billing/edition',
-            params
-        )
-        return response
-
-    def set_billing_edition(self, edition):
-        """
-        Sets the billing edition for a child account.
-
-        edition - <str:the edition to set> One of: ENTERPRISE, PLATFORM, or BEYOND
-
-        Returns empty string on success.
-
-        Raises RuntimeError on error.
-        """
-        params = {
-            'account_id': self.account_id,
-            'edition': edition
-        }
-        response = self.json_api_call(
-              'POST',
-              '/admin/v1/billing/edition',
-              params
-        )
-        return response
-
-
-def run_module():
+def run_module(module_class=AnsibleModule):
     # define available arguments/parameters a user can pass to the module
     module_args = dict(
         ikey=dict(type='str', required=True),
         skey=dict(type='str', required=True, no_log=True),
         host=dict(type='str', required=True),
-        account_id=dict(type='str', required=True),
-        edition=dict(type='str', required=False)
+        account_id=dict(type='str', required=False),
+        account_ids=dict(type='list', elements='str', required=False),
+        edition=dict(type='str', required=False),
+        editions=dict(type='dict', required=False)
     )
+    module_args.update(account_cache_argument_spec())
+    module_args.update(api_argument_spec())
+    module_args.update(workers_argument_spec())
 
     # seed the result dict in the object
     # we primarily care about changed and state
@@ -164,25 +288,20 @@ def run_module():
     # this includes instantiation, a couple of common attr would be the
     # args/params passed to the execution, as well as if the module
     # supports check mode
-    module = AnsibleModule(
+    module = module_class(
         argument_spec=module_args,
+        mutually_exclusive=[['account_id', 'account_ids'], ['account_id', 'editions']],
+        required_one_of=[['account_id', 'account_ids', 'editions']],
         supports_check_mode=True
     )
 
     # manipulate or modify the state as needed (this is going to be the
     # part where your module will do what it needs to do)
-    ikey = module.params.get('ikey')
-    skey = module.params.get('skey')
-    host = module.params.get('host')
     account_id = module.params.get('account_id')
     edition = module.params.get('edition', None)
-    # admin_api = duo_client.Admin(
-    admin_api = OverrideAdmin(
-        ikey=ikey,
-        skey=skey,
-        host=host,
-        )
-    admin_api.account_id = account_id
+    if not account_id:
+        fleet_editions(module, result)
+    admin_api = edition_client(module, account_id)
 
     try:
         resp = admin_api.get_billing_edition()
@@ -196,8 +315,8 @@ def run_module():
         result['changed'] = False
         module.exit_json(**result)
     else:
-        if edition not in ['ENTERPRISE', 'PLATFORM', 'BEYOND']:
-            module.fail_json(msg="edition must be one of ['ENTERPRISE', 'PLATFORM', 'BEYOND'], not {}".format(edition), **result)
+        if edition not in EDITIONS:
+            module.fail_json(msg="edition must be one of {}, not {}".format(EDITIONS, edition), **result)
         result['changed'] = True
         if not module.check_mode:
             try:
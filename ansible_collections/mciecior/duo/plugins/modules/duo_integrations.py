@@ -0,0 +1,457 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+module: duo_integrations
+
+short_description: Reconcile the integrations of one or many Duo accounts.
+
+version_added: "2.9"
+
+description:
+    - "This is used to make the integrations of Duo accounts match a desired list in a single task"
+    - "The integrations of each account are retrieved once, and all creates/updates/deletes are run concurrently"
+
+options:
+    ikey:
+        description:
+            - Integration Key for the Duo Admin API application
+        type: str
+        required: true
+    skey:
+        description:
+            - Secret Key for the Duo Admin API application
+        type: str
+        required: true
+    host:
+        description:
+            - API Host for the Duo Admin API application
+        type: str
+        required: true
+    accounts:
+        description:
+            - List of child account names to reconcile, or C(all) for every child account.
+            - If neither accounts nor account_id is set, the integrations of the parent account are reconciled.
+            - Each account is reconciled independently, and one failing account does not stop the others.
+        type: list
+        elements: str
+        required: false
+    account_id:
+        description:
+            - Duo-provided ID of the child account to reconcile, for example from the mciecior.duo.duo_accounts inventory plugin
+            - Mutually exclusive with accounts.
+        type: str
+        required: false
+    integrations:
+        description:
+            - List of desired integrations of every account
+            - An existing integration matches an entry if it has the same name, and the same type if the entry has one.
+        type: list
+        elements: dict
+        required: true
+        suboptions:
+            name:
+                description:
+                    - The name of the integration
+                type: str
+                required: true
+            type:
+                description:
+                    - The type of the integration. Required to create it. Refer to Retrieve Integrations for a list of valid values.
+                type: str
+                required: false
+            state:
+                description:
+                    - Whether the integration should exist or not
+                type: str
+                required: false
+                default: present
+                choices: ['present', 'absent']
+            self_service_allowed:
+                description:
+                    - Whether users may manage their own devices. This is only supported by integrations which allow for self service configuration.
+                type: bool
+                required: false
+            settings:
+                description:
+                    - Other settings of the integration, as accepted by the Create Integration API, for example greeting, groups_allowed or user_access
+                    - Only the settings listed here are compared and updated.
+                type: dict
+                required: false
+    purge:
+        description:
+            - Remove every integration of the accounts that is not in integrations
+            - The Admin API integration used by this module is never removed.
+            - The task fails without changing anything if no integration in integrations has state C(present).
+        type: bool
+        required: false
+        default: false
+
+extends_documentation_fragment:
+    - mciecior.duo.duo.account_cache
+    - mciecior.duo.duo.integration_cache
+    - mciecior.duo.duo.rate_limit
+    - mciecior.duo.duo.workers
+
+author:
+    - Mark Ciecior (mciecior@carrieraccessit.com)
+'''
+
+EXAMPLES = '''
+# Deploy the standard integrations to several child accounts
+- name: Deploy customer integrations
+  duo_integrations:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    accounts:
+      - Awesome Test Account
+      - Another Test Account
+    integrations:
+      - name: Windows Logon
+        type: rdp
+        self_service_allowed: true
+      - name: VPN
+        type: radius
+      - name: Web App
+        type: websdk
+        settings:
+          greeting: Welcome to the web app
+  register: deployed
+
+- name: Show the new RDP keys
+  debug:
+    msg: "{{ deployed.accounts['Awesome Test Account'].credentials['Windows Logon'] }}"
+
+# Remove every integration of a child account except the listed ones
+- name: Reconcile integrations
+  duo_integrations:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    account_id: DA1234567890ABCDEFGH
+    purge: true
+    integrations:
+      - name: Windows Logon
+        type: rdp
+'''
+
+RETURN = '''
+accounts:
+    description: Per-account results keyed by account name, by account_id, or by host for the parent account
+    type: dict
+    returned: always
+    contains:
+        account_id:
+            description: The Duo-assigned account_id variable
+            type: str
+        changed:
+            description: Whether any integration of the account was (or in check mode would be) changed
+            type: bool
+        failed:
+            description: Whether the integrations of the account could not be retrieved or reconciled
+            type: bool
+        msg:
+            description: Error messages of the account
+            type: str
+        created:
+            description: Names of the integrations that were (or in check mode would be) created
+            type: list
+        updated:
+            description: Names of the integrations that were (or in check mode would be) updated
+            type: list
+        deleted:
+            description: Names of the integrations that were (or in check mode would be) removed
+            type: list
+        credentials:
+            description: Integration key and secret key of every present integration, keyed by name
+            type: dict
+
+failed_accounts:
+    description: Names of the accounts that could not be retrieved or reconciled
+    type: list
+    returned: always
+
+duo_metrics:
+    description:
+        - Duo API calls made by the task, with the totals below for all calls and again per endpoint (C(endpoints)) and per child account (C(accounts))
+        - Times are in seconds. A call includes its rate limit waits and retries.
+    type: dict
+    returned: when the task called the Duo API
+    contains:
+        calls:
+            description: Number of calls
+            type: int
+        bytes_sent:
+            description: Bytes of request bodies sent
+            type: int
+        bytes_received:
+            description: Bytes of responses received
+            type: int
+        p50:
+            description: Median call latency
+            type: float
+        p95:
+            description: 95th percentile call latency
+            type: float
+        rate_limit_wait:
+            description: Time spent waiting on the rate limit and before retrying HTTP 429 responses
+            type: float
+        endpoints:
+            description: The same totals for every endpoint, such as C(GET /admin/v1/settings)
+            type: dict
+        accounts:
+            description: The same totals for every child account_id, or C(parent) for the parent account
+            type: dict
+    sample: {"calls": 2, "errors": 0, "bytes_sent": 0, "bytes_received": 1530, "time": 0.412, "p50": 0.198, "p95": 0.214, "max": 0.214,
+             "retries": 0, "rate_limited": 0, "rate_limit_wait": 0.0, "endpoints": {}, "accounts": {}}
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.accounts import ChildAccountIndex, account_cache_argument_spec
+from ..module_utils.api import Pages, accounts_client, admin_client, api_argument_spec
+from ..module_utils.diff import changed_values, diff_result, settings_diff
+from ..module_utils.integrations import (
+    INTEGRATION_SETTINGS,
+    INTEGRATIONS_PAGE_SIZE,
+    IntegrationIndex,
+    integration_cache_argument_spec,
+)
+from ..module_utils.workers import run_parallel, workers_argument_spec
+
+
+def desired_integrations(module):
+    '''
+    Returns the list of desired integrations with their settings merged
+    '''
+    desired = []
+    seen = set()
+    for entry in module.params.get('integrations'):
+        name = entry['name']
+        if name in seen:
+            module.fail_json(msg='Integration {} is listed more than once'.format(name))
+        seen.add(name)
+        settings = dict(entry.get('settings') or {})
+        unknown = sorted(set(settings) - set(INTEGRATION_SETTINGS))
+        if unknown:
+            module.fail_json(msg='Unsupported settings for integration {}: {}'.format(name, ', '.join(unknown)))
+        if entry.get('self_service_allowed') is not None:
+            settings['self_service_allowed'] = entry['self_service_allowed']
+        desired.append(dict(name=name, type=entry.get('type'), state=entry.get('state'), settings=settings))
+    return desired
+
+
+def find_integration(integrations, name, integration_type):
+    for i in integrations:
+        if i.get('name') == name and (integration_type is None or i.get('type') == integration_type):
+            return i
+    return None
+
+
+def plan(module, desired, integrations):
+    '''
+    Returns the creates, updates and deletes that make the integrations of
+    one account match the desired list
+    '''
+    ops = []
+    wanted = set()
+    for entry in desired:
+        current = find_integration(integrations, entry['name'], entry['type'])
+        if entry['state'] == 'absent':
+            if current is not None:
+                ops.append(dict(action='delete', name=entry['name'], integration_key=current['integration_key']))
+            continue
+        if current is None:
+            ops.append(dict(action='create', name=entry['name'], type=entry['type'], settings=entry['settings']))
+            continue
+        wanted.add(current['integration_key'])
+        diff = settings_diff(entry['settings'], current)
+        if diff:
+            ops.append(dict(action='update', name=entry['name'], integration_key=current['integration_key'],
+                            settings=changed_values(diff), diff=diff))
+    if module.params.get('purge'):
+        for i in integrations:
+            if i['integration_key'] in wanted or i['integration_key'] == module.params.get('ikey'):
+                continue
+            if any(op.get('integration_key') == i['integration_key'] for op in ops):
+                continue
+            ops.append(dict(action='delete', name=i['name'], integration_key=i['integration_key']))
+    return ops
+
+
+def op_diff(label, op):
+    '''
+    Returns the --diff output of one create, update or delete
+    '''
+    header = '{}: {}'.format(label, op['name'])
+    if op['action'] == 'update':
+        return diff_result(op['diff'], header)
+    integration = dict(name=op['name'])
+    if op['action'] == 'create':
+        integration.update(op['settings'], type=op['type'])
+        return dict(before={}, after=integration, before_header=header, after_header=header)
+    integration['integration_key'] = op['integration_key']
+    return dict(before=integration, after={}, before_header=header, after_header=header)
+
+
+def run_module(module_class=AnsibleModule):
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        ikey=dict(type='str', required=True),
+        skey=dict(type='str', required=True, no_log=True),
+        host=dict(type='str', required=True),
+        accounts=dict(type='list', elements='str', required=False),
+        account_id=dict(type='str', required=False),
+        integrations=dict(type='list', elements='dict', required=True, options=dict(
+            name=dict(type='str', required=True),
+            type=dict(type='str', required=False),
+            state=dict(type='str', required=False, default='present', choices=['present', 'absent']),
+            self_service_allowed=dict(type='bool', required=False),
+            settings=dict(type='dict', required=False),
+        )),
+        purge=dict(type='bool', required=False, default=False)
+    )
+    module_args.update(account_cache_argument_spec())
+    module_args.update(integration_cache_argument_spec())
+    module_args.update(api_argument_spec())
+    module_args.update(workers_argument_spec())
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # change is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        accounts={},
+        failed_accounts=[]
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = module_class(
+        argument_spec=module_args,
+        mutually_exclusive=[['accounts', 'account_id']],
+        supports_check_mode=True
+    )
+
+    # manipulate or modify the state as needed (this is going to be the
+    # part where your module will do what it needs to do)
+    names = module.params.get('accounts')
+    account_id = module.params.get('account_id')
+    workers = module.params.get('workers')
+    desired = desired_integrations(module)
+    if module.params.get('purge') and not any(entry['state'] == 'present' for entry in desired):
+        module.fail_json(msg='No integration is present in integrations, refusing to purge every integration', **result)
+
+    '''
+    Resolve the accounts to reconcile, keyed by the name they are reported under
+    '''
+    targets = {}
+    if names:
+        accounts_api = accounts_client(module)
+        try:
+            index = ChildAccountIndex.from_module(module, accounts_api).index
+        except Exception as e:
+            module.fail_json(msg='Could not retrieve child accounts: {}'.format(str(e)), **result)
+        if names == ['all']:
+            names = sorted(index)
+        for name in names:
+            if name in index:
+                targets[name] = index[name][0]
+            else:
+                result['accounts'][name] = dict(changed=False, failed=True, msg='Could not find child account {}'.format(name))
+    elif account_id:
+        targets[account_id] = account_id
+    else:
+        targets[module.params.get('host')] = None
+
+    '''
+    Retrieve the integrations of every account once and diff them against the desired list
+    '''
+    def list_integrations(label):
+        admin_api = admin_client(module, targets[label])
+        return list(Pages(admin_api, '/admin/v1/integrations', page_size=INTEGRATIONS_PAGE_SIZE))
+
+    listings = {}
+    ops = []
+    for label, integrations, error in run_parallel(list_integrations, sorted(targets), workers):
+        account = dict(account_id=targets[label], changed=False, failed=False, created=[], updated=[], deleted=[], credentials={})
+        result['accounts'][label] = account
+        if error is not None:
+            account.update(failed=True, msg='Could not retrieve list of integrations: {}'.format(str(error)))
+            continue
+        listings[label] = integrations
+        for entry in desired:
+            current = find_integration(integrations, entry['name'], entry['type'])
+            if entry['state'] == 'present' and current is not None:
+                account['credentials'][entry['name']] = dict(ikey=current['integration_key'], skey=current.get('secret_key'))
+        for op in plan(module, desired, integrations):
+            op['account'] = label
+            ops.append(op)
+            account[op['action'] + 'd'].append(op['name'])
+            account['changed'] = True
+            if module._diff:
+                result.setdefault('diff', []).append(op_diff(label, op))
+
+    '''
+    Apply the creates, updates and deletes of every account on the worker pool
+    '''
+    def apply(op):
+        admin_api = admin_client(module, targets[op['account']])
+        if op['action'] == 'create':
+            if not op['type']:
+                raise ValueError('type is required to create integration {}'.format(op['name']))
+            return admin_api.create_integration(op['name'], op['type'], **op['settings'])
+        if op['action'] == 'update':
+            return admin_api.update_integration(op['integration_key'], **op['settings'])
+        return admin_api.delete_integration(op['integration_key'])
+
+    if not module.check_mode:
+        for op, resp, error in run_parallel(apply, ops, workers):
+            account = result['accounts'][op['account']]
+            if error is not None:
+                account[op['action'] + 'd'].remove(op['name'])
+                account['failed'] = True
+                account['msg'] = '; '.join(filter(None, [account.get('msg'), '{} {}: {}'.format(op['action'], op['name'], str(error))]))
+            elif op['action'] == 'create':
+                account['credentials'][op['name']] = dict(ikey=resp['integration_key'], skey=resp['secret_key'])
+            listing = listings[op['account']]
+            if error is None and op['action'] == 'delete':
+                listing[:] = [i for i in listing if i['integration_key'] != op['integration_key']]
+            elif error is None and isinstance(resp, dict) and 'integration_key' in resp:
+                listing[:] = [i for i in listing if i['integration_key'] != resp['integration_key']] + [resp]
+
+        '''
+        Share the listings with later tasks that look up integrations by name
+        '''
+        for label, listing in listings.items():
+            IntegrationIndex.from_module(module, admin_client(module, targets[label])).load(listing)
+
+    for account in result['accounts'].values():
+        account['changed'] = bool(account.get('created') or account.get('updated') or account.get('deleted'))
+    result['failed_accounts'] = sorted(k for k, v in result['accounts'].items() if v['failed'])
+    result['changed'] = any(v['changed'] for v in result['accounts'].values())
+    if result['failed_accounts']:
+        module.fail_json(msg='Could not reconcile the integrations of {} of {} accounts'.format(
+            len(result['failed_accounts']), len(result['accounts'])), **result)
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
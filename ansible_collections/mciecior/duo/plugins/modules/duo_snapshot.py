@@ -0,0 +1,375 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+module: duo_snapshot
+
+short_description: Export the configuration of every Duo child account to a compressed JSON-lines file.
+
+version_added: "2.9"
+
+description:
+    - "This is used by MSPs to back up the settings, integrations and edition of their child accounts"
+    - "Accounts are retrieved concurrently and written one JSON record per line as they arrive, so memory use does not grow with the number of accounts"
+    - "Records are written in account_id order to I(dest).part, and a cursor is kept in I(dest).cursor so an interrupted export can be resumed"
+
+options:
+    ikey:
+        description:
+            - Integration Key for the Duo Accounts API applications
+        type: str
+        required: true
+    skey:
+        description:
+            - Secret Key for the Duo Accounts API applications
+        type: str
+        required: true
+    host:
+        description:
+            - API Host for the Duo Accounts API applications
+        type: str
+        required: true
+    dest:
+        description:
+            - Path of the gzip-compressed JSON-lines file to write, for example /backup/duo-accounts.jsonl.gz
+            - The file is written on the host running the module, which is the controller when delegated to localhost. It is created with mode 0600.
+        type: path
+        required: true
+    accounts:
+        description:
+            - List of child account names to export, or C(all) for every child account
+        type: list
+        elements: str
+        required: false
+        default: ['all']
+    include:
+        description:
+            - Resources to export for every account
+        type: list
+        elements: str
+        required: false
+        default: ['settings', 'integrations', 'edition']
+        choices: ['settings', 'integrations', 'edition']
+    secret_keys:
+        description:
+            - Keep the secret key of every integration in the export
+            - By default secret_key is removed from the integrations.
+        type: bool
+        required: false
+        default: false
+    resume:
+        description:
+            - Continue an interrupted export after the last account recorded in I(dest).cursor
+            - If there is no cursor, the export starts from the first account.
+            - The task fails if accounts, include or secret_keys differ from the export being resumed.
+        type: bool
+        required: false
+        default: false
+
+extends_documentation_fragment:
+    - mciecior.duo.duo.account_cache
+    - mciecior.duo.duo.rate_limit
+    - mciecior.duo.duo.workers
+
+author:
+    - Mark Ciecior (mciecior@carrieraccessit.com)
+'''
+
+EXAMPLES = '''
+# Nightly backup of every child account
+- name: Snapshot child accounts
+  duo_snapshot:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    dest: "/backup/duo-{{ ansible_date_time.date }}.jsonl.gz"
+    resume: true
+  delegate_to: localhost
+
+# Export only the settings of two child accounts
+- name: Snapshot settings
+  duo_snapshot:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    dest: /tmp/settings.jsonl.gz
+    accounts:
+      - Awesome Test Account
+      - Another Test Account
+    include:
+      - settings
+  delegate_to: localhost
+'''
+
+RETURN = '''
+dest:
+    description: Path of the export
+    type: str
+    returned: always
+
+count:
+    description: Number of accounts in the export, including the ones written before a resume
+    type: int
+    returned: always
+
+resumed_from:
+    description: account_id of the last account written before the export was resumed, or null
+    type: str
+    returned: always
+
+failed_accounts:
+    description: Names of the child accounts with at least one resource that could not be retrieved. Their records hold the errors.
+    type: list
+    returned: always
+
+duo_metrics:
+    description:
+        - Duo API calls made by the task, with the totals below for all calls and again per endpoint (C(endpoints)) and per child account (C(accounts))
+        - Times are in seconds. A call includes its rate limit waits and retries.
+    type: dict
+    returned: when the task called the Duo API
+    contains:
+        calls:
+            description: Number of calls
+            type: int
+        bytes_sent:
+            description: Bytes of request bodies sent
+            type: int
+        bytes_received:
+            description: Bytes of responses received
+            type: int
+        p50:
+            description: Median call latency
+            type: float
+        p95:
+            description: 95th percentile call latency
+            type: float
+        rate_limit_wait:
+            description: Time spent waiting on the rate limit and before retrying HTTP 429 responses
+            type: float
+        endpoints:
+            description: The same totals for every endpoint, such as C(GET /admin/v1/settings)
+            type: dict
+        accounts:
+            description: The same totals for every child account_id, or C(parent) for the parent account
+            type: dict
+    sample: {"calls": 2, "errors": 0, "bytes_sent": 0, "bytes_received": 1530, "time": 0.412, "p50": 0.198, "p95": 0.214, "max": 0.214,
+             "retries": 0, "rate_limited": 0, "rate_limit_wait": 0.0, "endpoints": {}, "accounts": {}}
+'''
+
+import gzip
+import json
+import os
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.accounts import ChildAccountIndex, account_cache_argument_spec
+from ..module_utils.api import Pages, accounts_client, admin_client, api_argument_spec, edition_client
+from ..module_utils.integrations import INTEGRATIONS_PAGE_SIZE
+from ..module_utils.workers import run_parallel, workers_argument_spec
+
+
+# Number of accounts retrieved per worker before their records are written
+# and the cursor is advanced; this bounds the records held in memory.
+CHUNK_PER_WORKER = 4
+
+
+def read_cursor(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def write_cursor(path, cursor):
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(cursor, f)
+    os.replace(tmp, path)
+
+
+def export_options(module):
+    '''
+    Returns the options an export must be resumed with, as kept in its cursor
+    '''
+    return dict(
+        accounts=sorted(set(module.params.get('accounts'))),
+        include=sorted(set(module.params.get('include'))),
+        secret_keys=bool(module.params.get('secret_keys')),
+    )
+
+
+def snapshot_account(module, account):
+    '''
+    Returns the record of one child account
+    '''
+    include = module.params.get('include')
+    account_id, name, api_hostname = account
+    record = dict(account_id=account_id, name=name, api_hostname=api_hostname)
+    errors = {}
+    admin_api = admin_client(module, account_id)
+    if 'settings' in include:
+        try:
+            record['settings'] = admin_api.get_settings()
+        except Exception as e:
+            errors['settings'] = str(e)
+    if 'integrations' in include:
+        try:
+            record['integrations'] = list(Pages(admin_api, '/admin/v1/integrations', page_size=INTEGRATIONS_PAGE_SIZE))
+            if not module.params.get('secret_keys'):
+                for i in record['integrations']:
+                    i.pop('secret_key', None)
+        except Exception as e:
+            errors['integrations'] = str(e)
+    if 'edition' in include:
+        try:
+            record['edition'] = edition_client(module, account_id).get_billing_edition()['edition']
+        except Exception as e:
+            errors['edition'] = str(e)
+    if errors:
+        record['errors'] = errors
+    return record
+
+
+def run_module(module_class=AnsibleModule):
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        ikey=dict(type='str', required=True),
+        skey=dict(type='str', required=True, no_log=True),
+        host=dict(type='str', required=True),
+        dest=dict(type='path', required=True),
+        accounts=dict(type='list', elements='str', required=False, default=['all']),
+        include=dict(type='list', elements='str', required=False, default=['settings', 'integrations', 'edition'],
+                     choices=['settings', 'integrations', 'edition']),
+        secret_keys=dict(type='bool', required=False, default=False, no_log=False),
+        resume=dict(type='bool', required=False, default=False)
+    )
+    module_args.update(account_cache_argument_spec())
+    module_args.update(api_argument_spec())
+    module_args.update(workers_argument_spec())
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # change is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        count=0,
+        resumed_from=None,
+        failed_accounts=[]
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = module_class(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+
+    # manipulate or modify the state as needed (this is going to be the
+    # part where your module will do what it needs to do)
+    dest = module.params.get('dest')
+    names = module.params.get('accounts')
+    workers = module.params.get('workers')
+    part = dest + '.part'
+    cursor_path = dest + '.cursor'
+    result['dest'] = dest
+
+    accounts_api = accounts_client(module)
+    try:
+        index = ChildAccountIndex.from_module(module, accounts_api).index
+    except Exception as e:
+        module.fail_json(msg='Could not retrieve child accounts: {}'.format(str(e)), **result)
+    if names == ['all']:
+        names = list(index)
+    missing = [n for n in names if n not in index]
+    if missing:
+        module.fail_json(msg='Could not find child accounts: {}'.format(', '.join(missing)), **result)
+    accounts = sorted((index[n][0], n, index[n][1]) for n in set(names))
+
+    '''
+    Pick up after the last account of an interrupted export
+    '''
+    options = export_options(module)
+    cursor = read_cursor(cursor_path) if module.params.get('resume') else None
+    if cursor and os.path.exists(part):
+        if cursor.get('options') != options:
+            # resuming with other options would mix records of both exports
+            module.fail_json(msg='Cannot resume the export in {} with different accounts, include or secret_keys: it was started with {}. '
+                                 'Run it with the same options, or without resume to start over.'.format(part, cursor.get('options')), **result)
+        result['resumed_from'] = cursor['account_id']
+        result['count'] = cursor['count']
+        result['failed_accounts'] = cursor['failed_accounts']
+        accounts = [a for a in accounts if a[0] > cursor['account_id']]
+    else:
+        cursor = None
+
+    result['changed'] = True
+    if module.check_mode:
+        result['count'] += len(accounts)
+        module.exit_json(**result)
+
+    '''
+    Retrieve the accounts a chunk at a time, and append each chunk to the
+    export as one gzip member before advancing the cursor
+    '''
+    try:
+        if cursor:
+            with open(part, 'r+b') as f:
+                f.truncate(cursor['offset'])
+        else:
+            fd = os.open(part, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            os.close(fd)
+        chunk = max(1, workers * CHUNK_PER_WORKER)
+        for start in range(0, len(accounts), chunk):
+            records = run_parallel(lambda a: snapshot_account(module, a), accounts[start:start + chunk], workers)
+            with open(part, 'ab') as raw:
+                with gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                    for account, record, error in records:
+                        if error is not None:
+                            record = dict(account_id=account[0], name=account[1], errors=dict(account=str(error)))
+                        if 'errors' in record:
+                            result['failed_accounts'].append(account[1])
+                        f.write((json.dumps(record, sort_keys=True) + '\n').encode('utf-8'))
+                        result['count'] += 1
+                raw.flush()
+                os.fsync(raw.fileno())
+                offset = raw.tell()
+            write_cursor(cursor_path, dict(
+                account_id=accounts[start:start + chunk][-1][0],
+                offset=offset,
+                count=result['count'],
+                failed_accounts=result['failed_accounts'],
+                options=options,
+            ))
+        os.replace(part, dest)
+        if os.path.exists(cursor_path):
+            os.remove(cursor_path)
+    except (IOError, OSError) as e:
+        module.fail_json(msg='Could not write {}: {}'.format(dest, str(e)), **result)
+
+    result['failed_accounts'] = sorted(result['failed_accounts'])
+    if result['failed_accounts']:
+        module.fail_json(msg='Could not retrieve {} of {} child accounts'.format(
+            len(result['failed_accounts']), result['count']), **result)
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,388 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+module: duo_telephony_report
+
+short_description: Report the telephony credits of Duo child accounts.
+
+version_added: "2.9"
+
+description:
+    - "This is used by MSPs to see the telephony credit balance and usage of the whole fleet, and the accounts running low, in a single task"
+    - "The credits of every child account are retrieved concurrently and aggregated as they arrive, so only the totals and the low balance accounts are kept and returned"
+    - "One row per account can also be written to a CSV file"
+
+options:
+    ikey:
+        description:
+            - Integration Key for the Duo Accounts API applications
+        type: str
+        required: true
+    skey:
+        description:
+            - Secret Key for the Duo Accounts API applications
+        type: str
+        required: true
+    host:
+        description:
+            - API Host for the Duo Accounts API applications
+        type: str
+        required: true
+    accounts:
+        description:
+            - List of child account names to report, or C(all) for every child account
+        type: list
+        elements: str
+        required: false
+        default: ['all']
+    days:
+        description:
+            - Number of days before the run that credits_used is counted over
+        type: int
+        required: false
+        default: 30
+    low_balance:
+        description:
+            - Report the accounts with fewer than this many telephony credits remaining as low balance accounts
+            - If omitted, every account is compared with its own telephony_warning_min setting, which takes one more call per account. Accounts with a telephony_warning_min of 0 are then only low when they have no credits left.
+        type: int
+        required: false
+    dest:
+        description:
+            - Path of a CSV file to write with one row per account, with the columns name, account_id, credits, credits_used, users, threshold, low_balance and error
+            - Rows are written in the order the accounts are retrieved. The file is written on the host running the module, which is the controller when delegated to localhost, and is not written in check mode.
+            - The file is only replaced, and the task only reports changed, when its rows differ from the existing file, in any order.
+        type: path
+        required: false
+
+extends_documentation_fragment:
+    - mciecior.duo.duo.account_cache
+    - mciecior.duo.duo.rate_limit
+    - mciecior.duo.duo.workers
+
+author:
+    - Mark Ciecior (mciecior@carrieraccessit.com)
+'''
+
+EXAMPLES = '''
+# List the accounts below their own credit warning
+- name: Check telephony credits
+  duo_telephony_report:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    workers: 32
+  delegate_to: localhost
+  register: credits
+
+- name: Warn about low balances
+  debug:
+    msg: "{{ item.name }} has {{ item.credits }} credits left"
+  loop: "{{ credits.low_balance }}"
+
+# Monthly usage report of a few customers
+- name: Telephony usage report
+  duo_telephony_report:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    accounts:
+      - Awesome Test Account
+      - Another Test Account
+    low_balance: 500
+    dest: /srv/reports/telephony.csv
+  delegate_to: localhost
+'''
+
+RETURN = '''
+count:
+    description: Number of child accounts whose credits were retrieved
+    type: int
+    returned: always
+
+credits:
+    description: Telephony credits remaining, summed over every account
+    type: int
+    returned: always
+
+credits_used:
+    description: Telephony credits used between mintime and maxtime, summed over every account
+    type: int
+    returned: always
+
+users:
+    description: Number of users, summed over every account
+    type: int
+    returned: always
+
+mintime:
+    description: Start of the window of credits_used, in milliseconds since the epoch
+    type: int
+    returned: always
+
+maxtime:
+    description: End of the window of credits_used, in milliseconds since the epoch
+    type: int
+    returned: always
+
+low_balance:
+    description: The accounts with fewer credits remaining than their threshold, fewest first
+    type: list
+    returned: always
+    contains:
+        name:
+            description: Name of the child account
+            type: str
+        account_id:
+            description: The Duo-assigned account_id of the child account
+            type: str
+        credits:
+            description: Telephony credits remaining
+            type: int
+        credits_used:
+            description: Telephony credits used between mintime and maxtime
+            type: int
+        threshold:
+            description: low_balance, or the telephony_warning_min of the account, or 1 if that is 0
+            type: int
+
+failed_accounts:
+    description: Names of the child accounts whose credits could not be retrieved
+    type: list
+    returned: always
+
+dest:
+    description: Path of the CSV file, if dest is set
+    type: str
+    returned: when dest is set
+
+duo_metrics:
+    description:
+        - Duo API calls made by the task, with the totals below for all calls and again per endpoint (C(endpoints)) and per child account (C(accounts))
+        - Times are in seconds. A call includes its rate limit waits and retries.
+    type: dict
+    returned: when the task called the Duo API
+    contains:
+        calls:
+            description: Number of calls
+            type: int
+        bytes_sent:
+            description: Bytes of request bodies sent
+            type: int
+        bytes_received:
+            description: Bytes of responses received
+            type: int
+        p50:
+            description: Median call latency
+            type: float
+        p95:
+            description: 95th percentile call latency
+            type: float
+        rate_limit_wait:
+            description: Time spent waiting on the rate limit and before retrying HTTP 429 responses
+            type: float
+        endpoints:
+            description: The same totals for every endpoint, such as C(GET /admin/v1/settings)
+            type: dict
+        accounts:
+            description: The same totals for every child account_id, or C(parent) for the parent account
+            type: dict
+    sample: {"calls": 2, "errors": 0, "bytes_sent": 0, "bytes_received": 1530, "time": 0.412, "p50": 0.198, "p95": 0.214, "max": 0.214,
+             "retries": 0, "rate_limited": 0, "rate_limit_wait": 0.0, "endpoints": {}, "accounts": {}}
+'''
+
+import asyncio
+import csv
+import os
+import tempfile
+import time
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.accounts import ChildAccountIndex, account_cache_argument_spec
+from ..module_utils.api import accounts_client, api_argument_spec
+from ..module_utils.engine import async_client, run_async
+from ..module_utils.workers import workers_argument_spec
+
+
+CSV_COLUMNS = ['name', 'account_id', 'credits', 'credits_used', 'users', 'threshold', 'low_balance', 'error']
+
+
+def same_rows(path, other):
+    '''
+    Returns whether the CSV files in path and other have the same header and
+    the same rows, in any order
+    '''
+    try:
+        with open(path, newline='') as a, open(other, newline='') as b:
+            return a.readline() == b.readline() and sorted(a) == sorted(b)
+    except (IOError, OSError):
+        return False
+
+
+async def account_credits(api, account_id, mintime, maxtime, low_balance=None):
+    '''
+    Returns the credits remaining, credits used, number of users and low
+    balance threshold of one child account, retrieved concurrently
+    '''
+    calls = [
+        api.json_api_call('GET', '/admin/v1/info/summary', {}, account_id),
+        api.json_api_call('GET', '/admin/v1/info/telephony_credits_used', dict(mintime=str(mintime), maxtime=str(maxtime)), account_id),
+    ]
+    if low_balance is None:
+        calls.append(api.json_api_call('GET', '/admin/v1/settings', {}, account_id))
+    responses = await asyncio.gather(*calls)
+    summary, used = responses[0], responses[1]
+    if low_balance is None:
+        # Without a warning threshold, only an account with no credits is low
+        low_balance = responses[2].get('telephony_warning_min') or 1
+    return dict(
+        credits=summary.get('telephony_credits_remaining', 0),
+        credits_used=used.get('telephony_credits_used', 0),
+        users=summary.get('user_count', 0),
+        threshold=low_balance,
+    )
+
+
+def run_module(module_class=AnsibleModule):
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        ikey=dict(type='str', required=True),
+        skey=dict(type='str', required=True, no_log=True),
+        host=dict(type='str', required=True),
+        accounts=dict(type='list', elements='str', required=False, default=['all']),
+        days=dict(type='int', required=False, default=30),
+        low_balance=dict(type='int', required=False),
+        dest=dict(type='path', required=False)
+    )
+    module_args.update(account_cache_argument_spec())
+    module_args.update(api_argument_spec())
+    module_args.update(workers_argument_spec())
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # change is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        count=0,
+        credits=0,
+        credits_used=0,
+        users=0,
+        mintime=None,
+        maxtime=None,
+        low_balance=[],
+        failed_accounts=[]
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = module_class(
+        argument_spec=module_args,
+        supports_check_mode=True
+    )
+
+    # manipulate or modify the state as needed (this is going to be the
+    # part where your module will do what it needs to do)
+    names = module.params.get('accounts')
+    low_balance = module.params.get('low_balance')
+    dest = module.params.get('dest')
+    result['maxtime'] = int(time.time() * 1000)
+    result['mintime'] = result['maxtime'] - module.params.get('days') * 24 * 60 * 60 * 1000
+
+    accounts_api = accounts_client(module)
+    try:
+        index = ChildAccountIndex.from_module(module, accounts_api).index
+    except Exception as e:
+        module.fail_json(msg='Could not retrieve child accounts: {}'.format(str(e)), **result)
+    if names == ['all']:
+        names = list(index)
+    missing = [n for n in names if n not in index]
+    if missing:
+        module.fail_json(msg='Could not find child accounts: {}'.format(', '.join(missing)), **result)
+    accounts = sorted((n, index[n][0]) for n in set(names))
+
+    '''
+    Retrieve every account concurrently, adding each to the totals, and to
+    the CSV file, as it arrives
+    '''
+    writer = None
+    f = None
+    if dest:
+        # in check mode the rows are written to a temporary file, only to
+        # compare them with dest
+        try:
+            if module.check_mode:
+                fd, part = tempfile.mkstemp(prefix='duo_telephony_report-', suffix='.csv')
+            else:
+                part = dest + '.part'
+                fd = os.open(part, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            f = os.fdopen(fd, 'w', newline='')
+        except (IOError, OSError) as e:
+            module.fail_json(msg='Could not write {}: {}'.format(dest, str(e)), **result)
+        writer = csv.DictWriter(f, CSV_COLUMNS)
+        writer.writeheader()
+
+    async def retrieve(api, account):
+        return await account_credits(api, account[1], result['mintime'], result['maxtime'], low_balance)
+
+    def retrieved(account, credits, error):
+        name, account_id = account
+        if error is not None:
+            result['failed_accounts'].append(name)
+            if writer is not None:
+                writer.writerow(dict(name=name, account_id=account_id, error=str(error)))
+            return
+        result['count'] += 1
+        result['credits'] += credits['credits']
+        result['credits_used'] += credits['credits_used']
+        result['users'] += credits['users']
+        low = credits['credits'] < credits['threshold']
+        if low:
+            result['low_balance'].append(dict(name=name, account_id=account_id, credits=credits['credits'],
+                                              credits_used=credits['credits_used'], threshold=credits['threshold']))
+        if writer is not None:
+            writer.writerow(dict(credits, name=name, account_id=account_id, low_balance=low))
+
+    try:
+        run_async(async_client(module), retrieve, accounts, on_result=retrieved)
+    finally:
+        if f is not None:
+            f.close()
+    if f is not None:
+        try:
+            result['changed'] = not same_rows(part, dest)
+            if result['changed'] and not module.check_mode:
+                os.replace(part, dest)
+            else:
+                os.remove(part)
+        except (IOError, OSError) as e:
+            module.fail_json(msg='Could not write {}: {}'.format(dest, str(e)), **result)
+        result['dest'] = dest
+
+    result['low_balance'].sort(key=lambda a: (a['credits'], a['name']))
+    result['failed_accounts'] = sorted(result['failed_accounts'])
+    if result['failed_accounts']:
+        module.fail_json(msg='Could not retrieve {} of {} child accounts'.format(
+            len(result['failed_accounts']), len(accounts)), **result)
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
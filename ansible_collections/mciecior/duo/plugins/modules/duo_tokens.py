@@ -0,0 +1,426 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+module: duo_tokens
+
+short_description: Import the hardware tokens of a Duo account from a CSV or YAML file.
+
+version_added: "2.9"
+
+description:
+    - "This is used by MSPs to register a box of OTP hardware tokens shipped to a customer, and optionally assign them to users, in a single task"
+    - "The existing tokens of the account are retrieved once, and tokens whose serial is already present are skipped"
+    - "The input file is read one token at a time and the tokens are created concurrently as it is read, so files of any size are imported in constant memory"
+
+options:
+    ikey:
+        description:
+            - Integration Key for the Duo Admin API application
+        type: str
+        required: true
+    skey:
+        description:
+            - Secret Key for the Duo Admin API application
+        type: str
+        required: true
+    host:
+        description:
+            - API Host for the Duo Admin API application
+        type: str
+        required: true
+    name:
+        description:
+            - Name of the child account to manage. If omitted, the tokens of the parent account are managed.
+        type: str
+        required: false
+    account_id:
+        description:
+            - Duo-provided ID of the child account to manage, for example from the mciecior.duo.duo_accounts inventory plugin
+            - Skips resolving the child account by name. Mutually exclusive with name.
+        type: str
+        required: false
+    src:
+        description:
+            - Path of a CSV file with a header row, or of a YAML (or JSON) list, holding one token per row or item, such as the seed file shipped with the tokens
+            - Every token has a serial and optionally a type, and the fields its type requires, secret for C(h6), C(h8), C(t6) and C(t8) tokens and private_id and aes_key for C(yk) tokens.
+            - A token may also set counter (HOTP), totp_step (TOTP) and the username of the user to assign it to.
+            - The file is read on the host running the module, which is the controller when delegated to localhost.
+            - Mutually exclusive with tokens.
+        type: path
+        required: false
+    format:
+        description:
+            - Format of src. C(auto) reads files ending in .csv as CSV and any other file as YAML.
+        type: str
+        required: false
+        default: auto
+        choices: ['auto', 'csv', 'yaml']
+    tokens:
+        description:
+            - List of tokens, with the same fields as the rows of src
+            - Mutually exclusive with src.
+        type: list
+        elements: dict
+        required: false
+        suboptions:
+            serial:
+                description:
+                    - Serial number of the token
+                type: str
+            type:
+                description:
+                    - Type of the token. Defaults to type.
+                type: str
+                choices: ['h6', 'h8', 't6', 't8', 'yk']
+            secret:
+                description:
+                    - HOTP or TOTP secret, in hex, of C(h6), C(h8), C(t6) and C(t8) tokens
+                type: str
+            counter:
+                description:
+                    - Initial counter of HOTP tokens
+                type: int
+            totp_step:
+                description:
+                    - Time step of TOTP tokens, in seconds
+                type: int
+            private_id:
+                description:
+                    - Private ID, in hex, of C(yk) tokens
+                type: str
+            aes_key:
+                description:
+                    - AES key, in hex, of C(yk) tokens
+                type: str
+            username:
+                description:
+                    - Username of the user to assign the token to
+                type: str
+    type:
+        description:
+            - Type of the tokens that do not set one
+        type: str
+        required: false
+        default: h6
+        choices: ['h6', 'h8', 't6', 't8', 'yk']
+
+extends_documentation_fragment:
+    - mciecior.duo.duo.account_cache
+    - mciecior.duo.duo.rate_limit
+    - mciecior.duo.duo.workers
+
+author:
+    - Mark Ciecior (mciecior@carrieraccessit.com)
+'''
+
+EXAMPLES = '''
+# Register a box of HOTP tokens from the vendor seed file
+# serial,secret,counter
+# 1000001,3132333435363738393031323334353637383930,0
+- name: Import tokens
+  duo_tokens:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    name: Awesome Test Account
+    src: /srv/tokens/awesome-box-17.csv
+    workers: 32
+  delegate_to: localhost
+
+# Register TOTP tokens and hand them out in the same pass
+- name: Import and assign tokens
+  duo_tokens:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    account_id: "{{ account_id }}"
+    type: t6
+    tokens:
+      - serial: "2000001"
+        secret: "{{ vault_token_secrets['2000001'] }}"
+        username: jdoe
+  delegate_to: localhost
+'''
+
+RETURN = '''
+account_id:
+    description: The Duo-assigned account_id of the child account, or null for the parent account
+    type: str
+    returned: always
+
+rows:
+    description: Number of tokens read from src or tokens
+    type: int
+    returned: always
+
+created:
+    description: Number of tokens that were (or in check mode would be) created
+    type: int
+    returned: always
+
+assigned:
+    description: Number of tokens that were (or in check mode would be) assigned to a user
+    type: int
+    returned: always
+
+skipped:
+    description: Number of tokens that were already present, and assigned to their user if they set one
+    type: int
+    returned: always
+
+errors:
+    description: One entry for every token that could not be read, created or assigned
+    type: list
+    returned: always
+    contains:
+        row:
+            description: Position of the token in src or tokens, starting at 1, or null if src could not be read
+            type: int
+        serial:
+            description: The serial, if the row has one
+            type: str
+        action:
+            description: C(read), C(create) or C(assign)
+            type: str
+        msg:
+            description: What went wrong
+            type: str
+
+duo_metrics:
+    description:
+        - Duo API calls made by the task, with the totals below for all calls and again per endpoint (C(endpoints)) and per child account (C(accounts))
+        - Times are in seconds. A call includes its rate limit waits and retries.
+    type: dict
+    returned: when the task called the Duo API
+    contains:
+        calls:
+            description: Number of calls
+            type: int
+        bytes_sent:
+            description: Bytes of request bodies sent
+            type: int
+        bytes_received:
+            description: Bytes of responses received
+            type: int
+        p50:
+            description: Median call latency
+            type: float
+        p95:
+            description: 95th percentile call latency
+            type: float
+        rate_limit_wait:
+            description: Time spent waiting on the rate limit and before retrying HTTP 429 responses
+            type: float
+        endpoints:
+            description: The same totals for every endpoint, such as C(GET /admin/v1/settings)
+            type: dict
+        accounts:
+            description: The same totals for every child account_id, or C(parent) for the parent account
+            type: dict
+    sample: {"calls": 2, "errors": 0, "bytes_sent": 0, "bytes_received": 1530, "time": 0.412, "p50": 0.198, "p95": 0.214, "max": 0.214,
+             "retries": 0, "rate_limited": 0, "rate_limit_wait": 0.0, "endpoints": {}, "accounts": {}}
+'''
+
+import asyncio
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.accounts import account_cache_argument_spec, resolve_account
+from ..module_utils.api import api_argument_spec
+from ..module_utils.engine import async_client, run_async
+from ..module_utils.records import RECORD_FORMATS, read_records
+from ..module_utils.tokens import TOKEN_FIELDS, TOKEN_TYPES, assign_token, token_index, token_key
+from ..module_utils.users import user_index, user_key
+from ..module_utils.workers import workers_argument_spec
+
+
+def check_token(record, default_type):
+    '''
+    Returns why a token read from the input is invalid, or None
+    '''
+    if not isinstance(record, dict):
+        return 'expected a mapping, not {}'.format(type(record).__name__)
+    if not str(record.get('serial') or '').strip():
+        return 'serial is required'
+    unknown = sorted(set(record) - set(TOKEN_FIELDS) - set(['serial', 'type', 'username']))
+    if unknown:
+        return 'unsupported fields: {}'.format(', '.join(unknown))
+    token_type = record.get('type') or default_type
+    if token_type not in TOKEN_TYPES:
+        return 'type must be one of {}, not {}'.format(sorted(TOKEN_TYPES), token_type)
+    return None
+
+
+def plan_tokens(module, index, result):
+    '''
+    Yields the tokens to create, and the existing tokens to assign to a
+    user, as the input is read. Tokens that cannot be read and tokens that
+    are already present with nothing to assign are counted in result.
+    '''
+    src = module.params.get('src')
+    default_type = module.params.get('type')
+    seen = set()
+    source = read_records(src, module.params.get('format')) if src else module.params.get('tokens')
+    try:
+        for row, record in enumerate(source, 1):
+            result['rows'] += 1
+            error = check_token(record, default_type)
+            serial = str(record.get('serial') or '').strip() if isinstance(record, dict) else None
+            key = token_key(record.get('type') or default_type, serial) if serial else None
+            current = index.get(key)
+            if error is None and key in seen:
+                error = 'serial {} is listed more than once'.format(serial)
+            if error is None and current is None:
+                # Only a token that is created needs its secret
+                missing = [k for k in TOKEN_TYPES[key[0]] if not record.get(k)]
+                if missing:
+                    error = '{} tokens require {}'.format(key[0], ', '.join(missing))
+            if key:
+                seen.add(key)
+            if error is not None:
+                result['errors'].append(dict(row=row, serial=serial or None, action='read', msg=error))
+                continue
+            username = str(record.get('username') or '').strip() or None
+            if current is not None and username is None:
+                result['skipped'] += 1
+                continue
+            fields = dict((k, str(v)) for k, v in record.items() if k in TOKEN_FIELDS and v is not None)
+            yield dict(action='create' if current is None else 'assign', row=row, serial=serial, type=key[0],
+                       fields=fields, username=username, token=current)
+    except (IOError, OSError, ValueError) as e:
+        result['errors'].append(dict(row=None, serial=None, action='read', msg=str(e)))
+
+
+def run_module(module_class=AnsibleModule):
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        ikey=dict(type='str', required=True),
+        skey=dict(type='str', required=True, no_log=True),
+        host=dict(type='str', required=True),
+        name=dict(type='str', required=False),
+        account_id=dict(type='str', required=False),
+        src=dict(type='path', required=False),
+        format=dict(type='str', required=False, default='auto', choices=RECORD_FORMATS),
+        tokens=dict(type='list', elements='dict', required=False, options=dict(
+            serial=dict(type='str', required=False),
+            type=dict(type='str', required=False, choices=sorted(TOKEN_TYPES)),
+            secret=dict(type='str', required=False, no_log=True),
+            counter=dict(type='int', required=False),
+            totp_step=dict(type='int', required=False),
+            private_id=dict(type='str', required=False, no_log=True),
+            aes_key=dict(type='str', required=False, no_log=True),
+            username=dict(type='str', required=False),
+        )),
+        type=dict(type='str', required=False, default='h6', choices=sorted(TOKEN_TYPES))
+    )
+    module_args.update(account_cache_argument_spec())
+    module_args.update(api_argument_spec())
+    module_args.update(workers_argument_spec())
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # change is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        account_id=None,
+        rows=0,
+        created=0,
+        assigned=0,
+        skipped=0,
+        errors=[]
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = module_class(
+        argument_spec=module_args,
+        mutually_exclusive=[['name', 'account_id'], ['src', 'tokens']],
+        required_one_of=[['src', 'tokens']],
+        supports_check_mode=True
+    )
+
+    # manipulate or modify the state as needed (this is going to be the
+    # part where your module will do what it needs to do)
+    account_id = resolve_account(module, result)
+    result['account_id'] = account_id
+    api = async_client(module)
+
+    '''
+    Retrieve the existing tokens once
+    '''
+    try:
+        index = api.run(token_index(api, account_id))
+    except Exception as e:
+        module.fail_json(msg='Could not retrieve list of tokens: {}'.format(str(e)), **result)
+
+    users = []
+
+    async def user_id(username):
+        '''
+        Returns the user_id of username, retrieving the users of the account
+        once, when the first token to assign is reached
+        '''
+        if not users:
+            users.append(asyncio.ensure_future(user_index(api, account_id, fields=[])))
+        user = (await users[0]).get(user_key(username))
+        if user is None:
+            raise ValueError('Could not find user {}'.format(username))
+        return user[0]
+
+    '''
+    Create every token, and assign it to its user, as the input is read
+    '''
+    async def apply(api, op):
+        created = op['action'] == 'create'
+        if created:
+            if not module.check_mode:
+                params = dict(op['fields'], type=op['type'], serial=op['serial'])
+                op['token'] = ((await api.json_api_call('POST', '/admin/v1/tokens', params, account_id))['token_id'], set())
+            result['created'] += 1
+        if op['username'] is None:
+            return op['action']
+        # the token is kept if its user cannot be found, and the failure is
+        # reported as an assign error
+        op['action'] = 'assign'
+        assign_to = await user_id(op['username'])
+        if not created and assign_to in op['token'][1]:
+            return 'skipped'
+        if not module.check_mode:
+            await assign_token(api, op['token'][0], assign_to, account_id)
+        result['assigned'] += 1
+        return op['action']
+
+    def applied(op, resp, error):
+        if error is not None:
+            result['errors'].append(dict(row=op['row'], serial=op['serial'], action=op['action'], msg=str(error)))
+        elif resp == 'skipped':
+            result['skipped'] += 1
+
+    run_async(api, apply, plan_tokens(module, index, result), on_result=applied)
+
+    result['errors'].sort(key=lambda e: (e['row'] is None, e['row'] or 0, e['serial'] or ''))
+    result['changed'] = bool(result['created'] or result['assigned'])
+    if result['errors']:
+        module.fail_json(msg='Could not import every token, {} errors'.format(len(result['errors'])), **result)
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,387 @@
+#!/usr/bin/python
+
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+ANSIBLE_METADATA = {
+    'metadata_version': '1.1',
+    'status': ['preview'],
+    'supported_by': 'community'
+}
+
+DOCUMENTATION = '''
+---
+module: duo_users
+
+short_description: Synchronize the users of a Duo account from a CSV or YAML file.
+
+version_added: "2.9"
+
+description:
+    - "This is used by MSPs to load the users of a new customer, or to keep them in sync with another directory, in a single task"
+    - "The existing users of the account are retrieved once, and the users to create, update and delete are computed from the input as it is read"
+    - "The input file is read one user at a time and the writes run concurrently as it is read, so files of any size are synchronized in constant memory"
+
+options:
+    ikey:
+        description:
+            - Integration Key for the Duo Admin API application
+        type: str
+        required: true
+    skey:
+        description:
+            - Secret Key for the Duo Admin API application
+        type: str
+        required: true
+    host:
+        description:
+            - API Host for the Duo Admin API application
+        type: str
+        required: true
+    name:
+        description:
+            - Name of the child account to manage. If omitted, the users of the parent account are managed.
+        type: str
+        required: false
+    account_id:
+        description:
+            - Duo-provided ID of the child account to manage, for example from the mciecior.duo.duo_accounts inventory plugin
+            - Skips resolving the child account by name. Mutually exclusive with name.
+        type: str
+        required: false
+    src:
+        description:
+            - Path of a CSV file with a header row, or of a YAML (or JSON) list, holding one user per row or item
+            - Every user has a username and optionally a state of C(present) or C(absent), and any of realname, email, status, notes, firstname, lastname and alias1 to alias4.
+            - Only the fields that are set are compared and updated. An empty CSV cell leaves the field unchanged.
+            - The file is read on the host running the module, which is the controller when delegated to localhost.
+            - Mutually exclusive with users.
+        type: path
+        required: false
+    format:
+        description:
+            - Format of src. C(auto) reads files ending in .csv as CSV and any other file as YAML.
+        type: str
+        required: false
+        default: auto
+        choices: ['auto', 'csv', 'yaml']
+    users:
+        description:
+            - List of users, with the same fields as the rows of src
+            - Mutually exclusive with src.
+        type: list
+        elements: dict
+        required: false
+    purge:
+        description:
+            - Delete every user of the account that is not in src or users
+            - Nothing is deleted if src cannot be read to the end, or if no user could be read from src or users.
+        type: bool
+        required: false
+        default: false
+
+extends_documentation_fragment:
+    - mciecior.duo.duo.account_cache
+    - mciecior.duo.duo.rate_limit
+    - mciecior.duo.duo.workers
+
+author:
+    - Mark Ciecior (mciecior@carrieraccessit.com)
+'''
+
+EXAMPLES = '''
+# Onboard the users of a new customer from a CSV export
+# username,realname,email,status
+# jdoe,Jane Doe,jdoe@example.com,active
+- name: Load customer users
+  duo_users:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    name: Awesome Test Account
+    src: /srv/onboarding/awesome-users.csv
+    workers: 32
+  delegate_to: localhost
+
+# Keep the users of a child account in sync with a directory export,
+# removing everyone who is no longer in it
+- name: Sync users
+  duo_users:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    account_id: "{{ account_id }}"
+    src: "/srv/exports/{{ inventory_hostname }}.yml"
+    purge: true
+  delegate_to: localhost
+
+# Disable one user and remove another
+- name: Offboard users
+  duo_users:
+    ikey: ABCDEFGH
+    skey: ABCDEFGH12345678
+    host: api-123XYZ.duosecurity.com
+    name: Awesome Test Account
+    users:
+      - username: jdoe
+        status: disabled
+      - username: jsmith
+        state: absent
+'''
+
+RETURN = '''
+account_id:
+    description: The Duo-assigned account_id of the child account, or null for the parent account
+    type: str
+    returned: always
+
+rows:
+    description: Number of users read from src or users
+    type: int
+    returned: always
+
+created:
+    description: Number of users that were (or in check mode would be) created
+    type: int
+    returned: always
+
+updated:
+    description: Number of users that were (or in check mode would be) updated
+    type: int
+    returned: always
+
+deleted:
+    description: Number of users that were (or in check mode would be) deleted
+    type: int
+    returned: always
+
+unchanged:
+    description: Number of users that already matched
+    type: int
+    returned: always
+
+errors:
+    description: One entry for every user that could not be read, created, updated or deleted
+    type: list
+    returned: always
+    contains:
+        row:
+            description: Position of the user in src or users, starting at 1, or null for a user deleted by purge
+            type: int
+        username:
+            description: The username, if the row has one
+            type: str
+        action:
+            description: C(read), C(create), C(update) or C(delete)
+            type: str
+        msg:
+            description: What went wrong
+            type: str
+
+duo_metrics:
+    description:
+        - Duo API calls made by the task, with the totals below for all calls and again per endpoint (C(endpoints)) and per child account (C(accounts))
+        - Times are in seconds. A call includes its rate limit waits and retries.
+    type: dict
+    returned: when the task called the Duo API
+    contains:
+        calls:
+            description: Number of calls
+            type: int
+        bytes_sent:
+            description: Bytes of request bodies sent
+            type: int
+        bytes_received:
+            description: Bytes of responses received
+            type: int
+        p50:
+            description: Median call latency
+            type: float
+        p95:
+            description: 95th percentile call latency
+            type: float
+        rate_limit_wait:
+            description: Time spent waiting on the rate limit and before retrying HTTP 429 responses
+            type: float
+        endpoints:
+            description: The same totals for every endpoint, such as C(GET /admin/v1/settings)
+            type: dict
+        accounts:
+            description: The same totals for every child account_id, or C(parent) for the parent account
+            type: dict
+    sample: {"calls": 2, "errors": 0, "bytes_sent": 0, "bytes_received": 1530, "time": 0.412, "p50": 0.198, "p95": 0.214, "max": 0.214,
+             "retries": 0, "rate_limited": 0, "rate_limit_wait": 0.0, "endpoints": {}, "accounts": {}}
+'''
+
+from ansible.module_utils.basic import AnsibleModule
+from ..module_utils.accounts import account_cache_argument_spec, resolve_account
+from ..module_utils.api import api_argument_spec
+from ..module_utils.diff import changed_values, settings_diff
+from ..module_utils.engine import async_client, run_async
+from ..module_utils.records import RECORD_FORMATS, read_records
+from ..module_utils.users import USER_FIELDS, USER_STATUSES, user_index, user_key
+from ..module_utils.workers import workers_argument_spec
+
+
+def check_user(record):
+    '''
+    Returns why a user read from the input is invalid, or None
+    '''
+    if not isinstance(record, dict):
+        return 'expected a mapping, not {}'.format(type(record).__name__)
+    if not str(record.get('username') or '').strip():
+        return 'username is required'
+    unknown = sorted(set(record) - set(USER_FIELDS) - set(['username', 'state']))
+    if unknown:
+        return 'unsupported fields: {}'.format(', '.join(unknown))
+    if record.get('state', 'present') not in ('present', 'absent'):
+        return "state must be present or absent, not {}".format(record['state'])
+    if record.get('status') is not None and record['status'] not in USER_STATUSES:
+        return 'status must be one of {}, not {}'.format(USER_STATUSES, record['status'])
+    return None
+
+
+def plan_users(module, index, result):
+    '''
+    Yields the create, update and delete of every user as the input is
+    read, then the deletes of purge. Users that cannot be read and users
+    that already match are counted in result.
+    '''
+    src = module.params.get('src')
+    seen = set()
+    complete = True
+    source = read_records(src, module.params.get('format')) if src else module.params.get('users')
+    try:
+        for row, record in enumerate(source, 1):
+            result['rows'] += 1
+            error = check_user(record)
+            username = str(record.get('username') or '').strip() if isinstance(record, dict) else None
+            key = user_key(username) if username else None
+            if error is None and key in seen:
+                error = 'username {} is listed more than once'.format(username)
+            if key:
+                seen.add(key)
+            if error is not None:
+                result['errors'].append(dict(row=row, username=username or None, action='read', msg=error))
+                continue
+            current = index.get(key)
+            if record.get('state') == 'absent':
+                if current is not None:
+                    yield dict(action='delete', row=row, username=current[1], user_id=current[0])
+                else:
+                    result['unchanged'] += 1
+                continue
+            fields = dict((k, str(v)) for k, v in record.items() if k in USER_FIELDS and v is not None)
+            if current is None:
+                yield dict(action='create', row=row, username=username, fields=fields)
+                continue
+            diff = settings_diff(fields, current[2])
+            if diff:
+                yield dict(action='update', row=row, username=current[1], user_id=current[0], fields=changed_values(diff))
+            else:
+                result['unchanged'] += 1
+    except (IOError, OSError, ValueError) as e:
+        complete = False
+        result['errors'].append(dict(row=None, username=None, action='read', msg=str(e)))
+
+    if module.params.get('purge') and complete and not seen:
+        # an empty or unreadable input would otherwise delete every user
+        result['errors'].append(dict(row=None, username=None, action='read',
+                                     msg='No users were read, refusing to purge every user of the account'))
+    elif module.params.get('purge') and complete:
+        for key, (user_id, username, fields) in index.items():
+            if key not in seen:
+                yield dict(action='delete', row=None, username=username, user_id=user_id)
+
+
+def run_module(module_class=AnsibleModule):
+    # define available arguments/parameters a user can pass to the module
+    module_args = dict(
+        ikey=dict(type='str', required=True),
+        skey=dict(type='str', required=True, no_log=True),
+        host=dict(type='str', required=True),
+        name=dict(type='str', required=False),
+        account_id=dict(type='str', required=False),
+        src=dict(type='path', required=False),
+        format=dict(type='str', required=False, default='auto', choices=RECORD_FORMATS),
+        users=dict(type='list', elements='dict', required=False),
+        purge=dict(type='bool', required=False, default=False)
+    )
+    module_args.update(account_cache_argument_spec())
+    module_args.update(api_argument_spec())
+    module_args.update(workers_argument_spec())
+
+    # seed the result dict in the object
+    # we primarily care about changed and state
+    # change is if this module effectively modified the target
+    # state will include any data that you want your module to pass back
+    # for consumption, for example, in a subsequent task
+    result = dict(
+        changed=False,
+        account_id=None,
+        rows=0,
+        created=0,
+        updated=0,
+        deleted=0,
+        unchanged=0,
+        errors=[]
+    )
+
+    # the AnsibleModule object will be our abstraction working with Ansible
+    # this includes instantiation, a couple of common attr would be the
+    # args/params passed to the execution, as well as if the module
+    # supports check mode
+    module = module_class(
+        argument_spec=module_args,
+        mutually_exclusive=[['name', 'account_id'], ['src', 'users']],
+        required_one_of=[['src', 'users']],
+        supports_check_mode=True
+    )
+
+    # manipulate or modify the state as needed (this is going to be the
+    # part where your module will do what it needs to do)
+    account_id = resolve_account(module, result)
+    result['account_id'] = account_id
+    api = async_client(module)
+
+    '''
+    Retrieve the existing users once
+    '''
+    try:
+        index = api.run(user_index(api, account_id))
+    except Exception as e:
+        module.fail_json(msg='Could not retrieve list of users: {}'.format(str(e)), **result)
+
+    '''
+    Apply every create, update and delete as the input is read
+    '''
+    async def apply(api, op):
+        if module.check_mode:
+            return None
+        if op['action'] == 'create':
+            return await api.json_api_call('POST', '/admin/v1/users', dict(op['fields'], username=op['username']), account_id)
+        if op['action'] == 'update':
+            return await api.json_api_call('POST', '/admin/v1/users/{}'.format(op['user_id']), op['fields'], account_id)
+        return await api.json_api_call('DELETE', '/admin/v1/users/{}'.format(op['user_id']), {}, account_id)
+
+    def applied(op, resp, error):
+        if error is not None:
+            result['errors'].append(dict(row=op['row'], username=op['username'], action=op['action'], msg=str(error)))
+        else:
+            result[op['action'] + 'd'] += 1
+
+    run_async(api, apply, plan_users(module, index, result), on_result=applied)
+
+    result['errors'].sort(key=lambda e: (e['row'] is None, e['row'] or 0, e['username'] or ''))
+    result['changed'] = bool(result['created'] or result['updated'] or result['deleted'])
+    if result['errors']:
+        module.fail_json(msg='Could not synchronize every user, {} errors'.format(len(result['errors'])), **result)
+    module.exit_json(**result)
+
+
+def main():
+    run_module()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+from copy import deepcopy
+from functools import partial
+
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible.module_utils.errors import UnsupportedError
+from ansible.module_utils.common.parameters import remove_values
+from ansible.plugins.action import ActionBase
+
+
+NO_LOG_PLACEHOLDER = 'VALUE_SPECIFIED_IN_NO_LOG_PARAMETER'
+
+
+class ModuleExit(BaseException):
+    """
+    Carries the result of exit_json()/fail_json() out of the module, like
+    the SystemExit of AnsibleModule, so the modules' own except Exception
+    blocks never catch it.
+    """
+
+    def __init__(self, result):
+        super(ModuleExit, self).__init__()
+        self.result = result
+
+
+class ControllerModule(object):
+    """
+    Stands in for AnsibleModule when a Duo module runs inside its action plugin.
+
+    Arguments are validated against the module's own argument_spec, and
+    exit_json()/fail_json() raise ModuleExit with the result instead of
+    printing it and exiting the process.
+    """
+
+    def __init__(self, argument_spec, mutually_exclusive=None, required_together=None,
+                 required_one_of=None, required_if=None, required_by=None,
+                 supports_check_mode=False, name=None, args=None, check_mode=False, diff=False,
+                 socket_path=None):
+        self.argument_spec = argument_spec
+        self._socket_path = socket_path
+        self.check_mode = bool(check_mode and supports_check_mode)
+        self._diff = diff
+        self._warnings = []
+        validator = ArgumentSpecValidator(
+            argument_spec,
+            mutually_exclusive=mutually_exclusive,
+            required_together=required_together,
+            required_one_of=required_one_of,
+            required_if=required_if,
+            required_by=required_by,
+        )
+        validated = validator.validate(deepcopy(args or {}))
+        self.params = validated.validated_parameters
+        self._no_log_values = validated._no_log_values
+        for warning in validated._warnings:
+            self.warn('Both option {option} and its alias {alias} are set.'.format(**warning))
+        if validated.error_messages:
+            msg = validated.errors.msg
+            if isinstance(validated.errors[0], UnsupportedError):
+                msg = 'Unsupported parameters for ({}) module: {}'.format(name, msg)
+            self.fail_json(msg=msg)
+
+    def warn(self, warning):
+        self._warnings.append(warning)
+
+    def _result(self, kwargs):
+        module_args = dict(self.params)
+        for k, v in self.argument_spec.items():
+            if v.get('no_log') and module_args.get(k) is not None:
+                module_args[k] = NO_LOG_PLACEHOLDER
+        kwargs.setdefault('invocation', dict(module_args=module_args))
+        if self._warnings:
+            kwargs['warnings'] = list(self._warnings)
+        return remove_values(kwargs, self._no_log_values)
+
+    def exit_json(self, **kwargs):
+        raise ModuleExit(self._result(kwargs))
+
+    def fail_json(self, msg, **kwargs):
+        kwargs['failed'] = True
+        kwargs['msg'] = msg
+        raise ModuleExit(self._result(kwargs))
+
+
+class DuoActionBase(ActionBase):
+    """
+    Runs a Duo module inside the controller's worker process.
+
+    The modules only ever talk to the Duo cloud API, so when the task would
+    execute on the controller anyway (connection: local or
+    mciecior.duo.duo_api, or delegate_to: localhost) there is no need to
+    build an AnsiballZ payload and start a new Python interpreter. For any
+    other connection, or when duo_client cannot be imported on the
+    controller, the module is executed normally.
+    """
+
+    # The python module implementing the Duo module, or None if it could
+    # not be imported on the controller
+    MODULE = None
+
+    CONTROLLER_TRANSPORTS = ('local', 'mciecior.duo.duo_api')
+
+    def _runs_on_controller(self):
+        return self.MODULE is not None and getattr(self._connection, 'transport', None) in self.CONTROLLER_TRANSPORTS
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(DuoActionBase, self).run(tmp, task_vars)
+        del tmp
+
+        if not self._runs_on_controller():
+            result.update(self._execute_module(task_vars=task_vars))
+            return result
+
+        module_class = partial(
+            ControllerModule,
+            name=self._task.action,
+            args=self._task.args,
+            check_mode=self._task.check_mode,
+            diff=self._task.diff,
+            socket_path=getattr(self._connection, 'socket_path', None),
+        )
+        try:
+            self.MODULE.run_module(module_class)
+        except ModuleExit as e:
+            result.update(e.result)
+        return result
@@ -0,0 +1,73 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import importlib
+import os
+import pkgutil
+import sys
+from functools import partial
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+# The directory holding ansible_collections/, and the benchmarks with the mock server
+sys.path.insert(0, os.path.abspath(os.path.join(HERE, '..', '..', '..', '..', '..')))
+sys.path.insert(0, os.path.abspath(os.path.join(HERE, '..', '..', 'benchmarks')))
+
+from mock_duo import MockDuo, serve  # noqa: E402
+from ansible_collections.mciecior.duo.plugins import modules  # noqa: E402
+from ansible_collections.mciecior.duo.plugins.module_utils import api, engine  # noqa: E402
+from ansible_collections.mciecior.duo.plugins.plugin_utils.duo_action import ControllerModule, ModuleExit  # noqa: E402
+
+
+@pytest.fixture
+def mock_duo(monkeypatch, tmp_path):
+    '''
+    Serves a MockDuo and points the API clients of the modules at it. Returns
+    the MockDuo, with the args every module needs in its module_args.
+    '''
+    mock = MockDuo(accounts=3, integrations=2, users=5)
+    server = serve(mock)
+    port = server.server_address[1]
+    client = api._client
+    async_client = engine.async_client
+
+    def mock_client(cls, module, account_id=None):
+        c = client(cls, module, account_id)
+        c.ca_certs = 'HTTP'
+        c.port = port
+        return c
+
+    def mock_async_client(module):
+        c = async_client(module)
+        c.ssl = None
+        c.port = port
+        return c
+
+    monkeypatch.setattr(api, '_client', mock_client)
+    # the modules import async_client by name, so it is replaced in each of them
+    monkeypatch.setattr(engine, 'async_client', mock_async_client)
+    for info in pkgutil.iter_modules(modules.__path__):
+        module = importlib.import_module('{}.{}'.format(modules.__name__, info.name))
+        if hasattr(module, 'async_client'):
+            monkeypatch.setattr(module, 'async_client', mock_async_client)
+    monkeypatch.setenv('DUO_ACCOUNT_CACHE_DIR', str(tmp_path))
+    mock.port = port
+    mock.module_args = dict(ikey='DIXXXXXXXXXXXXXXXXXX', skey='mock-secret-key', host='127.0.0.1', account_cache_dir=str(tmp_path))
+    yield mock
+    server.shutdown()
+    server.server_close()
+
+
+def run_controller(module, check_mode=False, diff=False, **args):
+    '''
+    Returns the result of running module the way its action plugin does
+    '''
+    with pytest.raises(ModuleExit) as e:
+        module.run_module(partial(ControllerModule, name=module.__name__, args=args, check_mode=check_mode, diff=diff))
+    return e.value.result
+
+
+@pytest.fixture
+def controller():
+    return run_controller
@@ -0,0 +1,121 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import json
+
+import pytest
+
+from ansible import constants as C
+from ansible.plugins.loader import fragment_loader
+from ansible.utils.plugin_docs import get_docstring
+from ansible_collections.mciecior.duo.plugins.callback import duo_metrics
+from ansible_collections.mciecior.duo.plugins.modules import duo_admin_settings
+
+NAME = 'mciecior.duo.duo_metrics'
+
+
+class Result(object):
+
+    def __init__(self, result):
+        self._result = result
+
+
+class Display(object):
+
+    def __init__(self):
+        self.lines = []
+        self.warnings = []
+
+    def banner(self, msg):
+        self.lines.append(msg)
+
+    def display(self, msg):
+        self.lines.extend(msg.strip('\n').split('\n'))
+
+    def warning(self, msg):
+        self.warnings.append(msg)
+
+
+def metrics(calls, time, p95=0.1, rate_limited=0, endpoints=None, accounts=None):
+    return dict(calls=calls, errors=0, bytes_sent=0, bytes_received=100 * calls, time=time, p50=p95, p95=p95, max=p95,
+                retries=rate_limited, rate_limited=rate_limited, rate_limit_wait=float(rate_limited),
+                endpoints=endpoints or {}, accounts=accounts or {})
+
+
+@pytest.fixture(scope='module', autouse=True)
+def option_definitions():
+    C.config.initialize_plugin_configuration_definitions(
+        'callback', NAME, get_docstring(duo_metrics.__file__, fragment_loader)[0]['options'])
+
+
+@pytest.fixture
+def callback():
+    def make(**options):
+        callback = duo_metrics.CallbackModule()
+        callback._load_name = NAME
+        callback._display = Display()
+        callback.set_options(direct=options)
+        return callback
+    return make
+
+
+def test_aggregate(callback):
+    cb = callback()
+    cb.v2_runner_on_ok(Result(dict(duo_metrics=metrics(3, 0.6, p95=0.3, endpoints={
+        'GET /admin/v1/settings': metrics(2, 0.2), 'POST /admin/v1/settings': metrics(1, 0.4, p95=0.4)}, accounts={
+        'DA1': metrics(2, 0.5), 'DA2': metrics(1, 0.1)}))))
+    # loop items and failed tasks count too
+    cb.v2_runner_on_failed(Result(dict(results=[
+        dict(duo_metrics=metrics(2, 1.0, p95=0.9, rate_limited=1, endpoints={'GET /admin/v1/settings': metrics(2, 1.0)},
+                                 accounts={'DA2': metrics(2, 1.0, rate_limited=1)})),
+        dict(skipped=True),
+    ])))
+    cb.v2_runner_on_ok(Result(dict(changed=False)))
+    summary = cb.summary()
+    assert (summary['tasks'], summary['calls'], summary['time'], summary['p95']) == (2, 5, 1.6, 0.9)
+    assert (summary['mean'], summary['rate_limited'], summary['rate_limit_wait']) == (0.32, 1, 1.0)
+    assert [(e['endpoint'], e['calls']) for e in summary['endpoints']] == [('GET /admin/v1/settings', 4), ('POST /admin/v1/settings', 1)]
+    assert [(a['account_id'], a['time']) for a in summary['accounts']] == [('DA2', 1.1), ('DA1', 0.5)]
+
+
+def test_module_result(callback, mock_duo, controller):
+    cb = callback()
+    for i in range(2):
+        cb.v2_runner_on_ok(Result(controller(duo_admin_settings, name='account-1', state='query', **mock_duo.module_args)))
+    summary = cb.summary()
+    assert summary['tasks'] == 2
+    assert summary['calls'] == sum(mock_duo.stats.values())
+    assert 'DA00000001' in [a['account_id'] for a in summary['accounts']]
+    assert (summary['endpoints'][0]['endpoint'], summary['endpoints'][0]['calls']) == ('GET /admin/v1/settings', 2)
+
+
+def test_stats(callback, tmp_path):
+    cb = callback(top=1, output_file=str(tmp_path / 'metrics.json'))
+    cb.v2_runner_on_ok(Result(dict(duo_metrics=metrics(3, 0.6, endpoints={
+        'GET /admin/v1/settings': metrics(2, 0.2), 'POST /admin/v1/settings': metrics(1, 0.4)}, accounts={
+        'DA1': metrics(2, 0.5), 'DA2': metrics(1, 0.1)}))))
+    cb.v2_playbook_on_stats(None)
+    lines = cb._display.lines
+    assert lines[0] == 'DUO API METRICS'
+    assert lines[1].startswith('3 calls from 1 tasks')
+    assert [line.split()[0] for line in lines if line.startswith('  ')] == ['DA1', 'GET']
+    with open(str(tmp_path / 'metrics.json')) as f:
+        written = json.load(f)
+    assert (written['calls'], written['tasks']) == (3, 1)
+    assert [e['endpoint'] for e in written['endpoints']] == ['GET /admin/v1/settings', 'POST /admin/v1/settings']
+
+
+def test_stats_without_duo_tasks(callback, tmp_path):
+    cb = callback(output_file=str(tmp_path / 'metrics.json'))
+    cb.v2_runner_on_ok(Result(dict(changed=True)))
+    cb.v2_playbook_on_stats(None)
+    assert not cb._display.lines
+    assert not (tmp_path / 'metrics.json').exists()
+
+
+def test_unwritable_output_file(callback, tmp_path):
+    cb = callback(output_file=str(tmp_path / 'missing' / 'metrics.json'))
+    cb.v2_runner_on_ok(Result(dict(duo_metrics=metrics(1, 0.1))))
+    cb.v2_playbook_on_stats(None)
+    assert cb._display.lines
+    assert cb._display.warnings[0].startswith('Could not write Duo API metrics')
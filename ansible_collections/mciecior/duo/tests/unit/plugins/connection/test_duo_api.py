@@ -0,0 +1,107 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import http.client
+import json
+
+import pytest
+
+from ansible import constants as C
+from ansible.playbook.play_context import PlayContext
+from ansible.plugins.loader import fragment_loader
+from ansible.utils.plugin_docs import get_docstring
+from ansible_collections.mciecior.duo.plugins.connection import duo_api
+from ansible_collections.mciecior.duo.plugins.module_utils import api
+
+NAME = 'mciecior.duo.duo_api'
+
+
+@pytest.fixture(scope='module', autouse=True)
+def option_definitions():
+    C.config.initialize_plugin_configuration_definitions(
+        'connection', NAME, get_docstring(duo_api.__file__, fragment_loader)[0]['options'])
+
+
+@pytest.fixture
+def connection(mock_duo, monkeypatch):
+    '''
+    Returns a duo_api connection whose sessions are plain HTTP connections
+    to the mock server, each recorded in connection.opened
+    '''
+    opened = []
+
+    def http_connection(host, port, ca_certs=None):
+        opened.append(http.client.HTTPConnection('127.0.0.1', mock_duo.port))
+        return opened[-1]
+    monkeypatch.setattr(duo_api, 'CertValidatingHTTPSConnection', http_connection)
+    conn = duo_api.Connection(PlayContext())
+    conn._load_name = NAME
+    conn.set_options(direct=dict(duo_timeout=5))
+    conn.opened = opened
+    yield conn
+    conn.close()
+
+
+def account_list(connection, host='api-x.duosecurity.com'):
+    status, reason, headers, data = connection.send_request(host, None, 'POST', '/accounts/v1/account/list', '', {})
+    return status, dict(headers), json.loads(data)
+
+
+def test_keep_alive(connection, mock_duo):
+    for i in range(3):
+        status, headers, data = account_list(connection)
+        assert status == 200
+        assert [a['name'] for a in data['response']] == ['account-0', 'account-1', 'account-2']
+    assert len(connection.opened) == 1
+    assert connection.opened[0].timeout == 5
+    # every host gets a session of its own
+    account_list(connection, 'api-y.duosecurity.com')
+    assert len(connection.opened) == 2
+    assert mock_duo.stats['POST /accounts/v1/account/list'] == 4
+
+
+def test_reconnect(connection):
+    account_list(connection)
+    # the server closed the idle connection
+    connection.opened[0].sock.close()
+    status, headers, data = account_list(connection)
+    assert status == 200
+    assert len(connection.opened) == 2
+
+
+def test_no_retry_on_new_connection(connection, monkeypatch):
+    def refused(host, port, ca_certs=None):
+        connection.opened.append(http.client.HTTPConnection('127.0.0.1', 1))
+        return connection.opened[-1]
+    monkeypatch.setattr(duo_api, 'CertValidatingHTTPSConnection', refused)
+    with pytest.raises(OSError):
+        account_list(connection)
+    assert len(connection.opened) == 1
+    assert not connection._sessions
+
+
+def test_close(connection):
+    account_list(connection)
+    account_list(connection, 'api-y.duosecurity.com')
+    connection.close()
+    assert not connection._sessions
+    assert all(c.sock is None for c in connection.opened)
+
+
+def test_rate_limited_client(connection, mock_duo, monkeypatch, tmp_path):
+    '''
+    An API client with a socket_path relays its requests, and their 429
+    retries, through the connection
+    '''
+    sleeps = []
+    monkeypatch.setattr(api, 'Connection', lambda socket_path: connection)
+    monkeypatch.setattr(api.time, 'sleep', sleeps.append)
+    client = api.Accounts('DIXXXXXXXXXXXXXXXXXX', 'mock-secret-key', 'api-x.duosecurity.com')
+    client.socket_path = str(tmp_path / 'socket')
+    # the first request is answered with a 429
+    monkeypatch.setattr(mock_duo, 'throttled', iter([True, False]).__next__)
+    mock_duo.retry_after = 3
+    assert [a['name'] for a in client.get_child_accounts()] == ['account-0', 'account-1', 'account-2']
+    assert mock_duo.stats['429'] == 1
+    assert len(sleeps) == 1 and 3 <= sleeps[0] <= 4
+    assert len(connection.opened) == 1
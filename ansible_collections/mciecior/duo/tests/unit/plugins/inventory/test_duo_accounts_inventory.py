@@ -0,0 +1,91 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import pytest
+import yaml
+
+from ansible import constants as C
+from ansible.errors import AnsibleError
+from ansible.inventory.data import InventoryData
+from ansible.parsing.dataloader import DataLoader
+from ansible.plugins.loader import fragment_loader
+from ansible.utils.plugin_docs import get_docstring
+from ansible_collections.mciecior.duo.plugins.inventory import duo_accounts
+
+NAME = 'mciecior.duo.duo_accounts'
+
+
+@pytest.fixture(scope='module', autouse=True)
+def option_definitions():
+    # what the plugin loader does for a plugin found through the collection loader
+    C.config.initialize_plugin_configuration_definitions(
+        'inventory', NAME, get_docstring(duo_accounts.__file__, fragment_loader)[0]['options'])
+
+
+def parse(mock_duo, tmp_path, refresh=False, **options):
+    config = dict(plugin=NAME, ikey='DIXXXXXXXXXXXXXXXXXX', skey='mock-secret-key', host='127.0.0.1')
+    config.update(options)
+    path = tmp_path / 'duo_accounts.yml'
+    path.write_text(yaml.safe_dump(config))
+    plugin = duo_accounts.InventoryModule()
+    plugin._load_name = NAME
+    assert plugin.verify_file(str(path))
+    inventory = InventoryData()
+    plugin.parse(inventory, DataLoader(), str(path), cache=not refresh)
+    if options.get('cache'):
+        # as InventoryManager does after parsing a source
+        plugin.update_cache_if_changed()
+    return inventory
+
+
+def test_hosts(mock_duo, tmp_path):
+    inventory = parse(mock_duo, tmp_path, keyed_groups=[dict(key='duo_account_name', prefix='name')],
+                      compose=dict(ansible_connection="'local'"))
+    assert sorted(h.name for h in inventory.groups['duo_accounts'].get_hosts()) == ['account-0', 'account-1', 'account-2']
+    hostvars = inventory.get_host('account-1').vars
+    assert dict((k, hostvars[k]) for k in ('account_id', 'api_hostname', 'duo_account_name', 'ansible_connection')) == dict(
+        account_id='DA00000001', api_hostname='api-mock.duosecurity.com', duo_account_name='account-1', ansible_connection='local')
+    assert [h.name for h in inventory.groups['name_account_2'].get_hosts()] == ['account-2']
+    assert not mock_duo.stats['GET /admin/v1/billing/edition']
+
+
+def test_hostnames_and_group(mock_duo, tmp_path):
+    inventory = parse(mock_duo, tmp_path, hostnames='account_id', group='msp')
+    assert sorted(h.name for h in inventory.groups['msp'].get_hosts()) == ['DA00000000', 'DA00000001', 'DA00000002']
+    assert inventory.get_host('DA00000000').vars['duo_account_name'] == 'account-0'
+
+
+def test_include_edition(mock_duo, tmp_path, monkeypatch):
+    mock_duo.editions['DA00000000'] = 'BEYOND'
+    handle = mock_duo.handle
+
+    def failing_handle(method, path, params):
+        if path == '/admin/v1/billing/edition' and params.get('account_id') == 'DA00000002':
+            return 400, 'Invalid request', {}
+        return handle(method, path, params)
+    monkeypatch.setattr(mock_duo, 'handle', failing_handle)
+    inventory = parse(mock_duo, tmp_path, include_edition=True, keyed_groups=[dict(key='duo_edition', prefix='edition')])
+    assert inventory.get_host('account-0').vars['duo_edition'] == 'BEYOND'
+    assert inventory.get_host('account-1').vars['duo_edition'] == 'ENTERPRISE'
+    # an account whose edition could not be read is still in the inventory
+    assert 'duo_edition' not in inventory.get_host('account-2').vars
+    assert [h.name for h in inventory.groups['edition_BEYOND'].get_hosts()] == ['account-0']
+
+
+def test_cache(mock_duo, tmp_path):
+    options = dict(cache=True, cache_plugin='jsonfile', cache_connection=str(tmp_path / 'cache'))
+    parse(mock_duo, tmp_path, refresh=True, **options)
+    assert mock_duo.stats['POST /accounts/v1/account/list'] == 1
+    del mock_duo.accounts['DA00000000']
+    inventory = parse(mock_duo, tmp_path, **options)
+    assert mock_duo.stats['POST /accounts/v1/account/list'] == 1
+    assert 'account-0' in inventory.hosts
+    inventory = parse(mock_duo, tmp_path, refresh=True, **options)
+    assert mock_duo.stats['POST /accounts/v1/account/list'] == 2
+    assert 'account-0' not in inventory.hosts
+
+
+def test_api_error(mock_duo, tmp_path, monkeypatch):
+    monkeypatch.setattr(mock_duo, 'handle', lambda method, path, params: (400, 'Invalid request', {}))
+    with pytest.raises(AnsibleError, match='Could not retrieve child accounts'):
+        parse(mock_duo, tmp_path)
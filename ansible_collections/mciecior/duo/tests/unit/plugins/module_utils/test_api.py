@@ -0,0 +1,127 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import email.utils
+
+import pytest
+
+from ansible_collections.mciecior.duo.plugins.module_utils import api, cache
+from ansible_collections.mciecior.duo.plugins.module_utils.api import MAX_BACKOFF, RateLimiter, retry_delay
+from ansible_collections.mciecior.duo.plugins.module_utils.metrics import ApiMetrics
+
+
+class Clock(object):
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    monotonic = time
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class Response(object):
+
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, 'time', clock)
+    monkeypatch.setattr(api, 'time', clock)
+    return clock
+
+
+def limiter(tmp_path, rate=2, **kwargs):
+    return RateLimiter('DIXXXX', 'api-x.duosecurity.com', rate=rate, state_dir=str(tmp_path), **kwargs)
+
+
+def test_burst_then_rate(tmp_path, clock):
+    bucket = limiter(tmp_path, burst=3)
+    assert [bucket.delay() for i in range(3)] == [0, 0, 0]
+    assert bucket.delay() == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.delay() == 0
+    clock.now += 60
+    assert [bucket.delay() for i in range(4)] == [0, 0, 0, pytest.approx(0.5)]
+
+
+def test_shared_between_limiters(tmp_path, clock):
+    assert limiter(tmp_path).delay() == 0
+    assert RateLimiter('DIXXXX', 'API-X.duosecurity.com', rate=2, state_dir=str(tmp_path)).delay() == 0
+    assert limiter(tmp_path).delay() == pytest.approx(0.5)
+    # a scope and another ikey have buckets of their own
+    assert limiter(tmp_path, scope=('GET /admin/v1/logs/authentication', 'DA1')).delay() == 0
+    assert RateLimiter('DIYYYY', 'api-x.duosecurity.com', rate=2, state_dir=str(tmp_path)).delay() == 0
+
+
+def test_acquire_waits(tmp_path, clock):
+    bucket = limiter(tmp_path, rate=4, burst=1)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(0.25)
+    assert clock.now == pytest.approx(1000.25)
+
+
+def test_block(tmp_path, clock):
+    unlimited = limiter(tmp_path, rate=0)
+    assert unlimited.delay() == 0
+    unlimited.block(10)
+    assert limiter(tmp_path, rate=0).delay() == pytest.approx(10)
+    clock.now += 10
+    assert unlimited.delay() == 0
+
+
+def test_unusable_state_dir(tmp_path, clock):
+    (tmp_path / 'file').write_text(u'')
+    bucket = RateLimiter('DIXXXX', 'api-x.duosecurity.com', rate=1, state_dir=str(tmp_path / 'file'))
+    assert [bucket.delay() for i in range(3)] == [0, 0, 0]
+
+
+@pytest.mark.parametrize('attempt, low, high', [(0, 0.5, 1), (3, 4, 8), (10, MAX_BACKOFF / 2, MAX_BACKOFF)])
+def test_retry_delay_backoff(monkeypatch, attempt, low, high):
+    monkeypatch.setattr(api.random, 'uniform', lambda a, b: (a, b))
+    assert retry_delay(Response(429), attempt) == (low, high)
+    assert retry_delay(Response(429, {'Retry-After': 'soon'}), attempt) == (low, high)
+    assert retry_delay(object(), attempt) == (low, high)
+
+
+def test_retry_delay_retry_after(monkeypatch, clock):
+    monkeypatch.setattr(api.random, 'uniform', lambda a, b: b)
+    assert retry_delay(Response(429, {'Retry-After': '7'}), 5) == 8
+    date = email.utils.formatdate(clock.now + 30, usegmt=True)
+    assert retry_delay(Response(429, {'Retry-After': date}), 0) == 31
+    date = email.utils.formatdate(clock.now - 30, usegmt=True)
+    assert retry_delay(Response(429, {'Retry-After': date}), 0) == 1
+
+
+@pytest.mark.parametrize('max_retries, retries, status', [(6, 2, 200), (1, 1, 429)])
+def test_retry(tmp_path, clock, monkeypatch, max_retries, retries, status):
+    monkeypatch.setattr(api.random, 'uniform', lambda a, b: b)
+    client = api.Admin('DIXXXX', 'secret', 'api-x.duosecurity.com')
+    client.rate_limiter = limiter(tmp_path, rate=0)
+    client.max_retries = max_retries
+    client.metrics = ApiMetrics()
+    statuses = iter([429, 429, 200])
+
+    def send(method, uri, body, headers):
+        return Response(next(statuses), {'Retry-After': '2'}), b'{}'
+    response, data = client._retry(send, 'GET', '/admin/v1/users', None, {})
+    assert response.status == status
+    # every retry waits Retry-After plus up to a second, and pauses the bucket
+    assert clock.now == 1000 + retries * 3
+    assert limiter(tmp_path, rate=0).delay() == 0
+    clock.now -= 1
+    assert limiter(tmp_path, rate=0).delay() == 1
+    totals = client.metrics.total.summary()
+    assert (totals['calls'], totals['retries'], totals['rate_limit_wait']) == (1, retries, retries * 3)
+    assert totals['rate_limited'] == (2 if status == 429 else retries)
@@ -0,0 +1,115 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import pytest
+
+from ansible_collections.mciecior.duo.plugins.module_utils.diff import changed_values, diff_result, normalize, settings_diff
+
+
+@pytest.mark.parametrize('value, like, expected', [
+    # booleans, as the API returns them
+    (True, False, True),
+    (False, True, False),
+    (1, True, True),
+    (0, True, False),
+    ('1', True, True),
+    ('0', True, False),
+    ('true', False, True),
+    ('false', True, False),
+    ('True', False, True),
+    (' FALSE ', True, False),
+    ('yes', False, True),
+    ('', True, False),
+    (None, True, None),
+    # numbers
+    ('1', 0, 1),
+    ('0', 1, 0),
+    (10, 0, 10),
+    ('10', 0, 10),
+    (True, 0, 1),
+    (None, 0, None),
+    ('1.5', 0.0, 1.5),
+    ('unlimited', 0, 'unlimited'),
+    # lists
+    ('a,b', [], ['a', 'b']),
+    ('b, a', [], ['a', 'b']),
+    ('a,,b,', [], ['a', 'b']),
+    ('', [], []),
+    (None, [], []),
+    (['b', 'a'], [], ['a', 'b']),
+    ([2, 1], ['1'], ['1', '2']),
+    (('a',), [], ['a']),
+    # strings
+    (None, '', ''),
+    ('', 'x', ''),
+    (10, '', '10'),
+    # anything else is left alone
+    ('x', None, 'x'),
+    ({'a': 1}, {}, {'a': 1}),
+])
+def test_normalize(value, like, expected):
+    assert normalize(value, like) == expected
+
+
+@pytest.mark.parametrize('desired, current, changed', [
+    # False, 0 and '' are values, not unset settings
+    (dict(enabled=False), dict(), ['enabled']),
+    (dict(enabled=False), dict(enabled=None), ['enabled']),
+    (dict(enabled=False), dict(enabled=False), []),
+    (dict(threshold=0), dict(), ['threshold']),
+    (dict(threshold=0), dict(threshold=None), ['threshold']),
+    (dict(threshold=0), dict(threshold=0), []),
+    (dict(threshold=0), dict(threshold=5), ['threshold']),
+    (dict(message=''), dict(), []),
+    (dict(message=''), dict(message=None), []),
+    (dict(message=''), dict(message='Call the helpdesk'), ['message']),
+    # None is not managed, whatever the current value
+    (dict(enabled=None, threshold=None), dict(enabled=True), []),
+    (dict(enabled=None), dict(), []),
+    # booleans returned as strings and ints
+    (dict(enabled=True), dict(enabled='1'), []),
+    (dict(enabled=True), dict(enabled='true'), []),
+    (dict(enabled=True), dict(enabled=1), []),
+    (dict(enabled=True), dict(enabled='0'), ['enabled']),
+    (dict(enabled=True), dict(enabled='false'), ['enabled']),
+    (dict(enabled=False), dict(enabled='0'), []),
+    (dict(enabled=False), dict(enabled='false'), []),
+    (dict(enabled=False), dict(enabled=0), []),
+    (dict(enabled=False), dict(enabled='1'), ['enabled']),
+    (dict(enabled=False), dict(enabled='true'), ['enabled']),
+    # numbers returned as strings and booleans
+    (dict(threshold=1), dict(threshold='1'), []),
+    (dict(threshold=0), dict(threshold='0'), []),
+    (dict(threshold=1), dict(threshold='0'), ['threshold']),
+    (dict(threshold=1), dict(threshold=True), []),
+    (dict(threshold=0), dict(threshold=False), []),
+    (dict(threshold=10), dict(threshold='10'), []),
+    # lists returned as comma-separated strings
+    (dict(methods=['push', 'sms']), dict(methods='push,sms'), []),
+    (dict(methods=['push', 'sms']), dict(methods='sms, push'), []),
+    (dict(methods=['push', 'sms']), dict(methods=['sms', 'push']), []),
+    (dict(methods=['push', 'sms']), dict(methods='push'), ['methods']),
+    (dict(methods=['push']), dict(methods='push,sms'), ['methods']),
+    (dict(methods=[]), dict(methods=''), []),
+    (dict(methods=[]), dict(), []),
+    (dict(methods=[]), dict(methods='push'), ['methods']),
+    # only the settings that differ are returned
+    (dict(enabled=True, threshold=5, methods=['push']), dict(enabled='1', threshold='3', methods='push'), ['threshold']),
+])
+def test_settings_diff(desired, current, changed):
+    diff = settings_diff(desired, current)
+    assert sorted(diff) == changed
+    for k in changed:
+        assert diff[k] == dict(before=current.get(k), after=desired[k])
+
+
+def test_changed_values_and_diff_result():
+    diff = settings_diff(dict(enabled=False, threshold=5, message=''), dict(enabled='1', threshold='5'))
+    assert changed_values(diff) == dict(enabled=False)
+    assert diff_result(diff, header='account-1') == dict(
+        before=dict(enabled='1'),
+        after=dict(enabled=False),
+        before_header='account-1',
+        after_header='account-1',
+    )
+    assert diff_result({}) == dict(before={}, after={})
@@ -0,0 +1,104 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import email.utils
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+duo_client = pytest.importorskip('duo_client.client')
+
+from ansible_collections.mciecior.duo.plugins.module_utils import engine  # noqa: E402
+
+DATE = 'Tue, 21 Aug 2012 17:29:18 -0000'
+IKEY = 'DIWJ8X6AEYOR5OMC6TQ1'
+SKEY = 'Zh5eGmUq9zpfQnyUIu5OL9iWoMMv5ZNmk3zLJ4Ep'
+HOST = 'api-XXXXXXXX.duosecurity.com'
+
+PARAMS = [
+    {},
+    dict(username='jdoe'),
+    dict(realname='Jörg Døe', email='j+doe@example.com', notes='a b&c=d/e~f*g'),
+    dict(limit='300', offset='0', account_id='DA00000001'),
+    # repeated parameters are signed once per value, in sorted order
+    dict(username=['jdoe', 'adoe', 'bdoe'], limit='10'),
+    dict(phone_ids=['DP2', 'DP1'], user_ids=['DU1']),
+]
+
+
+def duo_client_request(method, path, params):
+    '''
+    Returns the uri, body and headers duo_client sends for a call
+    '''
+    client = duo_client.Client(IKEY, SKEY, HOST, sig_version=5)
+    sent = {}
+
+    def make_request(method, uri, body, headers):
+        sent.update(uri=uri, body=body, headers=dict((k.decode('ascii'), v.decode('ascii')) for k, v in headers.items()))
+    client._make_request = make_request
+    client.api_call(method, path, params)
+    return sent
+
+
+def engine_request(method, path, params):
+    '''
+    Returns the uri, body and headers of the same call from AsyncClient
+    '''
+    uri, body, request = engine.AsyncClient(IKEY, SKEY, HOST)._request(method, path, params)
+    head = request[:len(request) - len(body)].decode('ascii').split('\r\n')
+    headers = dict(line.split(': ', 1) for line in head[1:] if line)
+    return dict(uri=uri, body=body.decode('utf-8'), headers=headers)
+
+
+@pytest.fixture(autouse=True)
+def fixed_date(monkeypatch):
+    monkeypatch.setattr(email.utils, 'formatdate', lambda *args, **kwargs: DATE)
+
+
+@pytest.mark.parametrize('params', PARAMS)
+@pytest.mark.parametrize('method', ['GET', 'DELETE'])
+def test_query_requests_match_duo_client(method, params):
+    expected = duo_client_request(method, '/admin/v1/users', params)
+    actual = engine_request(method, '/admin/v1/users', params)
+    assert actual['headers']['Authorization'] == expected['headers']['Authorization']
+    assert actual['headers']['Date'] == expected['headers']['Date']
+    assert urlparse(actual['uri']).path == urlparse(expected['uri']).path
+    assert parse_qs(urlparse(actual['uri']).query) == parse_qs(urlparse(expected['uri']).query)
+
+
+@pytest.mark.parametrize('params', [
+    {},
+    dict(username='jdoe', realname='Jörg Døe'),
+    dict(name='VPN Users', desc='a "quoted" description'),
+    dict(group_id='DG1', user_ids=['DU2', 'DU1'], settings=dict(lockout_threshold=5, push_enabled=True)),
+    dict(edition='PLATFORM', account_id='DA00000001'),
+])
+def test_json_requests_match_duo_client(params):
+    expected = duo_client_request('POST', '/admin/v1/groups', params)
+    actual = engine_request('POST', '/admin/v1/groups', params)
+    assert actual['headers']['Authorization'] == expected['headers']['Authorization']
+    assert actual['uri'] == expected['uri']
+    assert actual['body'] == expected['body']
+    assert actual['headers']['Content-Type'] == expected['headers']['Content-type']
+
+
+@pytest.mark.parametrize('params', PARAMS)
+def test_sign_matches_duo_client(params):
+    expected = duo_client.sign(IKEY, SKEY, 'GET', HOST.upper(), '/admin/v1/users', DATE, 5,
+                               duo_client.normalize_params(params), body='')
+    assert engine.sign(IKEY, SKEY, 'GET', HOST.upper(), '/admin/v1/users', DATE, engine.normalize_params(params)) == expected
+
+
+def test_typed_params_are_signed_as_duo_client_strings():
+    '''
+    Modules pass ints and bools, which duo_client only accepts as strings
+    '''
+    expected = duo_client_request('GET', '/admin/v1/users', dict(limit='100', enabled='true', push='false'))
+    actual = engine_request('GET', '/admin/v1/users', dict(limit=100, enabled=True, push=False, email=None))
+    assert actual['headers']['Authorization'] == expected['headers']['Authorization']
+    assert parse_qs(urlparse(actual['uri']).query) == parse_qs(urlparse(expected['uri']).query)
+
+
+def test_canon_json_matches_duo_client():
+    params = dict(b=[3, 1], a=dict(z=1, y='é'), c=None)
+    assert engine.canon_json(params) == duo_client.Client(IKEY, SKEY, HOST).canon_json(params)
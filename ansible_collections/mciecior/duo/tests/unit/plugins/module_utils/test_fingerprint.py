@@ -0,0 +1,77 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import json
+import os
+
+from ansible_collections.mciecior.duo.plugins.module_utils import fingerprint as fp
+from ansible_collections.mciecior.duo.plugins.module_utils.fingerprint import FingerprintStore
+
+DESIRED = dict(lockout_threshold=5)
+
+
+def store(tmp_path, **kwargs):
+    kwargs.setdefault('max_age', 3600)
+    return FingerprintStore('DIXXXX', 'api-x.duosecurity.com', 'settings', cache_dir=str(tmp_path), **kwargs)
+
+
+def test_recorded_targets_are_converged_after_flush(tmp_path):
+    s = store(tmp_path)
+    s.record('DA1', DESIRED)
+    s.record('DA2', DESIRED)
+    assert not os.path.exists(s.path)
+    s.flush()
+    assert sorted(json.load(open(s.path))) == ['DA1', 'DA2']
+    later = store(tmp_path)
+    assert later.converged('DA1', DESIRED)
+    assert not later.converged('DA1', dict(lockout_threshold=6))
+    assert not later.converged('DA3', DESIRED)
+
+
+def test_checks_do_not_write(tmp_path, monkeypatch):
+    s = store(tmp_path)
+    s.record('DA1', DESIRED)
+    s.flush()
+    writes = []
+    monkeypatch.setattr(fp, 'update_state_file', lambda *args: writes.append(args))
+    later = store(tmp_path)
+    for i in range(100):
+        later.converged('DA1', DESIRED)
+    later.flush()
+    assert writes == []
+
+
+def test_flush_writes_once(tmp_path, monkeypatch):
+    writes = []
+    update = fp.update_state_file
+    monkeypatch.setattr(fp, 'update_state_file', lambda *args: writes.append(args) or update(*args))
+    s = store(tmp_path)
+    for i in range(100):
+        s.record('DA{}'.format(i), DESIRED)
+    s.flush()
+    assert len(writes) == 1
+
+
+def test_expired_entries(tmp_path, monkeypatch):
+    s = store(tmp_path)
+    s.record('DA1', DESIRED)
+    s.flush()
+    now = fp.time.time()
+    monkeypatch.setattr(fp.time, 'time', lambda: now + 7200)
+    assert not store(tmp_path).converged('DA1', DESIRED)
+    s = store(tmp_path)
+    s.record('DA2', DESIRED)
+    s.flush()
+    assert list(json.load(open(s.path))) == ['DA2']
+
+
+def test_disabled_and_force_refresh(tmp_path):
+    s = store(tmp_path)
+    s.record('DA1', DESIRED)
+    s.flush()
+    assert not store(tmp_path, force_refresh=True).converged('DA1', DESIRED)
+    disabled = store(tmp_path, max_age=0)
+    assert not disabled.converged('DA1', DESIRED)
+    disabled.record('DA2', DESIRED)
+    disabled.flush()
+    assert list(json.load(open(s.path))) == ['DA1']
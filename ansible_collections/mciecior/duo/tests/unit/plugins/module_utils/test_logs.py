@@ -0,0 +1,55 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import json
+import os
+
+from ansible_collections.mciecior.duo.plugins.module_utils import logs
+from ansible_collections.mciecior.duo.plugins.module_utils.logs import LogCheckpoints, append_records
+
+
+def checkpoints(tmp_path):
+    return LogCheckpoints('DIXXXX', 'api-x.duosecurity.com', str(tmp_path / 'authlog.jsonl'), cache_dir=str(tmp_path))
+
+
+def test_save_and_get(tmp_path):
+    c = checkpoints(tmp_path)
+    assert c.get(None) is None
+    c.save(None, 1000)
+    c.save('DA1', 2000, maxtime=3000, next_offset='2500,txid')
+    later = checkpoints(tmp_path)
+    assert later.get(None)['mintime'] == 1000
+    assert 'next_offset' not in later.get(None)
+    assert [later.get('DA1')[k] for k in ('mintime', 'maxtime', 'next_offset')] == [2000, 3000, '2500,txid']
+    assert later.get('DA2') is None
+    # the checkpoints of another dest are kept apart
+    assert LogCheckpoints('DIXXXX', 'api-x.duosecurity.com', str(tmp_path / 'other.jsonl'), cache_dir=str(tmp_path)).get(None) is None
+
+
+def test_get_does_not_write(tmp_path, monkeypatch):
+    c = checkpoints(tmp_path)
+    c.save('DA1', 2000)
+    writes = []
+    monkeypatch.setattr(logs, 'update_state_file', lambda *args: writes.append(args))
+    mtime = os.stat(c.path).st_mtime_ns
+    for i in range(10):
+        assert c.get('DA1')['mintime'] == 2000
+        assert c.get('DA2') is None
+    assert writes == []
+    assert os.stat(c.path).st_mtime_ns == mtime
+
+
+def test_get_without_a_file(tmp_path):
+    c = checkpoints(tmp_path)
+    assert c.get('DA1') is None
+    assert not os.path.exists(c.path)
+
+
+def test_append_records(tmp_path):
+    path = str(tmp_path / 'authlog.jsonl')
+    append_records(path, [dict(txid='1'), dict(txid='2')], account_id='DA1')
+    append_records(path, [], account_id='DA2')
+    append_records(path, [dict(txid='3')], account_id=None)
+    with open(path) as f:
+        assert [json.loads(line) for line in f] == [
+            dict(txid='1', account_id='DA1'), dict(txid='2', account_id='DA1'), dict(txid='3', account_id=None)]
@@ -0,0 +1,62 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import gzip
+import json
+
+import pytest
+
+from ansible_collections.mciecior.duo.plugins.module_utils.offline import StateFile
+
+RECORDS = [
+    dict(settings=dict(name='parent')),
+    dict(account_id='DA00000001', name='one', api_hostname='api-1', settings=dict(lockout_threshold=1)),
+    dict(account_id='DA00000002', name='two', api_hostname='api-2', settings=dict(lockout_threshold=2)),
+]
+
+
+def write_jsonl(path):
+    path.write_text(''.join(json.dumps(r) + '\n\n' for r in RECORDS))
+
+
+def write_gzip(path):
+    with gzip.open(str(path), 'wt') as f:
+        f.write(''.join(json.dumps(r) + '\n' for r in RECORDS))
+
+
+def write_list(path):
+    path.write_text(json.dumps(RECORDS, indent=2))
+
+
+@pytest.mark.parametrize('write', [write_jsonl, write_gzip, write_list])
+def test_lookups(tmp_path, write):
+    path = tmp_path / 'state'
+    write(path)
+    state = StateFile(str(path))
+    assert state.record('DA00000002') == RECORDS[2]
+    assert state.record('DA00000001') == RECORDS[1]
+    assert state.record(None) == RECORDS[0]
+    assert state.record('DA99999999') is None
+    assert state.accounts() == [
+        dict(account_id='DA00000001', name='one', api_hostname='api-1'),
+        dict(account_id='DA00000002', name='two', api_hostname='api-2'),
+    ]
+
+
+def test_file_is_scanned_once(tmp_path, monkeypatch):
+    path = tmp_path / 'state.jsonl'
+    write_jsonl(path)
+    state = StateFile(str(path))
+    scans = []
+    entries = state._entries
+    monkeypatch.setattr(state, '_entries', lambda: scans.append(1) or entries())
+    for account_id in ['DA00000001', 'DA00000002', None, 'DA00000001']:
+        state.record(account_id)
+    state.accounts()
+    assert len(scans) == 1
+
+
+def test_open_shares_instances(tmp_path):
+    path = tmp_path / 'state.jsonl'
+    write_jsonl(path)
+    assert StateFile.open(str(path)) is StateFile.open(str(path))
@@ -0,0 +1,80 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import pytest
+
+from ansible_collections.mciecior.duo.plugins.modules import duo_accounts, duo_admin_settings
+
+
+def names(mock_duo):
+    return sorted(a['name'] for a in mock_duo.accounts.values())
+
+
+def reconcile(mock_duo, controller, accounts, **args):
+    return controller(duo_accounts, accounts=accounts, **dict(mock_duo.module_args, **args))
+
+
+def test_create_and_delete(mock_duo, controller):
+    accounts = ['account-0', 'new-0', dict(name='new-1'), dict(name='account-1', state='absent'), dict(name='gone', state='absent')]
+    result = reconcile(mock_duo, controller, accounts)
+    assert not result.get('failed'), result.get('msg')
+    assert result['changed']
+    assert (result['created'], result['deleted']) == (['new-0', 'new-1'], ['account-1'])
+    assert names(mock_duo) == ['account-0', 'account-2', 'new-0', 'new-1']
+    assert result['accounts']['new-0']['account_id'].startswith('DN')
+    assert result['accounts']['account-0'] == dict(state='present', changed=False, account_id='DA00000000',
+                                                   api_hostname='api-mock.duosecurity.com')
+    assert not result['accounts']['gone']['changed']
+
+    result = reconcile(mock_duo, controller, accounts)
+    assert not result.get('failed'), result.get('msg')
+    assert not result['changed']
+
+
+def test_new_accounts_are_found_by_later_tasks(mock_duo, controller):
+    # the cached account index is refreshed after a change
+    assert controller(duo_admin_settings, name='account-2', state='query', **mock_duo.module_args)['settings']
+    reconcile(mock_duo, controller, ['new-0'])
+    result = controller(duo_admin_settings, name='new-0', state='query', **mock_duo.module_args)
+    assert not result.get('failed'), result.get('msg')
+
+
+def test_default_state(mock_duo, controller):
+    result = reconcile(mock_duo, controller, ['account-0', dict(name='account-1', state='present')], state='absent')
+    assert result['deleted'] == ['account-0']
+    assert names(mock_duo) == ['account-1', 'account-2']
+
+
+def test_check_mode(mock_duo, controller):
+    result = reconcile(mock_duo, controller, ['new-0', dict(name='account-1', state='absent')], check_mode=True)
+    assert result['changed']
+    assert (result['created'], result['deleted']) == (['new-0'], ['account-1'])
+    assert names(mock_duo) == ['account-0', 'account-1', 'account-2']
+
+
+@pytest.mark.parametrize('accounts, msg', [
+    (['new-0', dict(name='new-0', state='absent')], 'Conflicting states'),
+    ([dict(state='absent')], 'needs a name'),
+    ([dict(name='new-0', state='gone')], 'state must be one of'),
+])
+def test_invalid_accounts(mock_duo, controller, accounts, msg):
+    result = reconcile(mock_duo, controller, accounts)
+    assert result['failed']
+    assert msg in result['msg']
+    assert not mock_duo.stats
+
+
+def test_partial_failure(mock_duo, controller, monkeypatch):
+    handle = mock_duo.handle
+
+    def failing_handle(method, path, params):
+        if path == '/accounts/v1/account/create' and params.get('name') == 'new-1':
+            return 400, 'Invalid request', {}
+        return handle(method, path, params)
+    monkeypatch.setattr(mock_duo, 'handle', failing_handle)
+    result = reconcile(mock_duo, controller, ['new-0', 'new-1', dict(name='account-0', state='absent')])
+    assert result['failed']
+    assert result['msg'] == 'Could not reconcile child accounts: new-1'
+    assert (result['created'], result['deleted']) == (['new-0'], ['account-0'])
+    assert not result['accounts']['new-1']['changed'] and result['accounts']['new-1']['msg']
+    assert names(mock_duo) == ['account-1', 'account-2', 'new-0']
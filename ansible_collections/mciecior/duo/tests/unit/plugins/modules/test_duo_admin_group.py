@@ -0,0 +1,91 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import pytest
+
+from ansible_collections.mciecior.duo.plugins.modules import duo_admin_group
+
+
+def members(mock_duo, account_id='DA00000001'):
+    users = mock_duo._users(account_id)
+    return dict((g['name'], sorted(users[u]['username'] for u in g['members'])) for g in mock_duo.groups.get(account_id, {}).values())
+
+
+def sync(mock_duo, controller, **args):
+    return controller(duo_admin_group, **dict(mock_duo.module_args, name='account-1', group='VPN Users', **args))
+
+
+@pytest.mark.parametrize('lookup_limit', [30, 1])
+def test_create_and_add(mock_duo, controller, monkeypatch, lookup_limit):
+    # both ways of resolving usernames, one call each or one pass over every user
+    monkeypatch.setattr(duo_admin_group, 'LOOKUP_LIMIT', lookup_limit)
+    result = sync(mock_duo, controller, members=['user-0', 'USER-1', 'nobody'])
+    assert not result.get('failed'), result.get('msg')
+    assert result['changed'] and result['created']
+    assert [result[k] for k in ('members', 'added', 'removed', 'not_found')] == [2, 2, 0, 1]
+    assert 'nobody' in result['warnings'][0]
+    assert members(mock_duo) == {'VPN Users': ['user-0', 'user-1']}
+
+    result = sync(mock_duo, controller, members=['user-1', 'user-0'])
+    assert not result.get('failed'), result.get('msg')
+    assert not result['changed']
+
+
+def test_purge(mock_duo, controller, tmp_path):
+    sync(mock_duo, controller, members=['user-0', 'user-1', 'user-2'])
+    src = tmp_path / 'members.csv'
+    src.write_text(u'username\nuser-2\nuser-3\n')
+    result = sync(mock_duo, controller, src=str(src), purge=True)
+    assert not result.get('failed'), result.get('msg')
+    assert [result[k] for k in ('members', 'added', 'removed')] == [2, 1, 2]
+    assert members(mock_duo) == {'VPN Users': ['user-2', 'user-3']}
+
+
+def test_without_purge_members_are_only_added(mock_duo, controller):
+    sync(mock_duo, controller, members=['user-0', 'user-1'])
+    result = sync(mock_duo, controller, members=['user-2'])
+    assert [result[k] for k in ('members', 'added', 'removed')] == [3, 1, 0]
+
+
+@pytest.mark.parametrize('src', [None, u'username\n', u'[]\n'])
+def test_purge_without_members_removes_nothing(mock_duo, controller, tmp_path, src):
+    sync(mock_duo, controller, members=['user-0', 'user-1'])
+    mock_duo.stats.clear()
+    if src is None:
+        result = sync(mock_duo, controller, members=[], purge=True)
+    else:
+        path = tmp_path / ('members.csv' if src.startswith('username') else 'members.yml')
+        path.write_text(src)
+        result = sync(mock_duo, controller, src=str(path), purge=True)
+    assert result['failed']
+    assert 'refusing to purge' in result['msg']
+    assert not mock_duo.stats
+    assert members(mock_duo) == {'VPN Users': ['user-0', 'user-1']}
+
+
+def test_check_mode(mock_duo, controller):
+    result = sync(mock_duo, controller, check_mode=True, members=['user-0', 'user-1'])
+    assert not result.get('failed'), result.get('msg')
+    assert result['changed'] and result['created']
+    assert result['added'] == 2
+    assert members(mock_duo) == {}
+
+    sync(mock_duo, controller, members=['user-0', 'user-1'])
+    result = sync(mock_duo, controller, check_mode=True, members=['user-2'], purge=True)
+    assert [result[k] for k in ('members', 'added', 'removed')] == [1, 1, 2]
+    assert members(mock_duo) == {'VPN Users': ['user-0', 'user-1']}
+
+
+def test_partial_failure(mock_duo, controller, monkeypatch):
+    handle = mock_duo.handle
+
+    def failing_handle(method, path, params):
+        if path == '/admin/v1/users/DU{:018d}/groups'.format(1):
+            return 400, 'Invalid request', {}
+        return handle(method, path, params)
+    monkeypatch.setattr(mock_duo, 'handle', failing_handle)
+    result = sync(mock_duo, controller, members=['user-0', 'user-1', 'user-2'])
+    assert result['failed']
+    assert [result[k] for k in ('members', 'added')] == [2, 2]
+    assert [(e['username'], e['action']) for e in result['errors']] == [('user-1', 'add')]
+    assert members(mock_duo) == {'VPN Users': ['user-0', 'user-2']}
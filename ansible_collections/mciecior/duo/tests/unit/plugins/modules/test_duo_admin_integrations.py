@@ -0,0 +1,44 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import pytest
+
+from ansible_collections.mciecior.duo.plugins.modules import duo_admin_integrations
+
+
+@pytest.fixture
+def integrations(mock_duo, monkeypatch):
+    # 25 integrations cycling through 5 types, so rdp is at 0, 5, 10, 15 and 20,
+    # served 4 per page
+    mock_duo.integration_count = 25
+    monkeypatch.setattr(duo_admin_integrations, 'INTEGRATIONS_PAGE_SIZE', 4)
+    return mock_duo
+
+
+@pytest.mark.parametrize('offset, limit, names, next_offset', [
+    (0, 2, ['integration-0', 'integration-5'], 6),
+    (6, 2, ['integration-10', 'integration-15'], 16),
+    (16, 10, ['integration-20'], None),
+    (0, None, ['integration-0', 'integration-5', 'integration-10', 'integration-15', 'integration-20'], None),
+    (0, 5, ['integration-0', 'integration-5', 'integration-10', 'integration-15', 'integration-20'], 21),
+])
+def test_limit_counts_filtered_integrations(integrations, controller, offset, limit, names, next_offset):
+    args = dict(integrations.module_args, name='account-1', state='query', filter_type=['rdp'], offset=offset)
+    if limit is not None:
+        args['limit'] = limit
+    result = controller(duo_admin_integrations, **args)
+    assert not result.get('failed'), result.get('msg')
+    assert [i['name'] for i in result['integrationList']] == names
+    assert result['count'] == len(names)
+    assert result['next_offset'] == next_offset
+
+
+@pytest.mark.parametrize('offset, limit, count, next_offset', [
+    (0, 10, 10, 10),
+    (20, 10, 5, None),
+    (0, 25, 25, None),
+])
+def test_limit_without_filters(integrations, controller, offset, limit, count, next_offset):
+    result = controller(duo_admin_integrations, name='account-1', state='query', offset=offset, limit=limit, **integrations.module_args)
+    assert result['count'] == count
+    assert result['next_offset'] == next_offset
@@ -0,0 +1,32 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+from mock_duo import DEFAULT_SETTINGS
+
+from ansible_collections.mciecior.duo.plugins.modules import duo_admin_settings
+
+
+def test_rollout_returns_the_changed_settings(mock_duo, controller):
+    mock_duo.settings['DA00000002'] = dict(DEFAULT_SETTINGS, lockout_threshold=5)
+    args = dict(mock_duo.module_args, accounts=['all'], state='present', lockout_threshold=5, push_enabled=True)
+    result = controller(duo_admin_settings, **args)
+    assert not result.get('failed'), result.get('msg')
+    assert result['changed']
+    assert result['settings'] == dict(lockout_threshold=5)
+    assert [result['accounts'][n]['changed'] for n in ('account-0', 'account-1', 'account-2')] == [True, True, False]
+
+    result = controller(duo_admin_settings, **args)
+    assert not result['changed']
+    assert result['settings'] == {}
+
+
+def test_rollout_failure_message_follows_state(mock_duo, controller):
+    args = dict(mock_duo.module_args, accounts=['account-0', 'no-such-account'])
+    result = controller(duo_admin_settings, state='query', **args)
+    assert result['failed']
+    assert result['msg'] == 'Could not query the settings of 1 of 2 child accounts'
+    assert result['failed_accounts'] == ['no-such-account']
+    assert result['accounts']['account-0']['settings']['lockout_threshold'] == 10
+
+    result = controller(duo_admin_settings, state='present', lockout_threshold=5, **args)
+    assert result['msg'] == 'Could not update the settings of 1 of 2 child accounts'
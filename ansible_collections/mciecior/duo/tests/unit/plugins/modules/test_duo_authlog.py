@@ -0,0 +1,127 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import json
+import os
+import time
+from functools import partial
+
+import pytest
+
+from ansible_collections.mciecior.duo.plugins.modules import duo_authlog
+
+HOUR = 3600 * 1000
+NOW = int(time.time() * 1000)
+
+
+class Clock(object):
+
+    def __init__(self, now):
+        self.now = now
+
+    def time(self):
+        return self.now / 1000.0
+
+
+@pytest.fixture
+def authlogs(mock_duo, monkeypatch, tmp_path):
+    '''
+    30 events of account-1 between 3 and 2 hours ago, then 10 between 40 and
+    20 minutes ago, exported 10 per page by a module running an hour ago
+    '''
+    mock_duo.add_authlogs('DA00000001', 30, NOW - 3 * HOUR, NOW - 2 * HOUR)
+    mock_duo.add_authlogs('DA00000001', 10, NOW - 40 * 60 * 1000, NOW - 20 * 60 * 1000)
+    mock_duo.authlogs.setdefault('DA00000000', [])
+    mock_duo.authlogs.setdefault('DA00000002', [])
+    mock_duo.clock = Clock(NOW - HOUR)
+    monkeypatch.setattr(duo_authlog, 'time', mock_duo.clock)
+    monkeypatch.setattr(duo_authlog, 'authlog_pages', partial(duo_authlog.authlog_pages, page_size=10))
+    mock_duo.dest = str(tmp_path / 'authlog.jsonl')
+    return mock_duo
+
+
+def export(mock_duo, controller, **args):
+    if 'accounts' not in args:
+        args.setdefault('name', 'account-1')
+    return controller(duo_authlog, **dict(mock_duo.module_args, dest=mock_duo.dest, mintime=NOW - 4 * HOUR, log_rate_limit=0, **args))
+
+
+def exported(mock_duo):
+    if not os.path.exists(mock_duo.dest):
+        return []
+    with open(mock_duo.dest) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_export_is_incremental(authlogs, controller):
+    result = export(authlogs, controller)
+    assert not result.get('failed'), result.get('msg')
+    assert result['changed'] and result['events'] == 30
+    assert result['account_id'] == 'DA00000001'
+    assert result['maxtime'] == NOW - HOUR - duo_authlog.AUTHLOG_DELAY
+    events = exported(authlogs)
+    assert [e['txid'] for e in events] == ['DA00000001-{:08d}'.format(i) for i in range(30)]
+    assert set(e['account_id'] for e in events) == set(['DA00000001'])
+
+    result = export(authlogs, controller)
+    assert not result['changed'] and result['events'] == 0
+
+    authlogs.clock.now = NOW
+    result = export(authlogs, controller)
+    assert result['changed'] and result['events'] == 10
+    assert result['mintime'] == NOW - HOUR - duo_authlog.AUTHLOG_DELAY + 1
+    assert len(exported(authlogs)) == 40
+
+
+def test_check_mode(authlogs, controller):
+    result = export(authlogs, controller, check_mode=True)
+    assert not result.get('failed'), result.get('msg')
+    assert result['changed'] and result['events'] == 30
+    assert exported(authlogs) == []
+    assert export(authlogs, controller)['events'] == 30
+
+
+def test_resume_after_a_failed_page(authlogs, controller, monkeypatch):
+    handle = authlogs.handle
+    calls = []
+
+    def failing_handle(method, path, params):
+        if path == '/admin/v2/logs/authentication':
+            calls.append(params)
+            if len(calls) == 3:
+                return 500, 'Internal error', {}
+        return handle(method, path, params)
+    monkeypatch.setattr(authlogs, 'handle', failing_handle)
+    result = export(authlogs, controller, max_retries=0)
+    assert result['failed']
+    assert result['events'] == 20
+    assert len(exported(authlogs)) == 20
+
+    result = export(authlogs, controller)
+    assert not result.get('failed'), result.get('msg')
+    assert result['events'] == 10
+    assert calls[-1]['next_offset'].endswith('DA00000001-00000019')
+    assert [e['txid'] for e in exported(authlogs)] == ['DA00000001-{:08d}'.format(i) for i in range(30)]
+
+
+def test_accounts(authlogs, controller, monkeypatch):
+    authlogs.add_authlogs('DA00000002', 5, NOW - 3 * HOUR, NOW - 2 * HOUR)
+    handle = authlogs.handle
+
+    def failing_handle(method, path, params):
+        if path == '/admin/v2/logs/authentication' and params.get('account_id') == 'DA00000000':
+            return 400, 'Invalid request', {}
+        return handle(method, path, params)
+    monkeypatch.setattr(authlogs, 'handle', failing_handle)
+    result = export(authlogs, controller, accounts=['all'])
+    assert result['failed']
+    assert result['failed_accounts'] == ['account-0']
+    assert result['events'] == 35
+    assert [result['accounts'][n]['events'] for n in ('account-1', 'account-2')] == [30, 5]
+    assert sorted(set(e['account_id'] for e in exported(authlogs))) == ['DA00000001', 'DA00000002']
+
+    monkeypatch.setattr(authlogs, 'handle', handle)
+    result = export(authlogs, controller, accounts=['account-0', 'account-1', 'no-such-account'])
+    assert result['failed_accounts'] == ['no-such-account']
+    assert result['accounts']['account-0']['failed'] is False
+    assert result['accounts']['account-1']['events'] == 0
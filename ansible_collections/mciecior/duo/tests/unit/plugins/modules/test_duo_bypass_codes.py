@@ -0,0 +1,25 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import csv
+
+from ansible_collections.mciecior.duo.plugins.modules import duo_bypass_codes
+
+
+def test_usernames_match_without_regard_to_case(mock_duo, controller, tmp_path):
+    dest = tmp_path / 'codes.csv'
+    mock_duo._users('DA00000001')['DU{:018d}'.format(3)]['alias1'] = 'jdoe'
+    users = ['USER-1', 'user-1', 'User-2', 'JDoe', 'user-3', 'nobody', 'NOBODY']
+    result = controller(duo_bypass_codes, name='account-1', users=users, dest=str(dest), count=2, **mock_duo.module_args)
+    assert not result.get('failed'), result.get('msg')
+    assert result['generated'] == 3
+    assert result['missing'] == ['account-1/nobody']
+    with open(str(dest)) as f:
+        rows = list(csv.DictReader(f))
+    assert sorted(set((r['username'], r['user_id']) for r in rows)) == [
+        ('JDoe', 'DU{:018d}'.format(3)),
+        ('USER-1', 'DU{:018d}'.format(1)),
+        ('User-2', 'DU{:018d}'.format(2)),
+    ]
+    assert len(rows) == 6
+    assert mock_duo.stats['POST /admin/v1/users/{id}/bypass_codes'] == 3
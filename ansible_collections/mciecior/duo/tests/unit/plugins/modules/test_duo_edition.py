@@ -0,0 +1,73 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+from ansible_collections.mciecior.duo.plugins.modules import duo_edition
+
+
+def edition(mock_duo, controller, check_mode=False, **args):
+    return controller(duo_edition, check_mode=check_mode, **dict(mock_duo.module_args, **args))
+
+
+def test_single_account(mock_duo, controller):
+    result = edition(mock_duo, controller, account_id='DA00000001', edition='BEYOND')
+    assert result['changed'] and result['edition'] == 'BEYOND'
+    assert mock_duo.editions == {'DA00000001': 'BEYOND'}
+    result = edition(mock_duo, controller, account_id='DA00000001', edition='BEYOND')
+    assert not result['changed']
+
+
+def test_audit_all(mock_duo, controller):
+    mock_duo.editions['DA00000002'] = 'PLATFORM'
+    result = edition(mock_duo, controller, account_ids=['all'])
+    assert not result.get('failed'), result.get('msg')
+    assert not result['changed']
+    assert result['summary'] == {'ENTERPRISE': ['DA00000000', 'DA00000001'], 'PLATFORM': ['DA00000002']}
+    assert result['accounts']['DA00000002'] == dict(name='account-2', edition='PLATFORM', changed=False, failed=False)
+    assert 'account_id' not in result
+    assert not mock_duo.stats['POST /admin/v1/billing/edition']
+
+
+def test_set_fleet(mock_duo, controller):
+    result = edition(mock_duo, controller, account_ids=['all'], edition='BEYOND',
+                     editions={'account-1': 'PLATFORM', 'DA00000002': 'ENTERPRISE'})
+    assert not result.get('failed'), result.get('msg')
+    assert result['changed']
+    assert result['summary'] == {'BEYOND': ['DA00000000'], 'ENTERPRISE': ['DA00000002'], 'PLATFORM': ['DA00000001']}
+    assert [a for a, v in sorted(result['accounts'].items()) if v['changed']] == ['DA00000000', 'DA00000001']
+    assert mock_duo.editions == {'DA00000000': 'BEYOND', 'DA00000001': 'PLATFORM'}
+
+    result = edition(mock_duo, controller, editions={'account-1': 'PLATFORM'})
+    assert not result['changed']
+    assert list(result['accounts']) == ['DA00000001']
+
+
+def test_check_mode(mock_duo, controller):
+    result = edition(mock_duo, controller, check_mode=True, account_ids=['all'], edition='BEYOND')
+    assert result['changed']
+    assert result['summary'] == {'BEYOND': ['DA00000000', 'DA00000001', 'DA00000002']}
+    assert not mock_duo.editions
+    assert not mock_duo.stats['POST /admin/v1/billing/edition']
+
+
+def test_invalid_edition(mock_duo, controller):
+    result = edition(mock_duo, controller, editions={'account-1': 'GOLD'})
+    assert result['failed']
+    assert 'edition must be one of' in result['msg']
+    assert not mock_duo.stats['GET /admin/v1/billing/edition']
+
+
+def test_partial_failure(mock_duo, controller, monkeypatch):
+    handle = mock_duo.handle
+
+    def failing_handle(method, path, params):
+        if method == 'POST' and path == '/admin/v1/billing/edition' and params.get('account_id') == 'DA00000001':
+            return 400, 'Invalid request', {}
+        return handle(method, path, params)
+    monkeypatch.setattr(mock_duo, 'handle', failing_handle)
+    result = edition(mock_duo, controller, account_ids=['all'], edition='BEYOND')
+    assert result['failed']
+    assert result['msg'] == 'Could not get or set the edition of 1 of 3 child accounts'
+    assert result['failed_accounts'] == ['DA00000001']
+    assert result['accounts']['DA00000001']['msg']
+    assert result['summary'] == {'BEYOND': ['DA00000000', 'DA00000002']}
+    assert mock_duo.editions == {'DA00000000': 'BEYOND', 'DA00000002': 'BEYOND'}
@@ -0,0 +1,93 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import pytest
+
+from ansible_collections.mciecior.duo.plugins.modules import duo_integrations
+
+DEPLOY = [
+    dict(name='integration-0', type='rdp', settings=dict(greeting='Welcome')),
+    dict(name='VPN', type='radius', self_service_allowed=True),
+]
+
+
+def names(mock_duo, account_id):
+    return sorted(i['name'] for i in mock_duo._integrations(account_id))
+
+
+def reconcile(mock_duo, controller, **args):
+    return controller(duo_integrations, **dict(mock_duo.module_args, **args))
+
+
+def test_deploy_to_every_account(mock_duo, controller):
+    result = reconcile(mock_duo, controller, accounts=['all'], integrations=DEPLOY)
+    assert not result.get('failed'), result.get('msg')
+    assert result['changed']
+    for n in range(3):
+        account = result['accounts']['account-{}'.format(n)]
+        assert (account['created'], account['updated'], account['deleted']) == (['VPN'], ['integration-0'], [])
+        assert sorted(account['credentials']) == ['VPN', 'integration-0']
+        assert names(mock_duo, 'DA{:08d}'.format(n)) == ['VPN', 'integration-0', 'integration-1']
+    vpn = [i for i in mock_duo._integrations('DA00000001') if i['name'] == 'VPN'][0]
+    assert vpn['type'] == 'radius'
+    assert result['accounts']['account-1']['credentials']['VPN']['ikey'] == vpn['integration_key']
+
+    result = reconcile(mock_duo, controller, accounts=['all'], integrations=DEPLOY)
+    assert not result.get('failed'), result.get('msg')
+    assert not result['changed']
+
+
+def test_purge_and_absent(mock_duo, controller):
+    integrations = [dict(name='integration-0'), dict(name='VPN', state='absent')]
+    result = reconcile(mock_duo, controller, account_id='DA00000002', integrations=integrations, purge=True)
+    assert not result.get('failed'), result.get('msg')
+    assert result['accounts']['DA00000002']['deleted'] == ['integration-1']
+    assert names(mock_duo, 'DA00000002') == ['integration-0']
+    assert names(mock_duo, 'DA00000001') == ['integration-0', 'integration-1']
+
+
+@pytest.mark.parametrize('integrations', [[], [dict(name='integration-0', state='absent')]])
+def test_purge_without_integrations_removes_nothing(mock_duo, controller, integrations):
+    result = reconcile(mock_duo, controller, accounts=['all'], integrations=integrations, purge=True)
+    assert result['failed']
+    assert 'refusing to purge' in result['msg']
+    assert not mock_duo.stats
+
+
+def test_check_mode(mock_duo, controller):
+    result = controller(duo_integrations, check_mode=True, diff=True, accounts=['account-1'], integrations=DEPLOY, purge=True,
+                        **mock_duo.module_args)
+    assert not result.get('failed'), result.get('msg')
+    account = result['accounts']['account-1']
+    assert (account['created'], account['updated'], account['deleted']) == (['VPN'], ['integration-0'], ['integration-1'])
+    assert [(d['before_header'], d['before'], d['after']) for d in result['diff']] == [
+        ('account-1: integration-0', dict(greeting=''), dict(greeting='Welcome')),
+        ('account-1: VPN', {}, dict(name='VPN', type='radius', self_service_allowed=True)),
+        ('account-1: integration-1', dict(name='integration-1', integration_key=mock_duo._integrations('DA00000001')[1]['integration_key']), {}),
+    ]
+    assert names(mock_duo, 'DA00000001') == ['integration-0', 'integration-1']
+    assert not [k for k in mock_duo.stats if k.startswith(('POST /admin', 'DELETE'))]
+
+
+def test_partial_failure(mock_duo, controller, monkeypatch):
+    handle = mock_duo.handle
+
+    def failing_handle(method, path, params):
+        if method == 'POST' and path in ('/admin/v1/integrations', '/admin/v3/integrations') and params.get('account_id') == 'DA00000001':
+            return 400, 'Invalid request', {}
+        return handle(method, path, params)
+    monkeypatch.setattr(mock_duo, 'handle', failing_handle)
+    result = reconcile(mock_duo, controller, accounts=['all'], integrations=DEPLOY)
+    assert result['failed']
+    assert result['failed_accounts'] == ['account-1']
+    failed = result['accounts']['account-1']
+    assert failed['created'] == [] and failed['updated'] == ['integration-0']
+    assert failed['msg'].startswith('create VPN:')
+    assert names(mock_duo, 'DA00000001') == ['integration-0', 'integration-1']
+    assert names(mock_duo, 'DA00000002') == ['VPN', 'integration-0', 'integration-1']
+
+
+def test_create_needs_a_type(mock_duo, controller):
+    result = reconcile(mock_duo, controller, account_id='DA00000000', integrations=[dict(name='VPN')])
+    assert result['failed']
+    assert 'type is required' in result['accounts']['DA00000000']['msg']
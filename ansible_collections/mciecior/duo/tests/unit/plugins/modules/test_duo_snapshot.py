@@ -0,0 +1,111 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import gzip
+import json
+import os
+
+import pytest
+
+from ansible_collections.mciecior.duo.plugins.modules import duo_snapshot
+
+
+def records(path):
+    with gzip.open(path, 'rt') as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def dest(tmp_path):
+    return str(tmp_path / 'snapshot.jsonl.gz')
+
+
+@pytest.fixture
+def interrupted(mock_duo, controller, monkeypatch, dest):
+    '''
+    Leaves an export that stopped after its first account, one account per chunk
+    '''
+    monkeypatch.setattr(duo_snapshot, 'CHUNK_PER_WORKER', 1)
+    write_cursor = duo_snapshot.write_cursor
+    calls = []
+
+    def failing_write_cursor(path, cursor):
+        calls.append(cursor)
+        if len(calls) > 1:
+            raise OSError('disk full')
+        write_cursor(path, cursor)
+    monkeypatch.setattr(duo_snapshot, 'write_cursor', failing_write_cursor)
+    result = controller(duo_snapshot, dest=dest, workers=1, **mock_duo.module_args)
+    assert result['failed'] and 'disk full' in result['msg']
+    monkeypatch.setattr(duo_snapshot, 'write_cursor', write_cursor)
+    return mock_duo
+
+
+def test_export(mock_duo, controller, dest):
+    result = controller(duo_snapshot, dest=dest, **mock_duo.module_args)
+    assert not result.get('failed'), result.get('msg')
+    assert result['count'] == 3
+    exported = records(dest)
+    assert [r['name'] for r in exported] == ['account-0', 'account-1', 'account-2']
+    assert exported[0]['edition'] == 'ENTERPRISE'
+    assert exported[0]['settings']['lockout_threshold'] == 10
+    assert [i['name'] for i in exported[0]['integrations']] == ['integration-0', 'integration-1']
+    assert 'secret_key' not in exported[0]['integrations'][0]
+    assert oct(os.stat(dest).st_mode & 0o777) == oct(0o600)
+    assert not os.path.exists(dest + '.cursor')
+
+
+def test_check_mode(mock_duo, controller, dest):
+    result = controller(duo_snapshot, check_mode=True, dest=dest, include=['settings'], **mock_duo.module_args)
+    assert result['changed'] and result['count'] == 3
+    assert not os.path.exists(dest)
+    assert mock_duo.stats['GET /admin/v1/settings'] == 0
+
+
+def test_resume(interrupted, controller, dest):
+    mock_duo = interrupted
+    mock_duo.stats.clear()
+    result = controller(duo_snapshot, dest=dest, resume=True, workers=1, **mock_duo.module_args)
+    assert not result.get('failed'), result.get('msg')
+    assert result['resumed_from'] == 'DA00000000'
+    assert result['count'] == 3
+    assert [r['name'] for r in records(dest)] == ['account-0', 'account-1', 'account-2']
+    assert mock_duo.stats['GET /admin/v1/settings'] == 2
+
+
+@pytest.mark.parametrize('options', [
+    dict(include=['settings']),
+    dict(accounts=['account-1', 'account-2']),
+    dict(secret_keys=True),
+])
+def test_resume_with_other_options_fails(interrupted, controller, dest, options):
+    mock_duo = interrupted
+    mock_duo.stats.clear()
+    result = controller(duo_snapshot, dest=dest, resume=True, **dict(mock_duo.module_args, **options))
+    assert result['failed']
+    assert 'Cannot resume' in result['msg']
+    assert mock_duo.stats['GET /admin/v1/settings'] == 0
+    assert os.path.exists(dest + '.part')
+
+
+def test_without_resume_starts_over(interrupted, controller, dest):
+    result = controller(duo_snapshot, dest=dest, include=['edition'], **interrupted.module_args)
+    assert not result.get('failed'), result.get('msg')
+    assert result['resumed_from'] is None
+    assert [sorted(r) for r in records(dest)] == [['account_id', 'api_hostname', 'edition', 'name']] * 3
+
+
+def test_partial_failure(mock_duo, controller, monkeypatch, dest):
+    handle = mock_duo.handle
+
+    def failing_handle(method, path, params):
+        if path == '/admin/v1/billing/edition' and params.get('account_id') == 'DA00000001':
+            return 500, 'Internal error', {}
+        return handle(method, path, params)
+    monkeypatch.setattr(mock_duo, 'handle', failing_handle)
+    result = controller(duo_snapshot, dest=dest, max_retries=0, **mock_duo.module_args)
+    assert result['failed']
+    assert result['failed_accounts'] == ['account-1']
+    exported = records(dest)
+    assert len(exported) == 3
+    assert 'edition' in exported[1]['errors'] and 'settings' in exported[1]
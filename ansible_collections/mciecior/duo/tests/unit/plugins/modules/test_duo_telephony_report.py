@@ -0,0 +1,90 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import csv
+import os
+
+from mock_duo import DEFAULT_SETTINGS
+
+from ansible_collections.mciecior.duo.plugins.modules import duo_telephony_report
+
+# credits remaining and used by account-0, account-1 and account-2 of the mock
+CREDITS = [0, 37, 74]
+USED = [0, 11, 22]
+
+
+def report(mock_duo, controller, **args):
+    return controller(duo_telephony_report, **dict(mock_duo.module_args, **args))
+
+
+def rows(path):
+    with open(path, newline='') as f:
+        return sorted((r['name'], r['credits'], r['low_balance']) for r in csv.DictReader(f))
+
+
+def test_totals_and_warning_thresholds(mock_duo, controller):
+    mock_duo.settings['DA00000001'] = dict(DEFAULT_SETTINGS, telephony_warning_min=50)
+    result = report(mock_duo, controller)
+    assert not result.get('failed'), result.get('msg')
+    assert not result['changed']
+    assert [result[k] for k in ('count', 'credits', 'credits_used', 'users')] == [3, sum(CREDITS), sum(USED), 15]
+    # account-0 has no credits left, account-1 is below its own warning
+    assert [(a['name'], a['credits'], a['threshold']) for a in result['low_balance']] == [('account-0', 0, 1), ('account-1', 37, 50)]
+    assert result['maxtime'] - result['mintime'] == 30 * 24 * 3600 * 1000
+
+
+def test_low_balance_skips_the_settings(mock_duo, controller):
+    result = report(mock_duo, controller, accounts=['account-2', 'account-1'], low_balance=40, days=1)
+    assert not result.get('failed'), result.get('msg')
+    assert result['count'] == 2
+    assert [a['name'] for a in result['low_balance']] == ['account-1']
+    assert mock_duo.stats['GET /admin/v1/settings'] == 0
+
+
+def test_unknown_account(mock_duo, controller):
+    result = report(mock_duo, controller, accounts=['account-1', 'no-such-account'])
+    assert result['failed']
+    assert 'no-such-account' in result['msg']
+    assert mock_duo.stats['GET /admin/v1/info/summary'] == 0
+
+
+def test_dest_only_changes_with_its_rows(mock_duo, controller, tmp_path):
+    (tmp_path / 'reports').mkdir()
+    dest = str(tmp_path / 'reports' / 'telephony.csv')
+    result = report(mock_duo, controller, check_mode=True, dest=dest)
+    assert result['changed']
+    assert not os.path.exists(dest)
+
+    result = report(mock_duo, controller, dest=dest)
+    assert result['changed']
+    assert rows(dest) == [('account-0', '0', 'True'), ('account-1', '37', 'False'), ('account-2', '74', 'False')]
+    assert oct(os.stat(dest).st_mode & 0o777) == oct(0o600)
+    mtime = os.stat(dest).st_mtime_ns
+
+    for check_mode in (True, False):
+        result = report(mock_duo, controller, check_mode=check_mode, dest=dest)
+        assert not result['changed']
+    assert os.stat(dest).st_mtime_ns == mtime
+    assert os.listdir(str(tmp_path / 'reports')) == ['telephony.csv']
+
+    result = report(mock_duo, controller, dest=dest, low_balance=50)
+    assert result['changed']
+    assert rows(dest)[1] == ('account-1', '37', 'True')
+
+
+def test_partial_failure(mock_duo, controller, monkeypatch, tmp_path):
+    handle = mock_duo.handle
+
+    def failing_handle(method, path, params):
+        if path == '/admin/v1/info/summary' and params.get('account_id') == 'DA00000002':
+            return 400, 'Invalid request', {}
+        return handle(method, path, params)
+    monkeypatch.setattr(mock_duo, 'handle', failing_handle)
+    dest = str(tmp_path / 'telephony.csv')
+    result = report(mock_duo, controller, dest=dest)
+    assert result['failed']
+    assert result['failed_accounts'] == ['account-2']
+    assert [result[k] for k in ('count', 'credits')] == [2, 37]
+    with open(dest, newline='') as f:
+        failed = [r for r in csv.DictReader(f) if r['error']]
+    assert [r['name'] for r in failed] == ['account-2']
@@ -0,0 +1,72 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import pytest
+
+from ansible_collections.mciecior.duo.plugins.modules import duo_tokens
+
+SECRET = '3132333435363738393031323334353637383930'
+
+
+def token(serial, username=None, **fields):
+    return dict(dict(serial=str(serial), secret=SECRET, username=username), **fields)
+
+
+def tokens_of(mock_duo, account_id='DA00000001'):
+    return dict((t['serial'], sorted(u['username'] for u in t['users'])) for t in mock_duo.tokens.get(account_id, {}).values())
+
+
+def test_import_and_assign(mock_duo, controller):
+    args = dict(mock_duo.module_args, name='account-1', tokens=[token(1), token(2, 'USER-1'), token(3, 'user-2')])
+    result = controller(duo_tokens, **args)
+    assert not result.get('failed'), result.get('msg')
+    assert (result['rows'], result['created'], result['assigned'], result['skipped']) == (3, 3, 2, 0)
+    assert tokens_of(mock_duo) == {'1': [], '2': ['user-1'], '3': ['user-2']}
+
+    result = controller(duo_tokens, **args)
+    assert not result.get('failed'), result.get('msg')
+    assert not result['changed']
+    assert (result['created'], result['assigned'], result['skipped']) == (0, 0, 3)
+
+
+def test_check_mode(mock_duo, controller):
+    result = controller(duo_tokens, check_mode=True, name='account-1', tokens=[token(1, 'user-1'), token(2)], **mock_duo.module_args)
+    assert not result.get('failed'), result.get('msg')
+    assert result['changed']
+    assert (result['created'], result['assigned']) == (2, 1)
+    assert tokens_of(mock_duo) == {}
+
+
+def test_unknown_user_keeps_the_token(mock_duo, controller):
+    result = controller(duo_tokens, name='account-1', tokens=[token(1, 'nobody'), token(2, 'user-1')], **mock_duo.module_args)
+    assert result['failed']
+    assert (result['created'], result['assigned']) == (2, 1)
+    assert result['errors'] == [dict(row=1, serial='1', action='assign', msg='Could not find user nobody')]
+    assert tokens_of(mock_duo) == {'1': [], '2': ['user-1']}
+    # only the secrets are hidden
+    assert SECRET not in repr(result)
+
+
+def test_invalid_rows_are_reported(mock_duo, controller):
+    tokens = [token(1), dict(serial='2', type='yk', private_id='abc'), dict(serial=None, secret=SECRET), token(1)]
+    result = controller(duo_tokens, name='account-1', tokens=tokens, **mock_duo.module_args)
+    assert result['failed']
+    assert result['created'] == 1
+    assert [(e['row'], e['serial'], e['action']) for e in result['errors']] == [(2, '2', 'read'), (3, None, 'read'), (4, '1', 'read')]
+
+
+@pytest.mark.parametrize('tokens', [
+    [dict(serial='1', type='d1')],
+    [dict(serial='1', secret=SECRET, color='red')],
+])
+def test_tokens_are_validated_before_any_call(mock_duo, controller, tokens):
+    result = controller(duo_tokens, name='account-1', tokens=tokens, **mock_duo.module_args)
+    assert result['failed']
+    assert not mock_duo.stats
+
+
+def test_d1_is_not_a_type(mock_duo, controller):
+    result = controller(duo_tokens, name='account-1', type='d1', tokens=[dict(serial='1')], **mock_duo.module_args)
+    assert result['failed']
+    assert 'd1' in result['msg']
+    assert not mock_duo.stats
@@ -0,0 +1,110 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+import pytest
+
+from ansible_collections.mciecior.duo.plugins.modules import duo_users
+
+
+def usernames(mock_duo, account_id='DA00000001'):
+    return sorted(u['username'] for u in mock_duo._users(account_id).values())
+
+
+def sync(mock_duo, controller, **args):
+    return controller(duo_users, **dict(mock_duo.module_args, name='account-1', **args))
+
+
+def test_create_update_and_delete(mock_duo, controller):
+    users = [
+        dict(username='user-0', email='user-0@example.com'),
+        dict(username='USER-1', email='new-1@example.com'),
+        dict(username='user-2', state='absent'),
+        dict(username='new-user', realname='New User'),
+        dict(username='gone', state='absent'),
+    ]
+    result = sync(mock_duo, controller, users=users)
+    assert not result.get('failed'), result.get('msg')
+    assert result['changed']
+    assert [result[k] for k in ('rows', 'created', 'updated', 'deleted', 'unchanged')] == [5, 1, 1, 1, 2]
+    assert usernames(mock_duo) == ['new-user', 'user-0', 'user-1', 'user-3', 'user-4']
+    assert mock_duo._users('DA00000001')['DU{:018d}'.format(1)]['email'] == 'new-1@example.com'
+
+    result = sync(mock_duo, controller, users=users)
+    assert not result.get('failed'), result.get('msg')
+    assert not result['changed']
+    assert result['unchanged'] == 5
+
+
+def test_check_mode(mock_duo, controller):
+    result = sync(mock_duo, controller, check_mode=True, purge=True, users=[dict(username='user-0', notes='x'), dict(username='new-user')])
+    assert not result.get('failed'), result.get('msg')
+    assert [result[k] for k in ('created', 'updated', 'deleted')] == [1, 1, 4]
+    assert usernames(mock_duo) == ['user-0', 'user-1', 'user-2', 'user-3', 'user-4']
+    assert mock_duo.stats['POST /admin/v1/users'] == 0
+
+
+def test_purge_from_src(mock_duo, controller, tmp_path):
+    src = tmp_path / 'users.csv'
+    src.write_text(u'username,email\nuser-0,\nuser-3,user-3@example.com\n')
+    result = sync(mock_duo, controller, src=str(src), purge=True)
+    assert not result.get('failed'), result.get('msg')
+    assert result['deleted'] == 3
+    assert usernames(mock_duo) == ['user-0', 'user-3']
+
+
+@pytest.mark.parametrize('users, src', [
+    ([], None),
+    ([dict(realname='No Username')], None),
+    (None, u''),
+    (None, u'username,email\n'),
+])
+def test_purge_without_users_deletes_nothing(mock_duo, controller, tmp_path, users, src):
+    if src is not None:
+        path = tmp_path / 'users.csv'
+        path.write_text(src)
+        result = sync(mock_duo, controller, src=str(path), purge=True)
+    else:
+        result = sync(mock_duo, controller, users=users, purge=True)
+    assert result['failed']
+    assert result['deleted'] == 0
+    assert 'refusing to purge' in result['errors'][-1]['msg']
+    assert usernames(mock_duo) == ['user-0', 'user-1', 'user-2', 'user-3', 'user-4']
+
+
+def test_unreadable_src_deletes_nothing(mock_duo, controller, tmp_path):
+    src = tmp_path / 'users.yml'
+    src.write_text(u'- username: user-0\n- username: [\n')
+    result = sync(mock_duo, controller, src=str(src), purge=True)
+    assert result['failed']
+    assert result['deleted'] == 0
+    assert usernames(mock_duo) == ['user-0', 'user-1', 'user-2', 'user-3', 'user-4']
+
+
+def test_partial_failure(mock_duo, controller):
+    users = [
+        dict(username='new-1'),
+        dict(username='user-0', status='retired'),
+        dict(username='new-2', shoe_size='9'),
+        dict(username='NEW-1'),
+        dict(username='new-3'),
+    ]
+    result = sync(mock_duo, controller, users=users)
+    assert result['failed']
+    assert result['created'] == 2
+    assert [(e['row'], e['username'], e['action']) for e in result['errors']] == [
+        (2, 'user-0', 'read'), (3, 'new-2', 'read'), (4, 'NEW-1', 'read')]
+    assert 'new-1' in usernames(mock_duo) and 'new-3' in usernames(mock_duo)
+
+
+def test_api_errors_are_reported_per_user(mock_duo, controller, monkeypatch):
+    handle = mock_duo.handle
+
+    def failing_handle(method, path, params):
+        if method == 'POST' and params.get('username') == 'new-2':
+            return 400, 'Invalid request', {}
+        return handle(method, path, params)
+    monkeypatch.setattr(mock_duo, 'handle', failing_handle)
+    result = sync(mock_duo, controller, users=[dict(username='new-1'), dict(username='new-2')])
+    assert result['failed']
+    assert result['created'] == 1
+    assert [(e['row'], e['username'], e['action']) for e in result['errors']] == [(2, 'new-2', 'create')]
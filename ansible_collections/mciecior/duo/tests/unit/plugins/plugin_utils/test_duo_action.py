@@ -0,0 +1,30 @@
+# Copyright: (c) 2026, Mark Ciecior <mciecior@carrieraccessit.com>
+# GNU General Public License v3.0+
+
+from ansible_collections.mciecior.duo.plugins.modules import duo_admin_integrations, duo_admin_settings
+from ansible_collections.mciecior.duo.plugins.plugin_utils.duo_action import ModuleExit
+
+
+def test_module_exit_is_not_an_exception():
+    assert not issubclass(ModuleExit, Exception)
+
+
+def test_admin_settings_query(mock_duo, controller):
+    result = controller(duo_admin_settings, name='account-1', state='query', **mock_duo.module_args)
+    assert not result.get('failed'), result.get('msg')
+    assert result['changed'] is False
+    assert result['settings']['lockout_threshold'] == 10
+
+
+def test_admin_integrations_query(mock_duo, controller):
+    ikey = mock_duo._integrations('DA00000001')[0]['integration_key']
+    result = controller(duo_admin_integrations, name='account-1', state='query', app_ikey=ikey, **mock_duo.module_args)
+    assert not result.get('failed'), result.get('msg')
+    assert result['changed'] is False
+    assert result['settings']['integration_key'] == ikey
+
+
+def test_fail_json_is_reported(mock_duo, controller):
+    result = controller(duo_admin_settings, name='no-such-account', state='query', **mock_duo.module_args)
+    assert result['failed'] is True
+    assert 'no-such-account' in result['msg']